@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.routers.match import router as match_router
 from app.routers.upload import router as upload_router
+from app.services.matcher import get_models_status, get_store_status
 
 
 app = FastAPI(
@@ -28,7 +29,12 @@ app.include_router(match_router)
 
 @app.get("/health", tags=["system"])
 def health() -> dict:
-    return {"status": "ok", "service": "ats_resume_prediction"}
+    return {
+        "status": "ok",
+        "service": "ats_resume_prediction",
+        "models": get_models_status(),
+        "resume_store": get_store_status(),
+    }
 
 
 @app.get("/", tags=["system"])
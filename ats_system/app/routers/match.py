@@ -1,9 +1,20 @@
 from __future__ import annotations
 
+import json
+import time
+from typing import Iterator
+
 from pydantic import BaseModel, Field
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
 
-from app.services.matcher import match_and_rank
+from app.services.matcher import (
+    BATCH_MAX_JOBS,
+    STREAM_CHUNK_SIZE,
+    match_and_rank_many,
+    match_and_rank_page,
+    result_fields,
+)
 
 
 router = APIRouter(tags=["matching"])
@@ -12,32 +23,116 @@ router = APIRouter(tags=["matching"])
 class MatchRequest(BaseModel):
     job_description: str = Field(..., min_length=10)
     resume_ids: list[str] | None = None
+    # 0 scores every resume; otherwise return the ranking of those scored within the budget.
+    deadline_ms: int = Field(0, ge=0, le=60000)
+    # Results per page (0 returns them all); pass a response's next_cursor to read the next page.
+    limit: int = Field(0, ge=0, le=500)
+    cursor: str | None = None
+    # Result keys to compute and return, e.g. ["resume_id", "ats_score"]; all when omitted.
+    fields: list[str] | None = None
+
+
+class MatchBatchRequest(BaseModel):
+    job_descriptions: list[str] = Field(..., min_length=1, max_length=BATCH_MAX_JOBS)
+    resume_ids: list[str] | None = None
+    top_k: int = Field(0, ge=0, le=100)
+    fields: list[str] | None = None
+
+
+def _wants_stream(request: Request, stream: bool) -> bool:
+    return stream or "application/x-ndjson" in request.headers.get("accept", "")
+
+
+def _deadline(deadline_ms: int) -> float | None:
+    return time.monotonic() + deadline_ms / 1000.0 if deadline_ms > 0 else None
+
+
+def _ndjson_response(header: dict, chunks: Iterator[list[dict]]) -> StreamingResponse:
+    # One header line, then one line per result; a chunk is only built when the client has taken the previous one.
+    def lines() -> Iterator[bytes]:
+        yield (json.dumps(header) + "\n").encode("utf-8")
+        for chunk in chunks:
+            yield "".join(json.dumps(result) + "\n" for result in chunk).encode("utf-8")
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.post("/match")
-def match(request: MatchRequest) -> dict:
-    results = match_and_rank(
+def match(request: MatchRequest, http_request: Request, stream: bool = Query(False)):
+    deadline = _deadline(request.deadline_ms)
+    fields = result_fields(request.fields)
+    streaming = _wants_stream(http_request, stream)
+    page = match_and_rank_page(
         job_description=request.job_description,
         resume_ids=request.resume_ids,
+        deadline=deadline,
+        limit=request.limit,
+        cursor=request.cursor,
     )
-    return {
+    header = {
         "job_description": request.job_description,
-        "total_matched": len(results),
-        "results": results,
+        "total_matched": page.ranking.total,
+        "partial": page.ranking.partial,
+        "scored_resumes": page.ranking.scored,
+        "unscored_resumes": page.ranking.unscored,
+        "next_cursor": page.next_cursor,
+    }
+    if streaming:
+        return _ndjson_response(header, page.chunks(STREAM_CHUNK_SIZE, fields))
+    return {**header, "results": [result for chunk in page.chunks(fields=fields) for result in chunk]}
+
+
+@router.post("/match/batch")
+def match_batch(request: MatchBatchRequest) -> dict:
+    rankings = match_and_rank_many(
+        job_descriptions=request.job_descriptions,
+        resume_ids=request.resume_ids,
+        top_k=request.top_k if request.top_k > 0 else None,
+        fields=result_fields(request.fields),
+    )
+    return {
+        "total_job_descriptions": len(rankings),
+        "rankings": [
+            {
+                "job_description": job_description,
+                "total_matched": len(results),
+                "results": results,
+            }
+            for job_description, results in zip(request.job_descriptions, rankings)
+        ],
     }
 
 
 @router.get("/rank")
 def rank(
+    http_request: Request,
     job_description: str = Query(..., min_length=10),
     top_k: int = Query(0, ge=0, le=100),
-) -> dict:
-    results = match_and_rank(job_description=job_description, resume_ids=None)
-    ranked = results[:top_k] if top_k > 0 else results
-
-    return {
+    stream: bool = Query(False),
+    deadline_ms: int = Query(0, ge=0, le=60000),
+    limit: int = Query(0, ge=0, le=500),
+    cursor: str | None = Query(None),
+    fields: list[str] | None = Query(None),
+):
+    deadline = _deadline(deadline_ms)
+    result_keys = result_fields(fields)
+    streaming = _wants_stream(http_request, stream)
+    page = match_and_rank_page(
+        job_description=job_description,
+        resume_ids=None,
+        top_k=top_k if top_k > 0 else None,
+        deadline=deadline,
+        limit=limit,
+        cursor=cursor,
+    )
+    header = {
         "job_description": job_description,
-        "total_ranked": len(ranked),
-        "results": ranked,
+        "total_ranked": page.ranking.total,
+        "partial": page.ranking.partial,
+        "scored_resumes": page.ranking.scored,
+        "unscored_resumes": page.ranking.unscored,
+        "next_cursor": page.next_cursor,
     }
-
+    if streaming:
+        return _ndjson_response(header, page.chunks(STREAM_CHUNK_SIZE, result_keys))
+    return {**header, "results": [result for chunk in page.chunks(fields=result_keys) for result in chunk]}
@@ -1,18 +1,24 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 from uuid import uuid4
 
 import numpy as np
 from fastapi import HTTPException
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy.sparse import csr_matrix, vstack
+from sklearn.preprocessing import normalize
 
-from app.services.skill_extractor import extract_skills, missing_skills
-from ml.classifier import load_classifier
-from ml.embedder import load_vectorizer
+from app.services.ranking_cursors import RankingCursors, encode_cursor
+from app.services.resume_store import MemoryResumeStore, SharedResumeStore
+from app.services.skill_extractor import extract_skills
+from ml.model_registry import ModelRegistry
 from ml.train import train_and_save_models
 
 
@@ -20,8 +26,36 @@ ATS_ROOT = Path(__file__).resolve().parents[2]
 MODELS_DIR = ATS_ROOT / "models"
 VECTORIZER_PATH = MODELS_DIR / "vectorizer.pkl"
 CLASSIFIER_PATH = MODELS_DIR / "classifier.pkl"
+# "memory" keeps resumes per process; "shared" persists them for all workers on the host.
+STORE_BACKEND = (os.getenv("ATS_STORE_BACKEND") or "memory").strip().lower()
+STORE_DIR = Path(os.getenv("ATS_STORE_DIR") or ATS_ROOT / "data" / "resume_store")
+# Job descriptions accepted by one /match/batch request, e.g. a nightly run over every open requisition.
+BATCH_MAX_JOBS = int(os.getenv("ATS_BATCH_MAX_JOBS") or 1000)
+# Results per chunk of a streamed (NDJSON) /match or /rank response.
+STREAM_CHUNK_SIZE = 256
+# Resumes scored between deadline checks when a /match or /rank request sets deadline_ms.
+DEADLINE_CHUNK_SIZE = 5000
+# Rankings kept for cursor pagination of /match and /rank; each read renews the TTL.
+CURSOR_TTL_SECONDS = 300.0
+CURSOR_MAX_BYTES = 64 * 1024 * 1024
+# Keys a ranking result can carry; a `fields` projection selects among them.
+RESULT_FIELDS = frozenset(
+    ("resume_id", "filename", "ats_score", "predicted_category", "extracted_skills", "missing_skills", "rank")
+)
 
 _MODEL_LOCK = threading.Lock()
+_MODEL_REGISTRY = ModelRegistry()
+_RANKING_CURSORS = RankingCursors(CURSOR_TTL_SECONDS, CURSOR_MAX_BYTES)
+
+
+@dataclass
+class ResumeFeatures:
+    """Job-independent features of one resume, computed once at ingest."""
+
+    model_version: str
+    vector: csr_matrix
+    category: str
+    skills: list[str]
 
 
 @dataclass
@@ -29,9 +63,128 @@ class ResumeRecord:
     resume_id: str
     filename: str
     text: str
+    features: ResumeFeatures | None = None
+
+
+@dataclass
+class Ranking:
+    """Outcome of ``match_and_rank_stream``: ranked rows whose payloads are built on read."""
+
+    resumes: list[ResumeRecord]
+    features: list[ResumeFeatures]
+    ats_scores: list[float]
+    # Rows of ``resumes`` in rank order.
+    selected: np.ndarray
+    job_skills: list[str]
+    scored: int
+    unscored: int = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.selected)
+
+    @property
+    def partial(self) -> bool:
+        return self.unscored > 0
+
+    @property
+    def nbytes(self) -> int:
+        # Records and features are shared with the store; only the ranking's own lists count.
+        return self.selected.nbytes + 8 * (len(self.ats_scores) + len(self.resumes) + len(self.features))
+
+    def page(self, start: int, stop: int, fields: frozenset[str] | None = None) -> list[dict]:
+        # Score everyone, but build the skill payloads only for the rows and fields read.
+        fields = RESULT_FIELDS if fields is None else fields
+        results = []
+        for rank, row in enumerate(self.selected[start:stop].tolist(), start=start + 1):
+            resume = self.resumes[row]
+            extracted = self.features[row].skills
+            result = {}
+            if "resume_id" in fields:
+                result["resume_id"] = resume.resume_id
+            if "filename" in fields:
+                result["filename"] = resume.filename
+            if "ats_score" in fields:
+                result["ats_score"] = self.ats_scores[row]
+            if "predicted_category" in fields:
+                result["predicted_category"] = self.features[row].category
+            if "extracted_skills" in fields:
+                result["extracted_skills"] = list(extracted)
+            if "missing_skills" in fields:
+                resume_skills = set(skill.lower() for skill in extracted)
+                result["missing_skills"] = [skill for skill in self.job_skills if skill.lower() not in resume_skills]
+            if "rank" in fields:
+                result["rank"] = rank
+            results.append(result)
+        return results
+
+    def chunks(
+        self,
+        chunk_size: int | None = None,
+        start: int = 0,
+        stop: int | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> Iterator[list[dict]]:
+        """Results ``start:stop`` in rank order, ``chunk_size`` at a time (one chunk when ``None``).
+
+        With ``fields`` only those result keys are built.
+        """
+        stop = self.total if stop is None else min(stop, self.total)
+        chunk_size = chunk_size or max(stop - start, 1)
+        for begin in range(start, stop, chunk_size):
+            yield self.page(begin, min(begin + chunk_size, stop), fields)
+
+    def compact(self) -> Ranking:
+        """The same ranking holding only the selected rows, for keeping past the request."""
+        kept = self.selected.tolist()
+        return Ranking(
+            [self.resumes[row] for row in kept],
+            [self.features[row] for row in kept],
+            [self.ats_scores[row] for row in kept],
+            np.arange(len(kept)),
+            self.job_skills,
+            self.scored,
+            self.unscored,
+        )
+
+
+@dataclass
+class RankingPage:
+    """Results ``start:stop`` of a ranking, and the cursor of the page after it."""
+
+    ranking: Ranking
+    start: int
+    stop: int
+    next_cursor: str | None = None
+
+    def chunks(self, chunk_size: int | None = None, fields: frozenset[str] | None = None) -> Iterator[list[dict]]:
+        return self.ranking.chunks(chunk_size, self.start, self.stop, fields)
+
+
+def _encode_record(record: ResumeRecord) -> tuple:
+    features = record.features
+    if features is None:
+        return record.resume_id, record.filename, record.text, None, {}
+    meta = {
+        "model_version": features.model_version,
+        "category": features.category,
+        "skills": list(features.skills),
+    }
+    return record.resume_id, record.filename, record.text, features.vector, meta
+
+
+def _decode_record(resume_id: str, filename: str, text: str, vector: csr_matrix | None, meta: dict) -> ResumeRecord:
+    features = ResumeFeatures(vector=vector, **meta) if vector is not None else None
+    return ResumeRecord(resume_id=resume_id, filename=filename, text=text, features=features)
+
 
+def _create_resume_store() -> MemoryResumeStore | SharedResumeStore:
+    if STORE_BACKEND == "shared":
+        return SharedResumeStore(STORE_DIR, _encode_record, _decode_record)
+    return MemoryResumeStore()
 
-_RESUME_STORE: dict[str, ResumeRecord] = {}
+
+_RESUME_STORE = _create_resume_store()
 
 
 def ensure_models_ready() -> None:
@@ -46,62 +199,158 @@ def ensure_models_ready() -> None:
 
 
 def _get_models():
-    ensure_models_ready()
-    vectorizer = load_vectorizer(VECTORIZER_PATH)
-    classifier = load_classifier(CLASSIFIER_PATH)
+    # Deserialized once per process; reloaded only when the pickle content changes.
+    if not (_MODEL_REGISTRY.is_loaded(VECTORIZER_PATH) and _MODEL_REGISTRY.is_loaded(CLASSIFIER_PATH)):
+        ensure_models_ready()
+    vectorizer = _MODEL_REGISTRY.get(VECTORIZER_PATH)
+    classifier = _MODEL_REGISTRY.get(CLASSIFIER_PATH)
     return vectorizer, classifier
 
 
+def get_models_status() -> list[dict]:
+    return _MODEL_REGISTRY.status()
+
+
+def _models_version() -> str:
+    _get_models()
+    vectorizer = _MODEL_REGISTRY.entry(VECTORIZER_PATH)
+    classifier = _MODEL_REGISTRY.entry(CLASSIFIER_PATH)
+    return f"{vectorizer.version}:{classifier.version}"
+
+
+def _compute_features(texts: list[str]) -> list[ResumeFeatures]:
+    vectorizer, classifier = _get_models()
+    model_version = _models_version()
+    raw_vectors = vectorizer.transform(texts)
+    categories = classifier.predict(raw_vectors)
+    # Rows are stored L2-normalized so a match only needs one dot product each.
+    vectors = normalize(raw_vectors).tocsr()
+
+    return [
+        ResumeFeatures(
+            model_version=model_version,
+            vector=vectors[row],
+            category=str(categories[row]),
+            skills=extract_skills(text),
+        )
+        for row, text in enumerate(texts)
+    ]
+
+
+def _ensure_features(resumes: list[ResumeRecord]) -> list[ResumeFeatures]:
+    # Features are recomputed only when the models were retrained since ingest.
+    model_version = _models_version()
+    stale = [
+        resume
+        for resume in resumes
+        if resume.features is None or resume.features.model_version != model_version
+    ]
+    if stale:
+        for resume, features in zip(stale, _compute_features([resume.text for resume in stale])):
+            resume.features = features
+        _RESUME_STORE.update(stale)
+    return [resume.features for resume in resumes]
+
+
 def add_resume(filename: str, text: str) -> str:
     resume_id = str(uuid4())
-    _RESUME_STORE[resume_id] = ResumeRecord(resume_id=resume_id, filename=filename, text=text)
+    _RESUME_STORE.add(
+        resume_id,
+        ResumeRecord(
+            resume_id=resume_id,
+            filename=filename,
+            text=text,
+            features=_compute_features([text])[0],
+        ),
+    )
     return resume_id
 
 
 def get_resumes(resume_ids: Iterable[str] | None = None) -> list[ResumeRecord]:
+    # Pull rows other workers wrote to a shared store since the last call.
+    _RESUME_STORE.refresh()
     if resume_ids is None:
-        return list(_RESUME_STORE.values())
+        return _RESUME_STORE.records()
 
     records: list[ResumeRecord] = []
     for resume_id in resume_ids:
-        if resume_id in _RESUME_STORE:
-            records.append(_RESUME_STORE[resume_id])
+        record = _RESUME_STORE.get(resume_id)
+        if record is not None:
+            records.append(record)
     return records
 
 
 def get_store_size() -> int:
+    _RESUME_STORE.refresh()
     return len(_RESUME_STORE)
 
 
-def _predict_category(vectorizer, classifier, resume_text: str) -> str:
-    features = vectorizer.transform([resume_text])
-    return str(classifier.predict(features)[0])
+def get_store_status() -> dict:
+    return _RESUME_STORE.status()
 
 
-def _compute_ats_score(vectorizer, resume_text: str, job_description: str) -> float:
-    vectors = vectorizer.transform([resume_text, job_description])
-    score = cosine_similarity(vectors[0], vectors[1])[0][0]
-    return float(np.clip(score * 100.0, 0.0, 100.0))
+def _compute_ats_scores(vectorizer, resume_vectors, job_description: str) -> np.ndarray:
+    # ``resume_vectors`` are L2-normalized ingest rows; only the job is transformed here.
+    job_vector = normalize(vectorizer.transform([job_description]))
+    scores = (resume_vectors @ job_vector.T).toarray().ravel()
+    return np.clip(scores * 100.0, 0.0, 100.0)
 
 
-def analyze_resume_against_job(resume: ResumeRecord, job_description: str) -> dict:
-    vectorizer, classifier = _get_models()
-    ats_score = round(_compute_ats_score(vectorizer, resume.text, job_description), 2)
-    category = _predict_category(vectorizer, classifier, resume.text)
-    extracted = extract_skills(resume.text)
-    missing = missing_skills(resume.text, job_description)
-
-    return {
-        "resume_id": resume.resume_id,
-        "filename": resume.filename,
-        "ats_score": ats_score,
-        "predicted_category": category,
-        "extracted_skills": extracted,
-        "missing_skills": missing,
-    }
+def _compute_ats_score_matrix(vectorizer, resume_vectors, job_descriptions: list[str]) -> np.ndarray:
+    # One (resumes x terms) . (terms x jobs) product; column j equals _compute_ats_scores for job j.
+    job_vectors = normalize(vectorizer.transform(job_descriptions))
+    scores = (resume_vectors @ job_vectors.T).toarray()
+    return np.clip(scores * 100.0, 0.0, 100.0)
 
 
-def match_and_rank(job_description: str, resume_ids: list[str] | None = None) -> list[dict]:
+def result_fields(values: Iterable[str] | None) -> frozenset[str] | None:
+    """Parse a ``fields`` projection (repeated or comma-separated); ``None`` keeps every field."""
+    names = {part.strip() for value in values or [] for part in str(value or "").split(",") if part.strip()}
+    if not names:
+        return None
+    unknown = sorted(names - RESULT_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown result fields: {', '.join(unknown)}. Allowed: {', '.join(sorted(RESULT_FIELDS))}.",
+        )
+    return frozenset(names)
+
+
+def _top_rows(scores: np.ndarray, top_k: int | None = None) -> np.ndarray:
+    """Rows of the ``top_k`` best scores, ordered like a stable descending sort."""
+    if top_k is None or top_k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+
+    # Partition instead of sorting everything; ties on the cut-off keep the earliest rows.
+    threshold = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+    above = np.flatnonzero(scores > threshold)
+    tied = np.flatnonzero(scores == threshold)[: top_k - len(above)]
+    rows = np.concatenate([above, tied])
+    return rows[np.argsort(-scores[rows], kind="stable")]
+
+
+def match_and_rank(
+    job_description: str,
+    resume_ids: list[str] | None = None,
+    top_k: int | None = None,
+) -> list[dict]:
+    ranking = match_and_rank_stream(job_description, resume_ids, top_k)
+    return ranking.page(0, ranking.total)
+
+
+def match_and_rank_stream(
+    job_description: str,
+    resume_ids: list[str] | None = None,
+    top_k: int | None = None,
+    deadline: float | None = None,
+) -> Ranking:
+    """Rank now; the result payloads are built lazily, as ``Ranking.chunks`` is read.
+
+    With a ``deadline`` (a ``time.monotonic()`` value) resumes are scored in
+    store order, ``DEADLINE_CHUNK_SIZE`` at a time, until it passes; only the
+    scored ones are ranked.
+    """
     if not job_description or not str(job_description).strip():
         raise HTTPException(status_code=400, detail="job_description is required.")
 
@@ -112,11 +361,117 @@ def match_and_rank(job_description: str, resume_ids: list[str] | None = None) ->
             detail="No resumes available. Upload resumes first via /upload-resumes.",
         )
 
-    results = [analyze_resume_against_job(resume, job_description) for resume in resumes]
-    results.sort(key=lambda item: item["ats_score"], reverse=True)
-
-    for index, item in enumerate(results, start=1):
-        item["rank"] = index
+    # Only job-dependent terms are computed here; everything else was stored at ingest.
+    features = _ensure_features(resumes)
+    vectorizer, _ = _get_models()
+    step = len(features) if deadline is None else DEADLINE_CHUNK_SIZE
+    scores = []
+    for start in range(0, len(features), step):
+        scores.append(
+            _compute_ats_scores(
+                vectorizer,
+                vstack([item.vector for item in features[start:start + step]], format="csr"),
+                job_description,
+            )
+        )
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+    ats_scores = [round(float(score), 2) for score in np.concatenate(scores)]
+
+    selected = _top_rows(np.array(ats_scores), top_k)
+    return Ranking(
+        resumes,
+        features,
+        ats_scores,
+        selected,
+        extract_skills(job_description),
+        scored=len(ats_scores),
+        unscored=len(resumes) - len(ats_scores),
+    )
+
+
+def match_and_rank_page(
+    job_description: str,
+    resume_ids: list[str] | None = None,
+    top_k: int | None = None,
+    deadline: float | None = None,
+    limit: int = 0,
+    cursor: str | None = None,
+) -> RankingPage:
+    """Up to ``limit`` results (all when 0) of ``match_and_rank_stream``, from ``cursor`` on.
+
+    When results remain, the ranking is kept for ``CURSOR_TTL_SECONDS`` and
+    ``next_cursor`` reads the following page from it without scoring again.
+    A cursor only continues the request that produced it.
+    """
+    parts = [str(job_description).strip().lower(), resume_ids, top_k]
+    fingerprint = hashlib.blake2b(json.dumps(parts).encode("utf-8"), digest_size=16).hexdigest()
+    if cursor:
+        token, ranking, start = _RANKING_CURSORS.resolve(cursor, fingerprint)
+        start = min(start, ranking.total)
+    else:
+        ranking = match_and_rank_stream(job_description, resume_ids, top_k, deadline=deadline)
+        token, start = None, 0
+
+    stop = ranking.total if limit <= 0 else min(start + limit, ranking.total)
+    page = RankingPage(ranking, start, stop)
+    if stop < ranking.total:
+        if token is None:
+            kept = ranking.compact()
+            token = _RANKING_CURSORS.open(kept, fingerprint, kept.nbytes)
+        if token is not None:
+            page.next_cursor = encode_cursor(token, stop)
+    return page
+
+
+def _ranked_results(
+    resumes: list[ResumeRecord],
+    features: list[ResumeFeatures],
+    ats_scores: list[float],
+    job_skills: list[str],
+    top_k: int | None,
+    fields: frozenset[str] | None = None,
+) -> list[dict]:
+    selected = _top_rows(np.array(ats_scores), top_k)
+    ranking = Ranking(resumes, features, ats_scores, selected, job_skills, scored=len(resumes))
+    return ranking.page(0, len(selected), fields)
+
+
+def match_and_rank_many(
+    job_descriptions: list[str],
+    resume_ids: list[str] | None = None,
+    top_k: int | None = None,
+    fields: frozenset[str] | None = None,
+) -> list[list[dict]]:
+    """Rank the same resumes against several job descriptions with one sparse product."""
+    if not job_descriptions:
+        raise HTTPException(status_code=400, detail="job_descriptions must not be empty.")
+    for position, job_description in enumerate(job_descriptions):
+        if not job_description or not str(job_description).strip():
+            raise HTTPException(status_code=400, detail=f"job_descriptions[{position}] is required.")
 
-    return results
+    resumes = get_resumes(resume_ids)
+    if not resumes:
+        raise HTTPException(
+            status_code=400,
+            detail="No resumes available. Upload resumes first via /upload-resumes.",
+        )
 
+    features = _ensure_features(resumes)
+    vectorizer, _ = _get_models()
+    scores = _compute_ats_score_matrix(
+        vectorizer,
+        vstack([item.vector for item in features], format="csr"),
+        job_descriptions,
+    )
+    return [
+        _ranked_results(
+            resumes,
+            features,
+            [round(float(score), 2) for score in scores[:, job]],
+            extract_skills(job_description),
+            top_k,
+            fields,
+        )
+        for job, job_description in enumerate(job_descriptions)
+    ]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from fastapi import HTTPException
+
+
+class RankingCursors:
+    """Rankings held for a short TTL so later pages are read rather than re-scored.
+
+    ``open`` keeps a finished ranking under a random token together with the
+    fingerprint of the request that produced it; a cursor names the token and
+    the offset of the next page. Every read renews the TTL. The least recently
+    read rankings are dropped once their estimated size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_bytes: int = 0):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # token -> (ranking, fingerprint, size, expires at)
+        self._entries: OrderedDict[str, tuple[Any, str, int, float]] = OrderedDict()
+        self._bytes = 0
+        self._opened = 0
+        self._reads = 0
+        self._expired = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def open(self, ranking: Any, fingerprint: str, size: int) -> str | None:
+        """Keep ``ranking`` and return its token, or ``None`` when it exceeds the budget."""
+        if size > self.max_bytes:
+            return None
+        token = secrets.token_urlsafe(12)
+        with self._lock:
+            self._purge(time.monotonic())
+            self._entries[token] = (ranking, fingerprint, size, time.monotonic() + self.ttl_seconds)
+            self._bytes += size
+            self._opened += 1
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+        return token
+
+    def resolve(self, cursor: str, fingerprint: str) -> tuple[str, Any, int]:
+        """``(token, ranking, offset)`` for a cursor issued to the same request."""
+        token, offset = decode_cursor(cursor)
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            entry = self._entries.get(token)
+            if entry is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail="Cursor expired or unknown. Request the first page again.",
+                )
+            ranking, expected, size, _ = entry
+            if fingerprint != expected:
+                raise HTTPException(status_code=400, detail="Cursor was issued for a different request.")
+            self._entries[token] = (ranking, expected, size, now + self.ttl_seconds)
+            self._entries.move_to_end(token)
+            self._reads += 1
+        return token, ranking, offset
+
+    def _purge(self, now: float) -> None:
+        expired = [token for token, entry in self._entries.items() if entry[3] <= now]
+        for token in expired:
+            self._bytes -= self._entries.pop(token)[2]
+            self._expired += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def status(self) -> dict:
+        return {
+            "rankings": len(self),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "opened": self._opened,
+            "reads": self._reads,
+            "expired": self._expired,
+            "evictions": self._evictions,
+        }
+
+
+def encode_cursor(token: str, offset: int) -> str:
+    payload = json.dumps({"t": token, "o": offset}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        token, offset = payload["t"], payload["o"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor.") from None
+    if not isinstance(token, str) or not isinstance(offset, int) or offset < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    return token, offset
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+# encode(record) -> (resume_id, filename, text, vector or None, JSON-serializable meta)
+RecordEncoder = Callable[[Any], tuple[str, str, str, csr_matrix | None, dict]]
+# decode(resume_id, filename, text, vector or None, meta) -> record
+RecordDecoder = Callable[[str, str, str, csr_matrix | None, dict], Any]
+
+
+class MemoryResumeStore:
+    """Process-local resume store; the default for a single worker."""
+
+    backend = "memory"
+
+    def __init__(self):
+        self._records: dict[str, Any] = {}
+        self._pending: list[Any] = []
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def add(self, resume_id: str, record: Any) -> None:
+        with self._lock:
+            self._records[resume_id] = record
+            self._pending.append(record)
+            self._generation += 1
+
+    def update(self, records: list[Any]) -> None:
+        # Records are shared objects here, so their new features are already visible.
+        with self._lock:
+            self._generation += 1
+
+    def get(self, resume_id: str) -> Any | None:
+        return self._records.get(resume_id)
+
+    def records(self) -> list[Any]:
+        return list(self._records.values())
+
+    def refresh(self) -> list[Any]:
+        """Records added since the previous call."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return pending
+
+    def status(self) -> dict:
+        return {"backend": self.backend, "resumes": len(self), "generation": self.generation}
+
+
+class SharedResumeStore:
+    """Resume store shared by all worker processes on one machine.
+
+    Metadata and text live in SQLite; sparse feature vectors are appended to
+    two flat files (column indices and weights) that every worker maps
+    read-only, so the OS page cache holds a single copy. A generation counter
+    in SQLite is bumped by every write; workers pull only the rows written
+    after the generation they last saw.
+    """
+
+    backend = "shared"
+
+    def __init__(self, directory: Path, encode: RecordEncoder, decode: RecordDecoder):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._db_path = self.directory / "resumes.sqlite3"
+        self._indices_path = self.directory / "vectors.indices.i4"
+        self._weights_path = self.directory / "vectors.weights.f8"
+        self._encode = encode
+        self._decode = decode
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._records: dict[str, Any] = {}
+        self._seen_generation = 0
+        self._mapped_entries = 0
+        self._indices_map: np.ndarray | None = None
+        self._weights_map: np.ndarray | None = None
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread, opened on first use; sqlite3 connections are not shared across threads.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self._db_path, timeout=30.0, isolation_level=None)
+        return conn
+
+    def _init_db(self) -> None:
+        with closing(sqlite3.connect(self._db_path, timeout=30.0, isolation_level=None)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS resumes (
+                    position INTEGER PRIMARY KEY AUTOINCREMENT,
+                    resume_id TEXT NOT NULL UNIQUE,
+                    filename TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    vector_offset INTEGER,
+                    vector_nnz INTEGER,
+                    vector_dim INTEGER,
+                    meta TEXT NOT NULL,
+                    generation INTEGER NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS resumes_generation ON resumes (generation)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS store_meta (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            conn.execute(
+                "INSERT OR IGNORE INTO store_meta (key, value) "
+                "VALUES ('generation', 0), ('vector_entries', 0)"
+            )
+
+    def __len__(self) -> int:
+        # Rows are never deleted, so after refresh() this worker holds every row.
+        return len(self._records)
+
+    @property
+    def generation(self) -> int:
+        """The generation this worker's records reflect, as of its last ``refresh``."""
+        return self._seen_generation
+
+    @staticmethod
+    def _read_meta(conn: sqlite3.Connection, key: str) -> int:
+        return int(conn.execute("SELECT value FROM store_meta WHERE key = ?", (key,)).fetchone()[0])
+
+    def _append_vector(self, conn: sqlite3.Connection, vector: csr_matrix | None) -> tuple:
+        if vector is None:
+            return None, None, None
+        offset = self._read_meta(conn, "vector_entries")
+        indices = np.ascontiguousarray(vector.indices, dtype=np.int32)
+        weights = np.ascontiguousarray(vector.data, dtype=np.float64)
+        # Write at the committed length, so bytes left by a crashed writer are overwritten.
+        for path, values in ((self._indices_path, indices), (self._weights_path, weights)):
+            with path.open("r+b" if path.exists() else "w+b") as file:
+                file.seek(offset * values.itemsize)
+                file.write(values.tobytes())
+                file.flush()
+                os.fsync(file.fileno())
+        conn.execute(
+            "UPDATE store_meta SET value = value + ? WHERE key = 'vector_entries'",
+            (len(indices),),
+        )
+        return offset, len(indices), vector.shape[1]
+
+    def _write(self, records: list[Any], insert: bool) -> None:
+        conn = self._connect()
+        # BEGIN IMMEDIATE takes SQLite's write lock, serializing writers across processes.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'generation'")
+            generation = self._read_meta(conn, "generation")
+            for record in records:
+                resume_id, filename, text, vector, meta = self._encode(record)
+                offset, nnz, dim = self._append_vector(conn, vector)
+                values = (filename, text, offset, nnz, dim, json.dumps(meta), generation, resume_id)
+                if insert:
+                    conn.execute(
+                        "INSERT INTO resumes (filename, text, vector_offset, vector_nnz, "
+                        "vector_dim, meta, generation, resume_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        values,
+                    )
+                else:
+                    conn.execute(
+                        "UPDATE resumes SET filename = ?, text = ?, vector_offset = ?, vector_nnz = ?, "
+                        "vector_dim = ?, meta = ?, generation = ? WHERE resume_id = ?",
+                        values,
+                    )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def add(self, resume_id: str, record: Any) -> None:
+        # The record becomes visible here through refresh(), in store order like every other worker.
+        self._write([record], insert=True)
+
+    def update(self, records: list[Any]) -> None:
+        """Persist recomputed features; old vector entries are left unreferenced."""
+        if records:
+            self._write(records, insert=False)
+
+    def _vector(self, offset: int | None, nnz: int | None, dim: int | None) -> csr_matrix | None:
+        if offset is None:
+            return None
+        if nnz == 0:
+            return csr_matrix((1, dim), dtype=np.float64)
+        if offset + nnz > self._mapped_entries:
+            # Another writer grew the files since they were mapped.
+            self._indices_map = np.memmap(self._indices_path, dtype=np.int32, mode="r")
+            self._weights_map = np.memmap(self._weights_path, dtype=np.float64, mode="r")
+            self._mapped_entries = min(len(self._indices_map), len(self._weights_map))
+        return csr_matrix(
+            (
+                self._weights_map[offset:offset + nnz],
+                self._indices_map[offset:offset + nnz],
+                np.array([0, nnz], dtype=np.int32),
+            ),
+            shape=(1, dim),
+        )
+
+    def refresh(self) -> list[Any]:
+        """Load rows written by any worker since the previous call, in store order."""
+        with self._lock:
+            conn = self._connect()
+            generation = self._read_meta(conn, "generation")
+            if generation == self._seen_generation:
+                return []
+            rows = conn.execute(
+                "SELECT resume_id, filename, text, vector_offset, vector_nnz, vector_dim, meta "
+                "FROM resumes WHERE generation > ? AND generation <= ? ORDER BY position",
+                (self._seen_generation, generation),
+            ).fetchall()
+
+            loaded = []
+            for resume_id, filename, text, offset, nnz, dim, meta in rows:
+                record = self._decode(
+                    resume_id,
+                    filename,
+                    text,
+                    self._vector(offset, nnz, dim),
+                    json.loads(meta),
+                )
+                self._records[resume_id] = record
+                loaded.append(record)
+            self._seen_generation = generation
+            return loaded
+
+    def get(self, resume_id: str) -> Any | None:
+        return self._records.get(resume_id)
+
+    def records(self) -> list[Any]:
+        return list(self._records.values())
+
+    def status(self) -> dict:
+        return {
+            "backend": self.backend,
+            "resumes": len(self),
+            "generation": self.generation,
+            "path": str(self.directory),
+        }
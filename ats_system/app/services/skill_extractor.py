@@ -1,22 +1,17 @@
 from __future__ import annotations
 
 import json
-import re
 from functools import lru_cache
 from pathlib import Path
 from typing import Iterable
 
+from app.services.skill_matcher import SkillMatcher
+
 
 ATS_ROOT = Path(__file__).resolve().parents[2]
 SKILLS_PATH = ATS_ROOT / "data" / "skills.json"
 
 
-def _safe_boundary_pattern(skill: str) -> str:
-    # Works for skills such as "c++", ".net", "node.js".
-    escaped = re.escape(skill.strip().lower())
-    return rf"(?<!\w){escaped}(?!\w)"
-
-
 @lru_cache(maxsize=1)
 def load_skills_map() -> dict[str, list[str]]:
     with SKILLS_PATH.open("r", encoding="utf-8") as file:
@@ -36,25 +31,26 @@ def load_all_skills() -> list[str]:
     return list(seen.values())
 
 
+@lru_cache(maxsize=1)
+def _default_matcher() -> SkillMatcher:
+    return SkillMatcher(load_all_skills())
+
+
+@lru_cache(maxsize=32)
+def _compile_matcher(skill_candidates: tuple[str, ...]) -> SkillMatcher:
+    return SkillMatcher(skill_candidates)
+
+
+def get_skill_matcher(skill_candidates: Iterable[str] | None = None) -> SkillMatcher:
+    # Compiled once per candidate set; the taxonomy matcher is built on first use.
+    if skill_candidates is None:
+        return _default_matcher()
+    return _compile_matcher(tuple(skill_candidates))
+
+
 def extract_skills(text: str, skill_candidates: Iterable[str] | None = None) -> list[str]:
     normalized = str(text or "").lower()
-    candidates = list(skill_candidates) if skill_candidates is not None else load_all_skills()
-
-    found: list[str] = []
-    for skill in candidates:
-        if not skill:
-            continue
-        pattern = _safe_boundary_pattern(skill)
-        if re.search(pattern, normalized):
-            found.append(skill)
-
-    # Deduplicate while preserving order.
-    ordered_unique: dict[str, str] = {}
-    for skill in found:
-        lowered = skill.lower()
-        if lowered not in ordered_unique:
-            ordered_unique[lowered] = skill
-    return list(ordered_unique.values())
+    return get_skill_matcher(skill_candidates).extract(normalized)
 
 
 def missing_skills(resume_text: str, job_description: str) -> list[str]:
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+
+# Trie nodes are plain dicts keyed by single characters, so the empty string can
+# never collide with a child and marks "a skill ends here".
+_END = ""
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _safe_boundary_pattern(skill: str) -> str:
+    # Works for skills such as "c++", ".net", "node.js".
+    escaped = re.escape(skill.strip().lower())
+    return rf"(?<!\w){escaped}(?!\w)"
+
+
+class SkillMatcher:
+    """Compiled multi-pattern skill matcher.
+
+    Every candidate is inserted into a character trie once. A scan walks the
+    trie only from positions that are not preceded by a word character and
+    whose first character starts some skill, and accepts a hit only when it is
+    not followed by a word character. This gives exactly the matches of the
+    per-skill ``(?<!\\w)skill(?!\\w)`` regex in a single pass over the text,
+    independent of the number of skills.
+    """
+
+    def __init__(self, skill_candidates: Iterable[str]):
+        self._root: dict = {}
+        self._labels: dict[str, list[tuple[int, str]]] = {}
+        self._blank: list[tuple[int, str]] = []
+
+        seen: set[str] = set()
+        first_chars: set[str] = set()
+        for index, skill in enumerate(skill_candidates):
+            if not skill:
+                continue
+            # Output is de-duplicated on the lowercased label, keeping the first.
+            dedupe_key = skill.lower()
+            if dedupe_key in seen:
+                continue
+            seen.add(dedupe_key)
+
+            key = skill.strip().lower()
+            if not key:
+                self._blank.append((index, skill))
+                continue
+
+            self._labels.setdefault(key, []).append((index, skill))
+            node = self._root
+            for char in key:
+                node = node.setdefault(char, {})
+            node[_END] = key
+            first_chars.add(key[0])
+
+        self._start_pattern: re.Pattern[str] | None = None
+        if first_chars:
+            char_class = "".join(re.escape(char) for char in sorted(first_chars))
+            self._start_pattern = re.compile(rf"(?<!\w)[{char_class}]")
+
+    def __len__(self) -> int:
+        return len(self._labels) + len(self._blank)
+
+    def find_keys(self, normalized_text: str) -> set[str]:
+        """Return the lowercased keys of all skills present in ``normalized_text``."""
+        found: set[str] = set()
+        if self._start_pattern is None:
+            return found
+
+        root = self._root
+        text_length = len(normalized_text)
+        for start in self._start_pattern.finditer(normalized_text):
+            node = root
+            position = start.start()
+            while position < text_length:
+                node = node.get(normalized_text[position])
+                if node is None:
+                    break
+                position += 1
+                key = node.get(_END)
+                if key is not None and (
+                    position == text_length or not _WORD_CHAR.match(normalized_text, position)
+                ):
+                    found.add(key)
+        return found
+
+    def extract(self, normalized_text: str) -> list[str]:
+        """Return matched skills in candidate order, de-duplicated case-insensitively."""
+        hits: list[tuple[int, str]] = []
+        for key in self.find_keys(normalized_text):
+            hits.extend(self._labels[key])
+        for index, skill in self._blank:
+            if re.search(_safe_boundary_pattern(skill), normalized_text):
+                hits.append((index, skill))
+        hits.sort()
+        return [skill for _, skill in hits]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, BinaryIO, Callable
+
+import joblib
+
+
+@dataclass(frozen=True)
+class LoadedArtifact:
+    path: Path
+    value: Any
+    version: str
+    mtime_ns: int
+    loaded_at: float
+    load_seconds: float
+
+
+class ModelRegistry:
+    """Process-wide cache of deserialized model artifacts.
+
+    Each artifact is deserialized once and handed to readers without taking a
+    lock. The file is re-stat'ed at most every ``check_interval_seconds``; it
+    is only deserialized again when its mtime changed and its content hash
+    (the artifact version) differs from the loaded one.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[BinaryIO], Any] = joblib.load,
+        check_interval_seconds: float = 2.0,
+    ):
+        self._loader = loader
+        self._check_interval = check_interval_seconds
+        self._entries: dict[Path, LoadedArtifact] = {}
+        self._next_check: dict[Path, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str | Path) -> Any:
+        return self.entry(path).value
+
+    def entry(self, path: str | Path) -> LoadedArtifact:
+        path = Path(path)
+        entry = self._entries.get(path)
+        if entry is not None and time.monotonic() < self._next_check.get(path, 0.0):
+            return entry
+        return self._refresh(path)
+
+    def _refresh(self, path: Path) -> LoadedArtifact:
+        with self._lock:
+            entry = self._entries.get(path)
+            now = time.monotonic()
+            if entry is not None and now < self._next_check.get(path, 0.0):
+                return entry
+
+            try:
+                mtime_ns = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                if entry is None:
+                    raise
+                # Keep serving the loaded artifact if the file disappears.
+                self._next_check[path] = now + self._check_interval
+                return entry
+
+            if entry is None or mtime_ns != entry.mtime_ns:
+                # Hash and deserialize the same bytes so the version always matches the object.
+                payload = path.read_bytes()
+                version = hashlib.sha256(payload).hexdigest()[:12]
+                if entry is None or version != entry.version:
+                    started = time.perf_counter()
+                    value = self._loader(io.BytesIO(payload))
+                    entry = LoadedArtifact(
+                        path=path,
+                        value=value,
+                        version=version,
+                        mtime_ns=mtime_ns,
+                        loaded_at=time.time(),
+                        load_seconds=round(time.perf_counter() - started, 4),
+                    )
+                else:
+                    entry = replace(entry, mtime_ns=mtime_ns)
+                self._entries[path] = entry
+
+            self._next_check[path] = now + self._check_interval
+            return entry
+
+    def is_loaded(self, path: str | Path) -> bool:
+        return Path(path) in self._entries
+
+    def status(self) -> list[dict]:
+        return [
+            {
+                "artifact": entry.path.name,
+                "version": entry.version,
+                "loaded_at": entry.loaded_at,
+                "load_seconds": entry.load_seconds,
+            }
+            for entry in self._entries.values()
+        ]
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import the service as ``app``, the way it runs from this directory.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
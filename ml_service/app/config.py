@@ -64,10 +64,54 @@ class Settings:
 
     ats_vectorizer_path: Path = MODELS_DIR / "ats_vectorizer.pkl"
     ats_classifier_path: Path = MODELS_DIR / "ats_classifier.pkl"
+    ats_lsa_path: Path = MODELS_DIR / "ats_lsa.pkl"
     ats_training_dataset_path: Path = (
         PROJECT_ROOT.parent / "ats_system" / "data" / "sample_resumes" / "labeled_resumes.csv"
     )
     ats_skills_path: Path = DATA_DIR / "skills.json"
+    ats_skills_watch_enabled: bool = _as_bool(os.getenv("ATS_SKILLS_WATCH_ENABLED"), True)
+    ats_skills_watch_seconds: float = _as_float(os.getenv("ATS_SKILLS_WATCH_SECONDS"), 30.0)
+    # "memory" keeps resumes per process; "shared" persists them for all workers on the host.
+    ats_store_backend: str = (os.getenv("ATS_STORE_BACKEND") or "memory").strip().lower()
+    ats_store_dir: Path = Path(os.getenv("ATS_STORE_DIR") or DATA_DIR / "resume_store")
+    # Memory budget of the in-memory store; least recently used resumes are evicted beyond it.
+    ats_store_max_bytes: int = _as_int(os.getenv("ATS_STORE_MAX_BYTES"), 512 * 1024 * 1024)
+    ats_store_ttl_seconds: float = _as_float(os.getenv("ATS_STORE_TTL_SECONDS"), 0.0)
+    # Periodic and shutdown snapshots of the in-memory store, restored on startup.
+    ats_snapshot_enabled: bool = _as_bool(os.getenv("ATS_SNAPSHOT_ENABLED"), True)
+    ats_snapshot_dir: Path = Path(os.getenv("ATS_SNAPSHOT_DIR") or DATA_DIR / "ats_snapshot")
+    ats_snapshot_seconds: float = _as_float(os.getenv("ATS_SNAPSHOT_SECONDS"), 300.0)
+    # Score across this many processes once a query covers ats_shard_min_resumes resumes (0 = off).
+    ats_shard_workers: int = _as_int(os.getenv("ATS_SHARD_WORKERS"), 0)
+    ats_shard_min_resumes: int = _as_int(os.getenv("ATS_SHARD_MIN_RESUMES"), 20000)
+    # Dimensions of the optional dense LSA similarity mode (0 disables it).
+    ats_lsa_components: int = _as_int(os.getenv("ATS_LSA_COMPONENTS"), 0)
+    # Approximate top-k retrieval through an IVF index once a query covers ats_ann_min_resumes.
+    # Recall grows with ats_ann_probes (cells visited) and ats_ann_min_candidates (rows rescored).
+    ats_ann_enabled: bool = _as_bool(os.getenv("ATS_ANN_ENABLED"), False)
+    ats_ann_min_resumes: int = _as_int(os.getenv("ATS_ANN_MIN_RESUMES"), 100000)
+    ats_ann_lists: int = _as_int(os.getenv("ATS_ANN_LISTS"), 0)
+    ats_ann_probes: int = _as_int(os.getenv("ATS_ANN_PROBES"), 8)
+    ats_ann_min_candidates: int = _as_int(os.getenv("ATS_ANN_MIN_CANDIDATES"), 2000)
+    # Results per chunk of a streamed (NDJSON) /match or /rank response.
+    ats_stream_chunk_size: int = _as_int(os.getenv("ATS_STREAM_CHUNK_SIZE"), 256)
+    # Resumes scored between deadline checks when a /match or /rank request sets deadline_ms.
+    ats_deadline_chunk_size: int = _as_int(os.getenv("ATS_DEADLINE_CHUNK_SIZE"), 5000)
+    # LRU of complete /match and /rank results, keyed on the request and the store generation.
+    ats_result_cache_enabled: bool = _as_bool(os.getenv("ATS_RESULT_CACHE_ENABLED"), True)
+    ats_result_cache_bytes: int = _as_int(os.getenv("ATS_RESULT_CACHE_BYTES"), 64 * 1024 * 1024)
+    ats_result_cache_max_results: int = _as_int(os.getenv("ATS_RESULT_CACHE_MAX_RESULTS"), 1000)
+    # Job descriptions accepted by one /match/batch request, e.g. a nightly run over every open requisition.
+    ats_batch_max_jobs: int = _as_int(os.getenv("ATS_BATCH_MAX_JOBS"), 1000)
+    # Rankings kept for cursor pagination of /match and /rank; each read renews the TTL.
+    ats_cursor_ttl_seconds: float = _as_float(os.getenv("ATS_CURSOR_TTL_SECONDS"), 300.0)
+    ats_cursor_bytes: int = _as_int(os.getenv("ATS_CURSOR_BYTES"), 64 * 1024 * 1024)
+    # Standing /queries kept up to date on upload; the SSE feed checks for changes this often.
+    ats_standing_queries_max: int = _as_int(os.getenv("ATS_STANDING_QUERIES_MAX"), 500)
+    ats_query_events_seconds: float = _as_float(os.getenv("ATS_QUERY_EVENTS_SECONDS"), 1.0)
+    # Estimated word-shingle Jaccard at which an upload counts as a near-duplicate of a stored resume.
+    ats_duplicates_enabled: bool = _as_bool(os.getenv("ATS_DUPLICATES_ENABLED"), True)
+    ats_duplicate_threshold: float = _as_float(os.getenv("ATS_DUPLICATE_THRESHOLD"), 0.8)
 
     jsearch_api_key: str | None = _get_env(
         "JSEARCH_API_KEY",
@@ -1,30 +1,58 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, Optional
 import uuid
 
-from fastapi import FastAPI, File, Form, HTTPException, Query, UploadFile
+from fastapi import FastAPI, File, Form, HTTPException, Query, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from loguru import logger
 
 from .config import settings
 from .models.ats_scorer import ATSScorer
 from .models.feature_extractor import FeatureExtractor
 from .models.predictor import CareerPredictor
 from .models.resume_parser import ResumeParser
-from .schemas.resume import MatchRequest, PredictionResponse
+from .schemas.resume import MatchBatchRequest, MatchRequest, PredictionResponse, StandingQueryRequest
 from .service.ats_matcher import (
-    add_resume,
+    get_ann_status,
+    get_duplicates_status,
     get_models,
+    get_models_status,
+    get_query,
+    get_ranking_cursors_status,
+    get_result_cache_status,
+    get_sharded_scoring_status,
+    get_standing_queries_status,
     get_store_size,
-    match_and_rank,
+    get_store_status,
+    ingest_resumes,
+    list_queries,
+    match_and_rank_many,
+    match_and_rank_page,
     predict_category,
+    register_query,
+    remove_query,
+    restore_snapshot,
+    result_fields,
+    save_snapshot,
+    snapshot_periodically,
+    start_sharded_scoring,
+    stop_sharded_scoring,
+    update_queries,
 )
 from .service.job_fetcher import JobFetcher
-from .service.parser import parse_upload_file
-from .service.resume_profile_extractor import extract_resume_profile
-from .service.skill_extractor import extract_skills, missing_skills
+from .service.facet_index import FacetFilter
+from .service.skill_bitmap import SkillFilter
+from .service.parser import ParsedResume, parse_upload_file
+from .service.resume_profile_extractor import extract_resume_profile, scan_resume_text
+from .service.skill_extractor import missing_skills_many
+from .service.skill_registry import get_skill_registry, reload_skill_registry, watch_skill_registry
 from .utils.database import db
 
 
@@ -35,6 +63,24 @@ scorer: ATSScorer | None = None
 job_fetcher: JobFetcher | None = None
 
 
+def _wants_stream(request: Request, stream: bool) -> bool:
+    return stream or "application/x-ndjson" in request.headers.get("accept", "")
+
+
+def _ndjson_response(header: dict, chunks: Iterator[list[dict]]) -> StreamingResponse:
+    # One header line, then one line per result; a chunk is only built when the client has taken the previous one.
+    def lines() -> Iterator[bytes]:
+        yield (json.dumps(header) + "\n").encode("utf-8")
+        for chunk in chunks:
+            yield "".join(json.dumps(result) + "\n" for result in chunk).encode("utf-8")
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _deadline(deadline_ms: int) -> float | None:
+    return time.monotonic() + deadline_ms / 1000.0 if deadline_ms > 0 else None
+
+
 def _parse_remote_flag(remote: Optional[str]) -> bool:
     if remote is None:
         return settings.jsearch_default_remote
@@ -80,6 +126,37 @@ def _name_from_filename(filename: str | None) -> str:
     return stem[:80]
 
 
+def _store_uploads(parsed_files: list[ParsedResume], on_duplicate: str) -> dict:
+    if not parsed_files:
+        return {"uploaded": 0, "duplicates": 0, "resumes": [], "total_resumes_in_store": get_store_size()}
+
+    skill_registry = get_skill_registry()
+    stored = ingest_resumes(((parsed.filename, parsed.text) for parsed in parsed_files), on_duplicate)
+    uploaded = [
+        {
+            "resume_id": resume_id,
+            "filename": parsed.filename,
+            "extension": parsed.extension,
+            "text_length": len(parsed.text),
+            "skills": skill_registry.scan(parsed.text).skills,
+            "action": action,
+            "duplicate_of": duplicate[0] if duplicate is not None else None,
+            "duplicate_similarity": round(duplicate[1], 4) if duplicate is not None else None,
+        }
+        for parsed, (resume_id, action, duplicate) in zip(parsed_files, stored)
+    ]
+
+    # Score the new resumes against the standing queries once per upload, not once per file.
+    update_queries()
+    return {
+        "uploaded": len(uploaded),
+        "duplicates": sum(1 for item in uploaded if item["duplicate_of"] is not None),
+        "resumes": uploaded,
+        "total_resumes_in_store": get_store_size(),
+        "skills_taxonomy_version": skill_registry.version,
+    }
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global feature_extractor, predictor, scorer, job_fetcher
@@ -89,7 +166,29 @@ async def lifespan(app: FastAPI):
     scorer = ATSScorer(feature_extractor.vectorizer)
     job_fetcher = JobFetcher()
     get_models()  # Warm ATS category models.
+    get_skill_registry()  # Compile the shared skill dictionary once.
+    skills_watcher = (
+        asyncio.create_task(watch_skill_registry(settings.ats_skills_watch_seconds))
+        if settings.ats_skills_watch_enabled
+        else None
+    )
+    snapshotter = None
+    if settings.ats_snapshot_enabled:
+        restored = restore_snapshot()
+        if restored:
+            logger.info(f"Restored {restored} resumes from {settings.ats_snapshot_dir}")
+        snapshotter = asyncio.create_task(snapshot_periodically(settings.ats_snapshot_seconds))
+    await asyncio.to_thread(start_sharded_scoring)
     yield
+    stop_sharded_scoring()
+    if skills_watcher is not None:
+        skills_watcher.cancel()
+    if snapshotter is not None:
+        snapshotter.cancel()
+        try:
+            save_snapshot()
+        except Exception as error:
+            logger.warning(f"Resume snapshot on shutdown failed: {error}")
 
 
 app = FastAPI(
@@ -110,7 +209,30 @@ app.add_middleware(
 
 @app.get("/health", tags=["system"])
 async def health():
-    return {"status": "ok", "service": "rexion_ml_ats"}
+    return {
+        "status": "ok",
+        "service": "rexion_ml_ats",
+        "skills_taxonomy_version": get_skill_registry().version,
+        "ats_models": get_models_status(),
+        "resume_store": get_store_status(),
+        "sharded_scoring": get_sharded_scoring_status(),
+        "ann_index": get_ann_status(),
+        "near_duplicates": get_duplicates_status(),
+        "result_cache": get_result_cache_status(),
+        "ranking_cursors": get_ranking_cursors_status(),
+        "standing_queries": get_standing_queries_status(),
+    }
+
+
+@app.post("/skills/reload", tags=["system"])
+async def reload_skills():
+    previous_version = get_skill_registry().version
+    try:
+        # Compile off the event loop; requests keep using the previous registry until the swap.
+        registry = await asyncio.to_thread(reload_skill_registry)
+    except (OSError, ValueError) as error:
+        raise HTTPException(status_code=400, detail=f"Could not reload skills taxonomy: {error}") from error
+    return {"previous_version": previous_version, **registry.status()}
 
 
 @app.post("/predict", response_model=PredictionResponse, tags=["prediction"])
@@ -137,9 +259,12 @@ async def predict(
     career_path = str(predictions[0])
     confidence = float(probabilities[0])
 
-    profile = extract_resume_profile(text)
+    # One registry scan of the normalized text feeds taxonomy skills, profile skills and coverage.
+    skill_registry = get_skill_registry()
+    resume_scan = scan_resume_text(text, skill_registry)
+    profile = extract_resume_profile(text, resume_scan)
     resolved_name = profile.name or _name_from_filename(file.filename)
-    extracted = _merge_unique([*extract_skills(text), *profile.skills], limit=30)
+    extracted = _merge_unique([*resume_scan.skills, *profile.skills], limit=30)
     jd_used = (
         str(job_description).strip()
         if job_description and str(job_description).strip()
@@ -147,10 +272,16 @@ async def predict(
     )
     remote_jobs_only = _parse_remote_flag(remote)
 
-    score_details = scorer.score(text, job_description=jd_used, return_details=True)
+    skill_matrix = skill_registry.incidence([resume_scan, skill_registry.scan(jd_used)])
+    score_details = scorer.score(
+        text,
+        job_description=jd_used,
+        return_details=True,
+        skill_coverage=float(ATSScorer.skill_coverage_many(skill_matrix[0], skill_matrix[1])[0]),
+    )
     ats_score = float(score_details["ats_score"])
     predicted_category = predict_category(text)
-    missing = missing_skills(text, jd_used)
+    missing = missing_skills_many(skill_matrix[0], skill_matrix[1], skill_registry.skills)[0]
 
     jobs = await job_fetcher.search_jobs(
         query=career_path,
@@ -172,6 +303,7 @@ async def predict(
         "ats_score": ats_score,
         "predicted_category": predicted_category,
         "job_description_used": jd_used,
+        "skills_taxonomy_version": skill_registry.version,
         "extracted_skills": extracted,
         "missing_skills": missing,
         "jobs_query_meta": {
@@ -213,6 +345,7 @@ async def predict(
         ats_score=ats_score,
         predicted_category=predicted_category,
         job_description_used=jd_used,
+        skills_taxonomy_version=skill_registry.version,
         extracted_skills=extracted,
         missing_skills=missing,
         jobs=jobs_limited,
@@ -238,56 +371,187 @@ async def search_jobs(
 
 
 @app.post("/upload-resumes", tags=["ats"])
-async def upload_resumes(resumes: list[UploadFile] = File(...)):
-    if not resumes:
-        return {"uploaded": 0, "resumes": [], "total_resumes_in_store": get_store_size()}
-
-    uploaded: list[dict] = []
-    for file in resumes:
-        parsed = await parse_upload_file(file)
-        resume_id = add_resume(parsed.filename, parsed.text)
-        uploaded.append(
-            {
-                "resume_id": resume_id,
-                "filename": parsed.filename,
-                "extension": parsed.extension,
-                "text_length": len(parsed.text),
-                "skills": extract_skills(parsed.text),
-            }
-        )
-
-    return {
-        "uploaded": len(uploaded),
-        "resumes": uploaded,
-        "total_resumes_in_store": get_store_size(),
-    }
+async def upload_resumes(
+    resumes: list[UploadFile] = File(...),
+    on_duplicate: str = Form(default="link", pattern="^(link|replace|keep)$"),
+):
+    parsed_files = [await parse_upload_file(file) for file in resumes or []]
+    # Vectorizing and indexing take the index lock; keep them off the event loop.
+    return await asyncio.to_thread(_store_uploads, parsed_files, on_duplicate)
 
 
 @app.post("/match", tags=["ats"])
-async def match(request: MatchRequest):
-    results = match_and_rank(
+async def match(request: MatchRequest, http_request: Request, stream: bool = Query(False)):
+    deadline = _deadline(request.deadline_ms)
+    fields = result_fields(request.fields)
+    skill_registry = get_skill_registry()
+    streaming = _wants_stream(http_request, stream)
+    # Ranking blocks on scoring (and the shard pool); keep it off the event loop.
+    page = await asyncio.to_thread(
+        match_and_rank_page,
         job_description=request.job_description,
         resume_ids=request.resume_ids,
+        skill_registry=skill_registry,
+        skill_filter=SkillFilter.from_values(
+            request.require_skills,
+            request.any_skills,
+            request.exclude_skills,
+        ),
+        similarity=request.similarity,
+        deadline=deadline,
+        limit=request.limit,
+        cursor=request.cursor,
     )
-    return {
+    header = {
         "job_description": request.job_description,
-        "total_matched": len(results),
-        "results": results,
+        "skills_taxonomy_version": skill_registry.version,
+        "similarity": request.similarity,
+        "total_matched": page.ranking.total,
+        "partial": page.ranking.partial,
+        "scored_resumes": page.ranking.scored,
+        "unscored_resumes": page.ranking.unscored,
+        "next_cursor": page.next_cursor,
+    }
+    if streaming:
+        return _ndjson_response(header, page.chunks(settings.ats_stream_chunk_size, fields))
+    return {**header, "results": [result for chunk in page.chunks(fields=fields) for result in chunk]}
+
+
+@app.post("/match/batch", tags=["ats"])
+async def match_batch(request: MatchBatchRequest):
+    skill_registry = get_skill_registry()
+    rankings = await asyncio.to_thread(
+        match_and_rank_many,
+        job_descriptions=request.job_descriptions,
+        resume_ids=request.resume_ids,
+        skill_registry=skill_registry,
+        skill_filter=SkillFilter.from_values(
+            request.require_skills,
+            request.any_skills,
+            request.exclude_skills,
+        ),
+        top_k=request.top_k if request.top_k > 0 else None,
+        fields=result_fields(request.fields),
+    )
+    return {
+        "skills_taxonomy_version": skill_registry.version,
+        "total_job_descriptions": len(rankings),
+        "rankings": [
+            {
+                "job_description": job_description,
+                "total_matched": len(results),
+                "results": results,
+            }
+            for job_description, results in zip(request.job_descriptions, rankings)
+        ],
     }
 
 
 @app.get("/rank", tags=["ats"])
 async def rank(
+    http_request: Request,
     job_description: str = Query(..., min_length=10),
     top_k: int = Query(0, ge=0, le=100),
+    require_skills: Optional[list[str]] = Query(default=None),
+    any_skills: Optional[list[str]] = Query(default=None),
+    exclude_skills: Optional[list[str]] = Query(default=None),
+    similarity: str = Query("tfidf", pattern="^(tfidf|lsa)$"),
+    stream: bool = Query(False),
+    deadline_ms: int = Query(0, ge=0, le=60000),
+    limit: int = Query(0, ge=0, le=500),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[list[str]] = Query(default=None),
+    category: Optional[list[str]] = Query(default=None),
+    min_experience_years: Optional[int] = Query(None, ge=0),
+    max_experience_years: Optional[int] = Query(None, ge=0),
 ):
-    results = match_and_rank(job_description=job_description, resume_ids=None)
-    ranked = results[:top_k] if top_k > 0 else results
-    return {
+    deadline = _deadline(deadline_ms)
+    result_keys = result_fields(fields)
+    facet_filter = FacetFilter.from_values(category, min_experience_years, max_experience_years)
+    skill_registry = get_skill_registry()
+    streaming = _wants_stream(http_request, stream)
+    page = await asyncio.to_thread(
+        match_and_rank_page,
+        job_description=job_description,
+        resume_ids=None,
+        skill_registry=skill_registry,
+        skill_filter=SkillFilter.from_values(require_skills, any_skills, exclude_skills),
+        top_k=top_k if top_k > 0 else None,
+        similarity=similarity,
+        deadline=deadline,
+        limit=limit,
+        cursor=cursor,
+        facet_filter=facet_filter,
+    )
+    header = {
         "job_description": job_description,
-        "total_ranked": len(ranked),
-        "results": ranked,
+        "skills_taxonomy_version": skill_registry.version,
+        "similarity": similarity,
+        "total_ranked": page.ranking.total,
+        "partial": page.ranking.partial,
+        "scored_resumes": page.ranking.scored,
+        "unscored_resumes": page.ranking.unscored,
+        "next_cursor": page.next_cursor,
+        "facets": {"category": page.ranking.facets},
     }
+    if streaming:
+        return _ndjson_response(header, page.chunks(settings.ats_stream_chunk_size, result_keys))
+    return {**header, "results": [result for chunk in page.chunks(fields=result_keys) for result in chunk]}
+
+
+@app.post("/queries", tags=["ats"])
+async def create_standing_query(request: StandingQueryRequest):
+    return await asyncio.to_thread(
+        register_query,
+        request.job_description,
+        request.top_k,
+        SkillFilter.from_values(request.require_skills, request.any_skills, request.exclude_skills),
+    )
+
+
+@app.get("/queries", tags=["ats"])
+async def list_standing_queries():
+    queries = await asyncio.to_thread(list_queries)
+    return {"total": len(queries), "queries": queries}
+
+
+@app.get("/queries/{query_id}/results", tags=["ats"])
+async def get_standing_query_results(query_id: str):
+    return await asyncio.to_thread(get_query, query_id)
+
+
+@app.get("/queries/{query_id}/events", tags=["ats"])
+async def stream_standing_query(query_id: str, http_request: Request):
+    snapshot = await asyncio.to_thread(get_query, query_id)
+
+    async def events():
+        # Server-Sent Events: the ranking whenever its version moves, a comment line as keep-alive.
+        current = snapshot
+        version = None
+        idle = 0.0
+        while not await http_request.is_disconnected():
+            if current["version"] != version:
+                version = current["version"]
+                idle = 0.0
+                yield f"event: ranking\nid: {version}\ndata: {json.dumps(current)}\n\n"
+            elif idle >= 15.0:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(settings.ats_query_events_seconds)
+            idle += settings.ats_query_events_seconds
+            try:
+                current = await asyncio.to_thread(get_query, query_id)
+            except HTTPException:
+                yield f"event: deleted\ndata: {json.dumps({'query_id': query_id})}\n\n"
+                return
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.delete("/queries/{query_id}", tags=["ats"])
+async def delete_standing_query(query_id: str):
+    remove_query(query_id)
+    return {"success": True, "message": f"Standing query {query_id} deleted"}
 
 
 @app.get("/predictions/{prediction_id}", tags=["history"])
@@ -3,17 +3,21 @@ from __future__ import annotations
 from typing import Any
 
 import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.decomposition import TruncatedSVD
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 
-from ..service.skill_extractor import extract_skills
+from ..service.skill_extractor import extract_skills_many, skill_presence
 
 
 class ATSScorer:
     """Score resume for ATS compatibility against a job description."""
 
-    def __init__(self, vectorizer: TfidfVectorizer | None = None):
+    def __init__(self, vectorizer: TfidfVectorizer | None = None, lsa: TruncatedSVD | None = None):
         self.vectorizer = vectorizer
+        self.lsa = lsa
 
     def _safe_similarity(self, resume_text: str, job_description: str) -> float:
         if not resume_text.strip() or not job_description.strip():
@@ -35,16 +39,84 @@ class ATSScorer:
         vectors = transient_vectorizer.fit_transform([resume_text, job_description])
         return float(cosine_similarity(vectors[0], vectors[1])[0][0])
 
-    def _skill_coverage(self, resume_text: str, job_description: str) -> float:
-        jd_skills = extract_skills(job_description)
-        if not jd_skills:
-            return 0.5
+    def similarity_many(
+        self,
+        texts: list[str] | None,
+        job_description: str,
+        resume_vectors: csr_matrix | None = None,
+    ) -> np.ndarray:
+        """Cosine similarity of every text to the job description.
+
+        The job description is transformed once and all rows are scored with a
+        single sparse product. ``resume_vectors`` may hold the L2-normalized
+        rows of ``texts`` as transformed by ``self.vectorizer``; ``texts`` is
+        then only read if that vectorizer turns out to be unusable.
+        """
+        if not job_description.strip():
+            return np.zeros(resume_vectors.shape[0] if resume_vectors is not None else len(texts))
+
+        if self.vectorizer is not None and hasattr(self.vectorizer, "vocabulary_"):
+            try:
+                if resume_vectors is None:
+                    resume_vectors = normalize(self.vectorizer.transform(texts))
+                job_vector = normalize(self.vectorizer.transform([job_description]))
+                # Blank texts have all-zero rows, so they score 0.0 like _safe_similarity.
+                return (resume_vectors @ job_vector.T).toarray().ravel()
+            except Exception:
+                pass
+
+        if texts is None:
+            raise ValueError("texts are required when resume_vectors cannot be scored.")
+        return np.array([self._safe_similarity(text, job_description) for text in texts], dtype=float)
+
+    @staticmethod
+    def project(lsa: TruncatedSVD, vectors: csr_matrix) -> np.ndarray:
+        """L2-normalized float32 LSA projection of L2-normalized TF-IDF rows."""
+        return normalize(lsa.transform(vectors)).astype(np.float32)
+
+    def dense_similarity_many(self, resume_dense: np.ndarray, job_description: str) -> np.ndarray:
+        """Cosine similarity in LSA space: one dense GEMV over the projected resume rows."""
+        if self.vectorizer is None or self.lsa is None:
+            raise ValueError("A fitted vectorizer and LSA projection are required for dense similarity.")
+        if not job_description.strip():
+            return np.zeros(resume_dense.shape[0])
+        job_dense = self.project(self.lsa, normalize(self.vectorizer.transform([job_description])))[0]
+        return (resume_dense @ job_dense).astype(np.float64)
+
+    def similarity_matrix(self, resume_vectors: csr_matrix, job_descriptions: list[str]) -> np.ndarray:
+        """(resumes x jobs) cosine similarities from one sparse product.
+
+        Column ``j`` equals ``similarity_many(None, job_descriptions[j], resume_vectors)``.
+        """
+        if self.vectorizer is None or not hasattr(self.vectorizer, "vocabulary_"):
+            raise ValueError("A fitted vectorizer is required to score a batch of job descriptions.")
+        job_vectors = normalize(self.vectorizer.transform(job_descriptions))
+        return (resume_vectors @ job_vectors.T).toarray()
+
+    @staticmethod
+    def skill_coverage_many(resume_skills: csr_matrix, job_skills: csr_matrix) -> np.ndarray:
+        """Fraction of the job's skills found in each resume row of ``resume_skills``."""
+        if job_skills.nnz == 0:
+            return np.full(resume_skills.shape[0], 0.5)
+
+        _, present = skill_presence(resume_skills, job_skills)
+        return present.sum(axis=1) / present.shape[1]
+
+    @staticmethod
+    def skill_coverage_matrix(resume_skills: csr_matrix, job_skills: csr_matrix) -> np.ndarray:
+        """(resumes x jobs) ``skill_coverage_many`` for every job row of ``job_skills`` at once."""
+        overlap = (resume_skills @ job_skills.T).toarray()
+        job_sizes = job_skills.getnnz(axis=1)
+        coverage = overlap / np.maximum(job_sizes, 1)
+        coverage[:, job_sizes == 0] = 0.5
+        return coverage
 
-        resume_skill_set = set(item.lower() for item in extract_skills(resume_text))
-        matched = sum(1 for skill in jd_skills if skill.lower() in resume_skill_set)
-        return matched / len(jd_skills)
+    def _skill_coverage(self, resume_text: str, job_description: str) -> float:
+        matrix, _ = extract_skills_many([resume_text, job_description])
+        return float(self.skill_coverage_many(matrix[0], matrix[1])[0])
 
-    def _structure_quality(self, resume_text: str) -> float:
+    @staticmethod
+    def structure_quality(resume_text: str) -> float:
         text_lower = resume_text.lower()
         score = 0.55
 
@@ -71,10 +143,12 @@ class ATSScorer:
         text: str,
         job_description: str,
         return_details: bool = False,
+        skill_coverage: float | None = None,
     ) -> float | dict[str, Any]:
         tfidf_similarity = self._safe_similarity(text, job_description)
-        skill_coverage = self._skill_coverage(text, job_description)
-        structure_quality = self._structure_quality(text)
+        if skill_coverage is None:
+            skill_coverage = self._skill_coverage(text, job_description)
+        structure_quality = self.structure_quality(text)
 
         # Weighted score:
         # - semantic relevance (50%)
@@ -96,3 +170,48 @@ class ATSScorer:
             "skill_coverage": round(skill_coverage * 100.0, 2),
             "structure_quality": round(structure_quality * 100.0, 2),
         }
+
+    def score_many(
+        self,
+        texts: list[str] | None,
+        job_description: str,
+        skill_coverage: np.ndarray,
+        resume_vectors: csr_matrix | None = None,
+        structure_quality: np.ndarray | None = None,
+        resume_dense: np.ndarray | None = None,
+    ) -> dict[str, np.ndarray]:
+        """Unrounded ``score`` details for a batch of resumes, as 0-100 arrays.
+
+        Job-independent inputs precomputed at ingest (``resume_vectors``,
+        ``structure_quality``) are used as given; with both, ``texts`` may be None.
+        With ``resume_dense`` (``project`` rows) the similarity term is the LSA
+        cosine instead of the sparse TF-IDF one.
+        """
+        if resume_dense is not None:
+            tfidf_similarity = self.dense_similarity_many(resume_dense, job_description)
+        else:
+            tfidf_similarity = self.similarity_many(texts, job_description, resume_vectors)
+        if structure_quality is None:
+            structure_quality = np.array([self.structure_quality(text) for text in texts], dtype=float)
+
+        return self.combine(tfidf_similarity, skill_coverage, structure_quality)
+
+    @staticmethod
+    def combine(
+        tfidf_similarity: np.ndarray,
+        skill_coverage: np.ndarray,
+        structure_quality: np.ndarray,
+    ) -> dict[str, np.ndarray]:
+        """Weight the component fractions into unrounded 0-100 ``score`` details (broadcasting)."""
+        weighted = (
+            (0.50 * tfidf_similarity)
+            + (0.35 * skill_coverage)
+            + (0.15 * structure_quality)
+        ) * 100.0
+
+        return {
+            "ats_score": np.clip(weighted, 0.0, 100.0),
+            "tfidf_similarity": tfidf_similarity * 100.0,
+            "skill_coverage": skill_coverage * 100.0,
+            "structure_quality": structure_quality * 100.0,
+        }
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from pathlib import Path
-import re
 from typing import List, Tuple
 import warnings
 
@@ -9,6 +8,8 @@ import joblib
 import numpy as np
 from sklearn.linear_model import LogisticRegression
 
+from ..service.skill_registry import CAREER_HEURISTIC_TABLE, CAREER_SKILL_KEYWORDS, get_skill_registry
+
 class CareerPredictor:
     def __init__(self, model_path: str | Path | None = None):
         self.model = None
@@ -35,38 +36,7 @@ class CareerPredictor:
                 model.n_features_in_ = model.coef_.shape[1]
 
     # Skill to career mapping for intelligent guessing when no model is trained
-    SKILL_CAREER_MAP = {
-        'python': 'Data Scientist',
-        'django': 'Backend Developer',
-        'fastapi': 'Backend Developer',
-        'nodejs': 'Backend Developer',
-        'node': 'Backend Developer',
-        'react': 'Frontend Developer',
-        'vue': 'Frontend Developer',
-        'angular': 'Frontend Developer',
-        'typescript': 'Frontend Developer',
-        'javascript': 'Frontend Developer',
-        'aws': 'DevOps Engineer',
-        'kubernetes': 'DevOps Engineer',
-        'docker': 'DevOps Engineer',
-        'terraform': 'DevOps Engineer',
-        'sql': 'Database Administrator',
-        'mongodb': 'Backend Developer',
-        'postgresql': 'Backend Developer',
-        'machine learning': 'Data Scientist',
-        'tensorflow': 'Data Scientist',
-        'pytorch': 'Data Scientist',
-        'deep learning': 'Data Scientist',
-        'nlp': 'Data Scientist',
-        'java': 'Backend Developer',
-        'c++': 'Software Engineer',
-        'golang': 'Backend Developer',
-        'rust': 'Systems Engineer',
-        'product': 'Product Manager',
-        'leadership': 'Product Manager',
-        'management': 'Project Manager',
-        'agile': 'Project Manager',
-    }
+    SKILL_CAREER_MAP = CAREER_SKILL_KEYWORDS
 
     CAREER_PATHS = [
         'Software Engineer',
@@ -96,20 +66,9 @@ class CareerPredictor:
         Predict career path based on skills found in resume text
         when no trained model is available
         """
-        text_lower = text.lower()
-        # Remove special characters for better matching
-        cleaned_text = re.sub(r'[^a-zA-Z0-9\s]', ' ', text_lower)
-        
-        skill_scores = {}
-        
-        # Count skill occurrences
-        for skill, career in self.SKILL_CAREER_MAP.items():
-            # Count how many times this skill appears
-            count = cleaned_text.count(skill)
-            if count > 0:
-                if career not in skill_scores:
-                    skill_scores[career] = 0
-                skill_scores[career] += count
+        # One registry scan counts every keyword with word boundaries, so
+        # "java" no longer scores inside "javascript" and "c++" is matchable.
+        skill_scores = get_skill_registry().scan(text).role_weights(CAREER_HEURISTIC_TABLE)
         
         # If we found skills, predict the career with most matches
         if skill_scores:
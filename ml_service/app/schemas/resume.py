@@ -2,6 +2,8 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+from ..config import settings
+
 
 class JobListing(BaseModel):
     """Job listing schema"""
@@ -34,6 +36,7 @@ class PredictionResponse(BaseModel):
     ats_score: float
     predicted_category: str
     job_description_used: str
+    skills_taxonomy_version: str = ""
     extracted_skills: List[str] = Field(default_factory=list)
     missing_skills: List[str] = Field(default_factory=list)
     jobs: List[JobListing] = Field(default_factory=list)
@@ -42,3 +45,32 @@ class PredictionResponse(BaseModel):
 class MatchRequest(BaseModel):
     job_description: str = Field(..., min_length=10)
     resume_ids: Optional[List[str]] = None
+    require_skills: Optional[List[str]] = None
+    any_skills: Optional[List[str]] = None
+    exclude_skills: Optional[List[str]] = None
+    similarity: str = Field("tfidf", pattern="^(tfidf|lsa)$")
+    # 0 scores every resume; otherwise return the ranking of those scored within the budget.
+    deadline_ms: int = Field(0, ge=0, le=60000)
+    # Results per page (0 returns them all); pass a response's next_cursor to read the next page.
+    limit: int = Field(0, ge=0, le=500)
+    cursor: Optional[str] = None
+    # Result keys to compute and return, e.g. ["resume_id", "ats_score"]; all when omitted.
+    fields: Optional[List[str]] = None
+
+
+class MatchBatchRequest(BaseModel):
+    job_descriptions: List[str] = Field(..., min_length=1, max_length=settings.ats_batch_max_jobs)
+    resume_ids: Optional[List[str]] = None
+    top_k: int = Field(0, ge=0, le=100)
+    require_skills: Optional[List[str]] = None
+    any_skills: Optional[List[str]] = None
+    exclude_skills: Optional[List[str]] = None
+    fields: Optional[List[str]] = None
+
+
+class StandingQueryRequest(BaseModel):
+    job_description: str = Field(..., min_length=10)
+    top_k: int = Field(20, ge=1, le=100)
+    require_skills: Optional[List[str]] = None
+    any_skills: Optional[List[str]] = None
+    exclude_skills: Optional[List[str]] = None
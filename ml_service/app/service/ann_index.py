@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import math
+import threading
+from typing import Iterable
+
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+from sklearn.preprocessing import normalize
+
+
+class IVFIndex:
+    """Inverted-file ANN index over L2-normalized TF-IDF rows.
+
+    A spherical k-means coarse quantizer splits the resumes into ``lists``
+    cells; a query visits the cells whose centroids are most similar to the
+    job vector. Resumes added after training join their nearest cell, and
+    ``needs_rebuild`` asks for retraining once the index has doubled or the
+    vectorizer changed.
+    """
+
+    def __init__(
+        self,
+        lists: int = 0,
+        probes: int = 8,
+        min_candidates: int = 2000,
+        iterations: int = 8,
+        sample_size: int = 50000,
+        seed: int = 42,
+    ):
+        self.lists = lists
+        self.probes = probes
+        self.min_candidates = min_candidates
+        self.iterations = iterations
+        self.sample_size = sample_size
+        self.seed = seed
+        self.version: str | None = None
+        self._lock = threading.Lock()
+        self._centroids: np.ndarray | None = None
+        self._positions: dict[str, int] = {}
+        self._cells: list[list[int]] = []
+        self._frozen: dict[int, np.ndarray] = {}
+        self._next_position = 0
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def needs_rebuild(self, version: str, size: int) -> bool:
+        return (
+            self.version != version
+            or self._centroids is None
+            or size > 2 * max(self._trained_size, 1)
+            # Mostly evicted entries: retrain on what is left.
+            or self._next_position > 2 * max(size, 1)
+        )
+
+    def _train(self, vectors: csr_matrix) -> np.ndarray:
+        count = vectors.shape[0]
+        lists = self.lists or int(math.sqrt(count))
+        lists = max(1, min(lists, count))
+        rng = np.random.default_rng(self.seed)
+        if count > self.sample_size:
+            vectors = vectors[np.sort(rng.choice(count, self.sample_size, replace=False))]
+            count = self.sample_size
+        centroids = vectors[rng.choice(count, lists, replace=False)].toarray()
+
+        for _ in range(self.iterations):
+            assignment = np.asarray((vectors @ centroids.T).argmax(axis=1)).ravel()
+            members = csr_matrix(
+                (np.ones(count), (assignment, np.arange(count))),
+                shape=(lists, count),
+            )
+            sums = np.asarray((members @ vectors).todense())
+            empty = np.asarray(members.sum(axis=1)).ravel() == 0
+            # Keep the previous centroid for cells that lost every member.
+            sums[empty] = centroids[empty]
+            centroids = normalize(sums)
+        return centroids.astype(np.float32)
+
+    def _assign(self, vectors: csr_matrix) -> np.ndarray:
+        return np.asarray((vectors @ self._centroids.T).argmax(axis=1)).ravel()
+
+    def rebuild(self, version: str, items: Iterable[tuple[str, csr_matrix]]) -> None:
+        items = list(items)
+        with self._lock:
+            self.version = version
+            self._positions = {}
+            self._cells = []
+            self._frozen = {}
+            self._next_position = 0
+            self._trained_size = len(items)
+            if not items:
+                self._centroids = None
+                return
+            vectors = vstack([vector for _, vector in items], format="csr")
+            self._centroids = self._train(vectors)
+            self._cells = [[] for _ in range(len(self._centroids))]
+            for (resume_id, _), cell in zip(items, self._assign(vectors).tolist()):
+                self._append(resume_id, cell)
+
+    def _append(self, resume_id: str, cell: int) -> None:
+        if resume_id in self._positions:
+            return
+        self._positions[resume_id] = self._next_position
+        self._cells[cell].append(self._next_position)
+        self._frozen.pop(cell, None)
+        self._next_position += 1
+
+    def add(self, resume_id: str, vector: csr_matrix, version: str) -> None:
+        with self._lock:
+            if self._centroids is not None and self.version == version:
+                self._append(resume_id, int(self._assign(vector)[0]))
+
+    def discard(self, resume_ids: Iterable[str]) -> None:
+        """Forget resumes; their cell entries are skipped until ``rebuild``."""
+        with self._lock:
+            for resume_id in resume_ids:
+                self._positions.pop(resume_id, None)
+
+    def _cell(self, cell: int) -> np.ndarray:
+        frozen = self._frozen.get(cell)
+        if frozen is None:
+            frozen = np.asarray(self._cells[cell], dtype=np.int64)
+            self._frozen[cell] = frozen
+        return frozen
+
+    def candidates(
+        self,
+        resume_ids: list[str],
+        job_vector: csr_matrix,
+    ) -> np.ndarray | None:
+        """Rows of ``resume_ids`` in the cells nearest to ``job_vector``, ascending.
+
+        At least ``probes`` cells are visited, then more until ``min_candidates``
+        rows are collected. Returns ``None`` if a resume is not indexed or
+        listed twice.
+        """
+        probes, min_candidates = self.probes, self.min_candidates
+        with self._lock:
+            if self._centroids is None:
+                return None
+            try:
+                universe = np.fromiter(
+                    (self._positions[resume_id] for resume_id in resume_ids),
+                    dtype=np.int64,
+                    count=len(resume_ids),
+                )
+            except KeyError:
+                return None
+            if np.unique(universe).size != universe.size:
+                return None
+            row_of = np.full(self._next_position, -1, dtype=np.int64)
+            row_of[universe] = np.arange(len(resume_ids))
+
+            order = np.argsort(-(job_vector @ self._centroids.T).ravel(), kind="stable")
+            found = np.zeros(len(resume_ids), dtype=bool)
+            collected = 0
+            for visited, cell in enumerate(order.tolist(), start=1):
+                rows = row_of[self._cell(cell)]
+                rows = rows[rows >= 0]
+                collected += int((~found[rows]).sum())
+                found[rows] = True
+                if visited >= probes and collected >= min_candidates:
+                    break
+        return np.flatnonzero(found)
+
+    def status(self) -> dict:
+        return {
+            "version": self.version,
+            "lists": 0 if self._centroids is None else len(self._centroids),
+            "resumes": len(self),
+            "trained_size": self._trained_size,
+            "probes": self.probes,
+            "min_candidates": self.min_candidates,
+        }
@@ -1,31 +1,315 @@
 from __future__ import annotations
 
+import asyncio
 import csv
+import hashlib
+import json
 import threading
-from dataclasses import dataclass
+import time
+import zlib
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Iterator
 from uuid import uuid4
 
 import joblib
+import numpy as np
 from fastapi import HTTPException
+from loguru import logger
+from scipy.sparse import csr_matrix, vstack
+from sklearn.decomposition import TruncatedSVD
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import normalize
 
 from ..config import settings
 from ..models.ats_scorer import ATSScorer
-from .skill_extractor import extract_skills, missing_skills
+from .ann_index import IVFIndex
+from .facet_index import FacetFilter, FacetIndex
+from .inverted_index import InvertedIndex
+from .model_registry import ModelRegistry
+from .near_duplicates import MinHashLSH
+from .ranking_cursors import RankingCursors, encode_cursor
+from .result_cache import ResultCache
+from .resume_profile_extractor import extract_experience_years
+from .resume_snapshot import ResumeSnapshot, read_snapshot, write_snapshot
+from .resume_store import MemoryResumeStore, SharedResumeStore
+from .sharded_scorer import ShardedScorer, top_rows
+from .standing_queries import StandingQueries, StandingQuery
+from .skill_bitmap import SkillBitmapIndex, SkillFilter, pack_skill_columns
+from .skill_extractor import missing_skills_many
+from .skill_registry import SkillRegistry, get_skill_registry
+
+
+@dataclass(slots=True)
+class ResumeFeatures:
+    """Job-independent features of one resume, computed once at ingest."""
+
+    model_version: str
+    skills_version: str
+    vector: csr_matrix
+    category: str
+    skill_columns: list[int]
+    structure_quality: float
+    experience_years: int = 0
+    # float32 LSA projection of ``vector``; filled in while the dense similarity mode is on.
+    dense: np.ndarray | None = None
+    dense_version: str = ""
 
 
-@dataclass
 class ResumeRecord:
-    resume_id: str
-    filename: str
-    text: str
+    """One stored resume. The text is kept zlib-compressed and inflated on access,
+    or, with ``load_text``, not held at all and read from the store when needed."""
+
+    __slots__ = ("resume_id", "filename", "compressed_text", "features", "load_text")
+
+    def __init__(
+        self,
+        resume_id: str,
+        filename: str,
+        text: str = "",
+        features: ResumeFeatures | None = None,
+        compressed_text: bytes | None = None,
+        load_text: Callable[[], str] | None = None,
+    ):
+        self.resume_id = resume_id
+        self.filename = filename
+        self.load_text = load_text
+        if load_text is not None:
+            self.compressed_text = None
+        else:
+            self.compressed_text = (
+                compressed_text if compressed_text is not None else zlib.compress(text.encode("utf-8"))
+            )
+        self.features = features
+
+    @property
+    def text(self) -> str:
+        if self.compressed_text is None:
+            return self.load_text()
+        return zlib.decompress(self.compressed_text).decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by this record, for the store budget."""
+        size = 256 + len(self.compressed_text or b"") + len(self.resume_id) + len(self.filename)
+        if self.features is not None:
+            vector = self.features.vector
+            size += 512 + vector.data.nbytes + vector.indices.nbytes + vector.indptr.nbytes
+            size += 32 * len(self.features.skill_columns)
+            if self.features.dense is not None:
+                size += self.features.dense.nbytes
+        return size
+
+
+# Keys a ranking result can carry; a `fields` projection selects among them.
+RESULT_FIELDS = frozenset(
+    (
+        "resume_id",
+        "filename",
+        "ats_score",
+        "predicted_category",
+        "extracted_skills",
+        "missing_skills",
+        "score_breakdown",
+        "rank",
+    )
+)
+
+
+def result_fields(values: Iterable[str] | None) -> frozenset[str] | None:
+    """Parse a ``fields`` projection (repeated or comma-separated); ``None`` keeps every field."""
+    names = {part.strip() for value in values or [] for part in str(value or "").split(",") if part.strip()}
+    if not names:
+        return None
+    unknown = sorted(names - RESULT_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown result fields: {', '.join(unknown)}. Allowed: {', '.join(sorted(RESULT_FIELDS))}.",
+        )
+    return frozenset(names)
+
+
+class _RankedList:
+    """Finished result payloads, read back page by page."""
+
+    def __init__(self, results: list[dict]):
+        self.results = results
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def page(self, start: int, stop: int, fields: frozenset[str] | None = None) -> list[dict]:
+        if fields is None:
+            return self.results[start:stop]
+        return [{name: value for name, value in result.items() if name in fields} for result in self.results[start:stop]]
+
+    def compact(self) -> _RankedList:
+        return self
+
+    @property
+    def nbytes(self) -> int:
+        return len(json.dumps(self.results))
+
+
+class _RankedRows:
+    """Scored rows in rank order; payloads are built only for the pages read."""
+
+    def __init__(
+        self,
+        resumes: list[ResumeRecord],
+        features: list[ResumeFeatures],
+        rows: np.ndarray,
+        details: dict[str, np.ndarray],
+        ats_scores: list[float],
+        selected: np.ndarray,
+        job_skills: csr_matrix,
+        registry: SkillRegistry,
+    ):
+        self.resumes = resumes
+        self.features = features
+        self.rows = rows
+        self.details = details
+        self.ats_scores = ats_scores
+        self.selected = selected
+        self.job_skills = job_skills
+        self.registry = registry
+
+    def __len__(self) -> int:
+        return len(self.selected)
+
+    def page(self, start: int, stop: int, fields: frozenset[str] | None = None) -> list[dict]:
+        """Payloads of ranks ``start:stop``; only ``fields`` (all when ``None``) are computed."""
+        fields = RESULT_FIELDS if fields is None else fields
+        skill_index = self.registry.skills
+        features = self.features
+        chunk = self.selected[start:stop].tolist()
+        missing = None
+        if "missing_skills" in fields:
+            missing = missing_skills_many(
+                self.registry.columns_incidence(features[int(self.rows[index])].skill_columns for index in chunk),
+                self.job_skills,
+                skill_index,
+            )
+        results = []
+        for offset, index in enumerate(chunk):
+            row = int(self.rows[index])
+            resume = self.resumes[row]
+            result = {}
+            if "resume_id" in fields:
+                result["resume_id"] = resume.resume_id
+            if "filename" in fields:
+                result["filename"] = resume.filename
+            if "ats_score" in fields:
+                result["ats_score"] = self.ats_scores[index]
+            if "predicted_category" in fields:
+                result["predicted_category"] = features[row].category
+            if "extracted_skills" in fields:
+                result["extracted_skills"] = [skill_index[column] for column in features[row].skill_columns]
+            if missing is not None:
+                result["missing_skills"] = missing[offset]
+            if "score_breakdown" in fields:
+                result["score_breakdown"] = {
+                    "tfidf_similarity": round(float(self.details["tfidf_similarity"][index]), 2),
+                    "skill_coverage": round(float(self.details["skill_coverage"][index]), 2),
+                    "structure_quality": round(float(self.details["structure_quality"][index]), 2),
+                }
+            if "rank" in fields:
+                result["rank"] = start + offset + 1
+            results.append(result)
+        return results
+
+    def compact(self) -> _RankedRows:
+        """The same ranking holding only the selected rows, for keeping past the request."""
+        kept = [int(self.rows[index]) for index in self.selected.tolist()]
+        return _RankedRows(
+            [self.resumes[row] for row in kept],
+            [self.features[row] for row in kept],
+            np.arange(len(kept)),
+            {name: np.asarray(values)[self.selected] for name, values in self.details.items()},
+            [self.ats_scores[index] for index in self.selected.tolist()],
+            np.arange(len(kept)),
+            self.job_skills,
+            self.registry,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        # Records and features are shared with the store; only the ranking's own arrays count.
+        arrays = [self.rows, self.selected, *self.details.values()]
+        return sum(np.asarray(values).nbytes for values in arrays) + 8 * (
+            len(self.ats_scores) + len(self.resumes) + len(self.features)
+        )
+
+
+@dataclass
+class Ranking:
+    """Outcome of ``match_and_rank_stream``: ranked ``results`` whose payloads are built on read."""
+
+    results: _RankedRows | _RankedList
+    # Resumes ranked or ruled out, and resumes left unscored when a deadline cut scoring short.
+    scored: int
+    unscored: int = 0
+    # Resumes per predicted category among those left after filtering, most frequent first.
+    facets: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return len(self.results)
+
+    @property
+    def partial(self) -> bool:
+        return self.unscored > 0
+
+    def chunks(
+        self,
+        chunk_size: int | None = None,
+        start: int = 0,
+        stop: int | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> Iterator[list[dict]]:
+        """Results ``start:stop`` in rank order, ``chunk_size`` at a time (one chunk when ``None``).
 
+        With ``fields`` only those result keys are built.
+        """
+        stop = self.total if stop is None else min(stop, self.total)
+        chunk_size = chunk_size or max(stop - start, 1)
+        for begin in range(start, stop, chunk_size):
+            yield self.results.page(begin, min(begin + chunk_size, stop), fields)
+
+    def compact(self) -> Ranking:
+        return Ranking(self.results.compact(), self.scored, self.unscored, self.facets)
+
+
+@dataclass(frozen=True)
+class _CachedRanking:
+    scored: int
+    # Compacted scored rows, never modified: every hit still builds only the fields it reads.
+    results: _RankedRows | _RankedList
+    facets: dict[str, int]
+
+    def ranking(self) -> Ranking:
+        return Ranking(self.results, scored=self.scored, facets=dict(self.facets))
+
+
+SIMILARITY_MODES = ("tfidf", "lsa")
 
 _MODEL_LOCK = threading.Lock()
-_RESUME_STORE: dict[str, ResumeRecord] = {}
+_MODEL_REGISTRY = ModelRegistry()
+_SKILL_BITMAPS = SkillBitmapIndex()
+_FACETS = FacetIndex()
+_INVERTED_INDEX = InvertedIndex()
+_ANN_INDEX = IVFIndex(settings.ats_ann_lists, settings.ats_ann_probes, settings.ats_ann_min_candidates)
+_DUPLICATES = MinHashLSH(settings.ats_duplicate_threshold)
+_RESULT_CACHE = ResultCache(settings.ats_result_cache_bytes)
+_RANKING_CURSORS = RankingCursors(settings.ats_cursor_ttl_seconds, settings.ats_cursor_bytes)
+_STANDING_QUERIES = StandingQueries(settings.ats_standing_queries_max)
+_QUERY_UPDATE_LOCK = threading.Lock()
+# Held while the store is synced into the indexes and while an index is written or rebuilt;
+# uploads, rankings and snapshots run on worker threads as well as on the event loop.
+_INDEX_LOCK = threading.RLock()
+_SHARDED_SCORER = ShardedScorer(settings.ats_shard_workers, settings.ats_shard_min_resumes)
 _ATS_SAMPLE_DATA = [
     (
         "Built machine learning pipelines in Python with TensorFlow and scikit-learn on AWS.",
@@ -100,67 +384,1017 @@ def ensure_models_ready() -> None:
 
 
 def get_models() -> tuple[TfidfVectorizer, LogisticRegression]:
-    ensure_models_ready()
-    vectorizer: TfidfVectorizer = joblib.load(settings.ats_vectorizer_path)
-    classifier: LogisticRegression = joblib.load(settings.ats_classifier_path)
+    if not (
+        _MODEL_REGISTRY.is_loaded(settings.ats_vectorizer_path)
+        and _MODEL_REGISTRY.is_loaded(settings.ats_classifier_path)
+    ):
+        ensure_models_ready()
+    vectorizer: TfidfVectorizer = _MODEL_REGISTRY.get(settings.ats_vectorizer_path)
+    classifier: LogisticRegression = _MODEL_REGISTRY.get(settings.ats_classifier_path)
     return vectorizer, classifier
 
 
-def add_resume(filename: str, text: str) -> str:
-    resume_id = str(uuid4())
-    _RESUME_STORE[resume_id] = ResumeRecord(resume_id=resume_id, filename=filename, text=text)
+def _train_lsa(vectorizer: TfidfVectorizer, vectorizer_version: str) -> None:
+    texts, _ = _load_training_data(settings.ats_training_dataset_path)
+    matrix = normalize(vectorizer.transform(texts))
+    # TruncatedSVD needs fewer components than both documents and terms.
+    components = max(1, min(settings.ats_lsa_components, matrix.shape[0] - 1, matrix.shape[1] - 1))
+    lsa = TruncatedSVD(n_components=components, random_state=42).fit(matrix)
+
+    settings.ats_lsa_path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(
+        {
+            "vectorizer_version": vectorizer_version,
+            "components": settings.ats_lsa_components,
+            "lsa": lsa,
+        },
+        settings.ats_lsa_path,
+    )
+    _MODEL_REGISTRY.invalidate(settings.ats_lsa_path)
+
+
+def get_lsa() -> tuple[TruncatedSVD, str] | None:
+    """The LSA projection and its version, or ``None`` while the dense mode is off.
+
+    The projection is refitted whenever the vectorizer or the configured
+    dimension changes.
+    """
+    if settings.ats_lsa_components <= 0:
+        return None
+    get_models()
+    vectorizer = _MODEL_REGISTRY.entry(settings.ats_vectorizer_path)
+    with _MODEL_LOCK:
+        entry = _MODEL_REGISTRY.entry(settings.ats_lsa_path) if settings.ats_lsa_path.exists() else None
+        if (
+            entry is None
+            or entry.value["vectorizer_version"] != vectorizer.version
+            or entry.value["components"] != settings.ats_lsa_components
+        ):
+            _train_lsa(vectorizer.value, vectorizer.version)
+            entry = _MODEL_REGISTRY.entry(settings.ats_lsa_path)
+    return entry.value["lsa"], entry.version
+
+
+def get_models_status() -> list[dict]:
+    return _MODEL_REGISTRY.status()
+
+
+def _encode_record(record: ResumeRecord) -> tuple:
+    features = record.features
+    if features is None:
+        return record.resume_id, record.filename, record.text, None, {}
+    meta = {
+        "model_version": features.model_version,
+        "skills_version": features.skills_version,
+        "category": features.category,
+        "skill_columns": list(features.skill_columns),
+        "structure_quality": features.structure_quality,
+        "experience_years": features.experience_years,
+    }
+    return record.resume_id, record.filename, record.text, features.vector, meta
+
+
+def _decode_record(
+    resume_id: str,
+    filename: str,
+    load_text: Callable[[], str],
+    vector: csr_matrix | None,
+    meta: dict,
+) -> ResumeRecord:
+    if vector is not None and "experience_years" not in meta:
+        # Stored before experience years were part of the ingest-time features.
+        meta = {**meta, "experience_years": extract_experience_years(load_text())}
+    features = ResumeFeatures(vector=vector, **meta) if vector is not None else None
+    return ResumeRecord(resume_id=resume_id, filename=filename, features=features, load_text=load_text)
+
+
+def _create_resume_store() -> MemoryResumeStore | SharedResumeStore:
+    if settings.ats_store_backend == "shared":
+        return SharedResumeStore(settings.ats_store_dir, _encode_record, _decode_record)
+    return MemoryResumeStore(
+        max_bytes=settings.ats_store_max_bytes,
+        ttl_seconds=settings.ats_store_ttl_seconds,
+        sizeof=lambda record: record.nbytes,
+    )
+
+
+_RESUME_STORE = _create_resume_store()
+_SNAPSHOT_GENERATION: int | None = None
+
+
+def _models_version() -> str:
+    get_models()
+    vectorizer = _MODEL_REGISTRY.entry(settings.ats_vectorizer_path)
+    classifier = _MODEL_REGISTRY.entry(settings.ats_classifier_path)
+    return f"{vectorizer.version}:{classifier.version}"
+
+
+def _compute_features(texts: list[str], registry: SkillRegistry) -> list[ResumeFeatures]:
+    vectorizer, classifier = get_models()
+    model_version = _models_version()
+    raw_vectors = vectorizer.transform(texts)
+    categories = classifier.predict(raw_vectors)
+    # Rows are stored L2-normalized so a match only needs one dot product each.
+    vectors = normalize(raw_vectors).tocsr()
+    lsa = get_lsa()
+    dense = ATSScorer.project(lsa[0], vectors) if lsa is not None else None
+
+    return [
+        ResumeFeatures(
+            model_version=model_version,
+            skills_version=registry.version,
+            vector=vectors[row],
+            category=str(categories[row]),
+            skill_columns=registry.scan(text).columns,
+            structure_quality=ATSScorer.structure_quality(text),
+            experience_years=extract_experience_years(text),
+            dense=dense[row] if dense is not None else None,
+            dense_version=lsa[1] if lsa is not None else "",
+        )
+        for row, text in enumerate(texts)
+    ]
+
+
+def _ensure_features(resumes: list[ResumeRecord], registry: SkillRegistry) -> list[ResumeFeatures]:
+    """Ingest-time features of ``resumes``, recomputed only where a model or taxonomy reload made them stale.
+
+    After a taxonomy-only reload just the skill columns are rescanned; vectors
+    and categories do not depend on the taxonomy and are kept.
+    """
+    model_version = _models_version()
+    stale: list[ResumeRecord] = []
+    rescan: list[ResumeRecord] = []
+    for resume in resumes:
+        if resume.features is None or resume.features.model_version != model_version:
+            stale.append(resume)
+        elif resume.features.skills_version != registry.version:
+            rescan.append(resume)
+    if stale or rescan:
+        computed = _compute_features([resume.text for resume in stale], registry) if stale else []
+        columns = [registry.scan(resume.text).columns for resume in rescan]
+        with _INDEX_LOCK:
+            for resume, features in zip(stale, computed):
+                resume.features = features
+                _index_resume(resume, registry)
+            for resume, skill_columns in zip(rescan, columns):
+                # A new object: rankings already holding the old features keep their columns.
+                resume.features = replace(resume.features, skills_version=registry.version, skill_columns=skill_columns)
+                _SKILL_BITMAPS.add(resume.resume_id, skill_columns, registry)
+            _RESUME_STORE.update(stale + rescan)
+    return [resume.features for resume in resumes]
+
+
+def _ensure_dense(features: list[ResumeFeatures], lsa: TruncatedSVD, lsa_version: str) -> np.ndarray:
+    """Stacked LSA rows of ``features``, projected from the stored TF-IDF rows where missing or stale."""
+    stale = [item for item in features if item.dense_version != lsa_version]
+    if stale:
+        dense = ATSScorer.project(lsa, vstack([item.vector for item in stale], format="csr"))
+        for item, row in zip(stale, dense):
+            item.dense = row
+            item.dense_version = lsa_version
+    return np.vstack([item.dense for item in features])
+
+
+def _index_resume(record: ResumeRecord, registry: SkillRegistry) -> None:
+    features = record.features
+    _INVERTED_INDEX.add(record.resume_id, features.vector, features.model_version)
+    _ANN_INDEX.add(record.resume_id, features.vector, features.model_version)
+    _FACETS.add(record.resume_id, features.category, features.experience_years, features.model_version)
+    if features.skills_version == registry.version:
+        _SKILL_BITMAPS.add(record.resume_id, features.skill_columns, registry)
+
+
+def _sync_store() -> None:
+    # Index resumes written since the last call, by this or (shared backend) any other worker,
+    # and drop the ones the store evicted.
+    with _INDEX_LOCK:
+        registry = get_skill_registry()
+        refreshed = _RESUME_STORE.refresh()
+        if refreshed:
+            # A refreshed id may replace a resume indexed earlier; its old entries go first.
+            refreshed_ids = [record.resume_id for record in refreshed]
+            added_ids = [resume_id for resume_id in refreshed_ids if resume_id not in _INVERTED_INDEX]
+            if len(added_ids) < len(refreshed_ids):
+                _STANDING_QUERIES.invalidate()
+            _STANDING_QUERIES.note_added(added_ids)
+            _INVERTED_INDEX.discard(refreshed_ids)
+            _ANN_INDEX.discard(refreshed_ids)
+            _DUPLICATES.discard(refreshed_ids)
+            _SHARDED_SCORER.discard(refreshed_ids)
+        for record in refreshed:
+            if settings.ats_duplicates_enabled:
+                _DUPLICATES.add(record.resume_id, record.text)
+            if record.features is not None:
+                _index_resume(record, registry)
+
+        evicted = _RESUME_STORE.take_evicted()
+        if evicted:
+            _STANDING_QUERIES.invalidate(evicted)
+            _INVERTED_INDEX.discard(evicted)
+            _ANN_INDEX.discard(evicted)
+            _SKILL_BITMAPS.discard(evicted)
+            _FACETS.discard(evicted)
+            _DUPLICATES.discard(evicted)
+            _SHARDED_SCORER.discard(evicted)
+        if not (refreshed or evicted):
+            return
+
+        live_count = len(_RESUME_STORE)
+        if _INVERTED_INDEX.garbage() > max(live_count, 1024):
+            _INVERTED_INDEX.rebuild(
+                _INVERTED_INDEX.version,
+                (
+                    (record.resume_id, record.features.vector)
+                    for record in _RESUME_STORE.records()
+                    if record.features is not None and record.features.model_version == _INVERTED_INDEX.version
+                ),
+            )
+        if _FACETS.garbage() > max(live_count, 1024):
+            _FACETS.rebuild(
+                _FACETS.version,
+                (
+                    (record.resume_id, record.features.category, record.features.experience_years)
+                    for record in _RESUME_STORE.records()
+                    if record.features is not None and record.features.model_version == _FACETS.version
+                ),
+            )
+        if _SKILL_BITMAPS.garbage() > max(live_count, 1024) and _SKILL_BITMAPS.is_current(registry):
+            _SKILL_BITMAPS.rebuild(
+                registry,
+                (
+                    (record.resume_id, record.features.skill_columns)
+                    for record in _RESUME_STORE.records()
+                    if record.features is not None and record.features.skills_version == registry.version
+                ),
+            )
+
+
+def find_duplicate(text: str) -> tuple[str, float] | None:
+    """A stored resume whose estimated shingle Jaccard with ``text`` reaches the threshold."""
+    if not settings.ats_duplicates_enabled:
+        return None
+    _sync_store()
+    return _DUPLICATES.find(text)
+
+
+def replace_resume(resume_id: str, filename: str, text: str) -> str:
+    """Overwrite a stored resume, keeping its id and its place in store order."""
+    features = _compute_features([text], get_skill_registry())[0]
+    with _INDEX_LOCK:
+        _RESUME_STORE.replace(
+            resume_id,
+            ResumeRecord(resume_id=resume_id, filename=filename, text=text, features=features),
+        )
+        _sync_store()
     return resume_id
 
 
+def ingest_resumes(
+    files: Iterable[tuple[str, str]],
+    on_duplicate: str = "link",
+) -> list[tuple[str, str, tuple[str, float] | None]]:
+    """Store uploaded ``(filename, text)`` pairs, resolving near-duplicates by ``on_duplicate``.
+
+    A near-duplicate of a stored resume or of an earlier file in ``files``:
+    "link" returns the existing id without storing the upload, "replace"
+    overwrites it under its id, "keep" stores it and only reports the match.
+    Files that are stored as new go through one ``add_resumes`` batch.
+    Returns ``(resume_id, action, (duplicate_of, similarity) or None)`` per file.
+    """
+    # New files in this call, looked up like stored ones under "#<position in new_files>".
+    batch = MinHashLSH(settings.ats_duplicate_threshold)
+    new_files: list[tuple[str, str]] = []
+    outcomes: list[tuple[str, str, tuple[str, float] | None]] = []
+    for filename, text in files:
+        duplicate = find_duplicate(text)
+        if settings.ats_duplicates_enabled:
+            pending = batch.find(text)
+            if pending is not None and (duplicate is None or pending[1] > duplicate[1]):
+                duplicate = pending
+        if duplicate is not None and on_duplicate == "link":
+            outcomes.append((duplicate[0], "linked", duplicate))
+        elif duplicate is not None and on_duplicate == "replace":
+            if duplicate[0].startswith("#"):
+                new_files[int(duplicate[0][1:])] = (filename, text)
+                batch.discard([duplicate[0]])
+                batch.add(duplicate[0], text)
+            else:
+                replace_resume(duplicate[0], filename, text)
+            outcomes.append((duplicate[0], "replaced", duplicate))
+        else:
+            key = f"#{len(new_files)}"
+            new_files.append((filename, text))
+            if settings.ats_duplicates_enabled:
+                batch.add(key, text)
+            outcomes.append((key, "added", duplicate))
+
+    added = add_resumes(new_files)
+
+    def resolve(resume_id: str) -> str:
+        return added[int(resume_id[1:])] if resume_id.startswith("#") else resume_id
+
+    return [
+        (resolve(resume_id), action, None if duplicate is None else (resolve(duplicate[0]), duplicate[1]))
+        for resume_id, action, duplicate in outcomes
+    ]
+
+
+def get_duplicates_status() -> dict:
+    return _DUPLICATES.status()
+
+
+def register_query(job_description: str, top_k: int, skill_filter: SkillFilter | None = None) -> dict:
+    """Register a standing query and rank the store for it once."""
+    if not job_description or not str(job_description).strip():
+        raise HTTPException(status_code=400, detail="job_description is required.")
+    skill_filter = skill_filter or SkillFilter()
+    registry = get_skill_registry()
+    # Reject unknown skills now rather than on every later update.
+    unknown = [
+        skill
+        for skill in skill_filter.require + skill_filter.any_of + skill_filter.exclude
+        if registry.skill_column(skill) is None
+    ]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown skill(s) in filter: {', '.join(unknown)}.")
+
+    query = StandingQuery(
+        query_id=str(uuid4()),
+        job_description=job_description,
+        top_k=top_k,
+        skill_filter=skill_filter,
+    )
+    _STANDING_QUERIES.add(query)
+    update_queries()
+    return _STANDING_QUERIES.snapshot(query.query_id)
+
+
+def get_query(query_id: str) -> dict:
+    """A standing query with its ranking, brought up to date with the store first."""
+    if _STANDING_QUERIES.get(query_id) is None:
+        raise HTTPException(status_code=404, detail=f"Standing query {query_id} not found")
+    update_queries()
+    snapshot = _STANDING_QUERIES.snapshot(query_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=f"Standing query {query_id} not found")
+    return snapshot
+
+
+def list_queries() -> list[dict]:
+    update_queries()
+    snapshots = (_STANDING_QUERIES.snapshot(query.query_id) for query in _STANDING_QUERIES.queries())
+    return [
+        {key: value for key, value in snapshot.items() if key != "results"}
+        for snapshot in snapshots
+        if snapshot is not None
+    ]
+
+
+def remove_query(query_id: str) -> None:
+    if not _STANDING_QUERIES.remove(query_id):
+        raise HTTPException(status_code=404, detail=f"Standing query {query_id} not found")
+
+
+def update_queries() -> None:
+    """Bring standing queries up to date with the store.
+
+    Resumes added since the last update are scored against the current
+    queries alone, one batched product per skill filter, and merged into
+    their top-k; the rest of the store is not re-ranked. Queries whose
+    ranked resumes changed or were evicted, or whose models or taxonomy
+    changed, are re-ranked in full.
+    """
+    _sync_store()
+    with _QUERY_UPDATE_LOCK:
+        queries = _STANDING_QUERIES.queries()
+        added = _STANDING_QUERIES.take_added()
+        if not queries:
+            return
+        registry = get_skill_registry()
+        fingerprint = (_models_version(), registry.version)
+        for query in queries:
+            if query.fingerprint != fingerprint:
+                query.stale = True
+
+        current = [query for query in queries if not query.stale]
+        if added and current:
+            groups: dict[tuple, list[StandingQuery]] = {}
+            for query in current:
+                skill_filter = query.skill_filter
+                key = (tuple(skill_filter.require), tuple(skill_filter.any_of), tuple(skill_filter.exclude))
+                groups.setdefault(key, []).append(query)
+            for group in groups.values():
+                try:
+                    rankings = match_and_rank_many(
+                        [query.job_description for query in group],
+                        resume_ids=added,
+                        skill_registry=registry,
+                        skill_filter=group[0].skill_filter,
+                        top_k=max(query.top_k for query in group),
+                    )
+                except HTTPException:
+                    # Every added resume was evicted again; nothing to merge.
+                    continue
+                for query, ranking in zip(group, rankings):
+                    _STANDING_QUERIES.merge(query, ranking[: query.top_k])
+
+        for query in queries:
+            if query.stale:
+                _rerank_query(query, registry, fingerprint)
+
+
+def _rerank_query(query: StandingQuery, registry: SkillRegistry, fingerprint: tuple) -> None:
+    if not len(_RESUME_STORE):
+        _STANDING_QUERIES.set_results(query, [], fingerprint)
+        return
+    try:
+        results = match_and_rank(
+            query.job_description,
+            skill_registry=registry,
+            skill_filter=query.skill_filter,
+            top_k=query.top_k,
+            approximate=False,
+        )
+    except HTTPException as error:
+        # e.g. a taxonomy reload dropped a filtered skill; report it instead of failing uploads.
+        logger.warning(f"Standing query {query.query_id} could not be ranked: {error.detail}")
+        _STANDING_QUERIES.set_results(query, [], fingerprint, error=str(error.detail))
+        return
+    _STANDING_QUERIES.set_results(query, results, fingerprint)
+
+
+def get_standing_queries_status() -> dict:
+    return _STANDING_QUERIES.status()
+
+
+def get_result_cache_status() -> dict:
+    return {"enabled": settings.ats_result_cache_enabled, **_RESULT_CACHE.status()}
+
+
+def get_ranking_cursors_status() -> dict:
+    return _RANKING_CURSORS.status()
+
+
+def add_resume(filename: str, text: str) -> str:
+    return add_resumes([(filename, text)])[0]
+
+
+def add_resumes(files: Iterable[tuple[str, str]]) -> list[str]:
+    """Store ``(filename, text)`` pairs, computing their features in one batch."""
+    files = list(files)
+    if not files:
+        return []
+    features = _compute_features([text for _, text in files], get_skill_registry())
+    resume_ids = []
+    # Writes take the index lock so a snapshot reads the store and its generation in one state.
+    with _INDEX_LOCK:
+        for (filename, text), item in zip(files, features):
+            resume_id = str(uuid4())
+            _RESUME_STORE.add(
+                resume_id,
+                ResumeRecord(resume_id=resume_id, filename=filename, text=text, features=item),
+            )
+            resume_ids.append(resume_id)
+        _sync_store()
+    return resume_ids
+
+
 def get_resumes(resume_ids: Iterable[str] | None = None) -> list[ResumeRecord]:
-    if resume_ids is None:
-        return list(_RESUME_STORE.values())
+    # Read under the sync so an upload landing in between cannot hand out unindexed records.
+    with _INDEX_LOCK:
+        _sync_store()
+        if resume_ids is None:
+            # Rankings read the whole store; keep what they use from expiring under the TTL.
+            _RESUME_STORE.touch()
+            return _RESUME_STORE.records()
 
-    records: list[ResumeRecord] = []
-    for resume_id in resume_ids:
-        if resume_id in _RESUME_STORE:
-            records.append(_RESUME_STORE[resume_id])
-    return records
+        records: list[ResumeRecord] = []
+        for resume_id in resume_ids:
+            record = _RESUME_STORE.get(resume_id)
+            if record is not None:
+                records.append(record)
+        return records
 
 
 def get_store_size() -> int:
+    _sync_store()
     return len(_RESUME_STORE)
 
 
+def get_store_status() -> dict:
+    return _RESUME_STORE.status()
+
+
+def save_snapshot() -> Path | None:
+    """Snapshot the in-memory store if it changed since the last snapshot.
+
+    The shared backend is already persistent and is never snapshotted.
+    """
+    global _SNAPSHOT_GENERATION
+
+    if _RESUME_STORE.backend != "memory":
+        return None
+    with _INDEX_LOCK:
+        # Read together, so a resume stored after these records is never counted as saved.
+        _sync_store()
+        records = _RESUME_STORE.records()
+        generation = _RESUME_STORE.generation
+    if not records or generation == _SNAPSHOT_GENERATION:
+        return None
+
+    registry = get_skill_registry()
+    # Refreshing stale features moves the generation on, so the next snapshot saves them again.
+    features = _ensure_features(records, registry)
+    signatures, present = (
+        _DUPLICATES.signatures([record.resume_id for record in records])
+        if settings.ats_duplicates_enabled
+        else (None, None)
+    )
+    snapshot = ResumeSnapshot(
+        resume_ids=[record.resume_id for record in records],
+        filenames=[record.filename for record in records],
+        compressed_texts=[record.compressed_text for record in records],
+        categories=[item.category for item in features],
+        structure_quality=np.array([item.structure_quality for item in features]),
+        experience_years=np.array([item.experience_years for item in features], dtype=np.int32),
+        vectors=vstack([item.vector for item in features], format="csr"),
+        skill_bitmaps=pack_skill_columns((item.skill_columns for item in features), len(registry.skills)),
+        model_version=_models_version(),
+        skills_version=registry.version,
+        generation=generation,
+        minhash_signatures=signatures,
+        minhash_present=present,
+        minhash_params=_DUPLICATES.params if signatures is not None else None,
+    )
+    path = write_snapshot(settings.ats_snapshot_dir, snapshot)
+    _SNAPSHOT_GENERATION = generation
+    return path
+
+
+def restore_snapshot() -> int:
+    """Load the latest snapshot into an empty in-memory store; returns the resumes restored.
+
+    Features are reused only if the snapshot was taken with the current models
+    and skills taxonomy; otherwise they are recomputed from the stored text.
+    """
+    global _SNAPSHOT_GENERATION
+
+    if _RESUME_STORE.backend != "memory" or len(_RESUME_STORE):
+        return 0
+    snapshot = read_snapshot(settings.ats_snapshot_dir)
+    if snapshot is None:
+        return 0
+
+    registry = get_skill_registry()
+    model_version = _models_version()
+    current = snapshot.model_version == model_version and snapshot.skills_version == registry.version
+    # Rows are cut from the memory-mapped arrays in one pass rather than indexed out of the matrix.
+    vectors = snapshot.vector_rows() if current else []
+    skill_columns = snapshot.skill_columns() if current else []
+    records = []
+    for row, resume_id in enumerate(snapshot.resume_ids):
+        record = ResumeRecord(
+            resume_id=resume_id,
+            filename=snapshot.filenames[row],
+            compressed_text=snapshot.compressed_texts[row],
+        )
+        if current:
+            if snapshot.experience_years is not None:
+                experience_years = int(snapshot.experience_years[row])
+            else:
+                experience_years = extract_experience_years(record.text)
+            record.features = ResumeFeatures(
+                model_version=snapshot.model_version,
+                skills_version=snapshot.skills_version,
+                vector=vectors[row],
+                category=snapshot.categories[row],
+                skill_columns=skill_columns[row],
+                structure_quality=float(snapshot.structure_quality[row]),
+                experience_years=experience_years,
+            )
+        records.append(record)
+
+    with _INDEX_LOCK:
+        for record in records:
+            _RESUME_STORE.add(record.resume_id, record)
+        # Load the indexes in bulk from the snapshot arrays instead of re-indexing record by record.
+        _RESUME_STORE.refresh()
+        resume_ids = snapshot.resume_ids
+        duplicates_loaded = (
+            settings.ats_duplicates_enabled
+            and snapshot.minhash_signatures is not None
+            and snapshot.minhash_params == _DUPLICATES.params
+        )
+        if duplicates_loaded:
+            _DUPLICATES.load(resume_ids, snapshot.minhash_signatures, snapshot.minhash_present)
+        elif settings.ats_duplicates_enabled:
+            for record in records:
+                _DUPLICATES.add(record.resume_id, record.text)
+        if current:
+            _INVERTED_INDEX.load(model_version, resume_ids, snapshot.vectors)
+            _FACETS.load(
+                model_version,
+                resume_ids,
+                snapshot.categories,
+                np.array([record.features.experience_years for record in records], dtype=np.int32),
+            )
+            _SKILL_BITMAPS.load(registry, resume_ids, snapshot.skill_bitmaps)
+        evicted = _RESUME_STORE.take_evicted()
+        if evicted:
+            # The store budget was smaller than the snapshot; drop what did not fit.
+            _INVERTED_INDEX.discard(evicted)
+            _SKILL_BITMAPS.discard(evicted)
+            _FACETS.discard(evicted)
+            _DUPLICATES.discard(evicted)
+        if not current:
+            _ensure_features(_RESUME_STORE.records(), registry)
+        _sync_store()
+        _SNAPSHOT_GENERATION = _RESUME_STORE.generation
+    return len(snapshot)
+
+
+async def snapshot_periodically(interval_seconds: float) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(save_snapshot)
+        except Exception as error:
+            logger.warning(f"Resume snapshot failed: {error}")
+
+
+def filter_by_skills(
+    resumes: list[ResumeRecord],
+    skill_filter: SkillFilter,
+    registry: SkillRegistry,
+) -> list[ResumeRecord]:
+    resume_features = _ensure_features(resumes, registry)
+    if not _SKILL_BITMAPS.is_current(registry):
+        with _INDEX_LOCK:
+            if not _SKILL_BITMAPS.is_current(registry):
+                # Taxonomy changed since ingest: re-derive every bitmap for this version.
+                records = _RESUME_STORE.records()
+                _SKILL_BITMAPS.rebuild(
+                    registry,
+                    (
+                        (record.resume_id, features.skill_columns)
+                        for record, features in zip(records, _ensure_features(records, registry))
+                    ),
+                )
+    # A resume evicted or replaced since it was read is checked against its own skill columns.
+    keep = _SKILL_BITMAPS.matches(
+        [resume.resume_id for resume in resumes],
+        skill_filter,
+        registry,
+        columns_of=lambda row: resume_features[row].skill_columns,
+    )
+    return [resume for resume, kept in zip(resumes, keep) if kept]
+
+
+def _ensure_facets(resumes: list[ResumeRecord], registry: SkillRegistry) -> None:
+    _ensure_features(resumes, registry)
+    model_version = _models_version()
+    if not _FACETS.is_current(model_version):
+        with _INDEX_LOCK:
+            if not _FACETS.is_current(model_version):
+                # Models changed since ingest: re-derive the facet columns for this version.
+                records = _RESUME_STORE.records()
+                _FACETS.rebuild(
+                    model_version,
+                    (
+                        (record.resume_id, features.category, features.experience_years)
+                        for record, features in zip(records, _ensure_features(records, registry))
+                    ),
+                )
+
+
+def filter_by_facets(
+    resumes: list[ResumeRecord],
+    facet_filter: FacetFilter,
+    registry: SkillRegistry,
+) -> list[ResumeRecord]:
+    _ensure_facets(resumes, registry)
+    keep = _FACETS.matches([resume.resume_id for resume in resumes], facet_filter, _facets_of(resumes))
+    return [resume for resume, kept in zip(resumes, keep) if kept]
+
+
+def category_facets(resumes: list[ResumeRecord], registry: SkillRegistry) -> dict[str, int]:
+    """Resumes per predicted category, counted from the facet columns."""
+    _ensure_facets(resumes, registry)
+    return _FACETS.category_counts([resume.resume_id for resume in resumes], _facets_of(resumes))
+
+
+def _facets_of(resumes: list[ResumeRecord]) -> Callable[[int], tuple[str, int]]:
+    # Resumes replaced or added while a ranking runs may not be in the index yet; use their own features.
+    def facets(row: int) -> tuple[str, int]:
+        features = resumes[row].features
+        return features.category, features.experience_years
+
+    return facets
+
+
+def retrieve_candidates(
+    resumes: list[ResumeRecord],
+    job_vector: csr_matrix,
+    base_scores: np.ndarray,
+    top_k: int,
+    registry: SkillRegistry,
+) -> np.ndarray | None:
+    """Rows of ``resumes`` that the inverted index cannot rule out of the top ``top_k``."""
+    model_version = _models_version()
+    if not _INVERTED_INDEX.is_current(model_version):
+        with _INDEX_LOCK:
+            if not _INVERTED_INDEX.is_current(model_version):
+                # Models changed since ingest: re-derive every posting for this version.
+                records = _RESUME_STORE.records()
+                _INVERTED_INDEX.rebuild(
+                    model_version,
+                    (
+                        (record.resume_id, features.vector)
+                        for record, features in zip(records, _ensure_features(records, registry))
+                    ),
+                )
+    return _INVERTED_INDEX.top_candidates(
+        [resume.resume_id for resume in resumes],
+        job_vector,
+        base_scores,
+        top_k,
+    )
+
+
+def approximate_candidates(
+    resumes: list[ResumeRecord],
+    job_vector: csr_matrix,
+    base_scores: np.ndarray,
+    top_k: int,
+    registry: SkillRegistry,
+) -> np.ndarray | None:
+    """Rows of ``resumes`` worth exact scoring according to the IVF index.
+
+    Unlike ``retrieve_candidates`` this may miss members of the true top
+    ``top_k``; recall is tuned with ``ats_ann_probes`` and ``ats_ann_min_candidates``.
+    """
+    model_version = _models_version()
+    with _INDEX_LOCK:
+        records = _RESUME_STORE.records()
+        if _ANN_INDEX.needs_rebuild(model_version, len(records)):
+            _ANN_INDEX.rebuild(
+                model_version,
+                (
+                    (record.resume_id, features.vector)
+                    for record, features in zip(records, _ensure_features(records, registry))
+                ),
+            )
+    rows = _ANN_INDEX.candidates([resume.resume_id for resume in resumes], job_vector)
+    if rows is None:
+        return None
+    # The cells only see the cosine; keep the resumes that lead on skill coverage and structure too.
+    return np.union1d(rows, top_rows(base_scores, top_k))
+
+
+def get_ann_status() -> dict:
+    return _ANN_INDEX.status()
+
+
 def predict_category(text: str) -> str:
     vectorizer, classifier = get_models()
     features = vectorizer.transform([text])
     return str(classifier.predict(features)[0])
 
 
-def analyze_resume_against_job(resume: ResumeRecord, job_description: str) -> dict:
-    vectorizer, _ = get_models()
-    scorer = ATSScorer(vectorizer=vectorizer)
+def match_and_rank(
+    job_description: str,
+    resume_ids: list[str] | None = None,
+    skill_registry: SkillRegistry | None = None,
+    skill_filter: SkillFilter | None = None,
+    top_k: int | None = None,
+    similarity: str = "tfidf",
+    approximate: bool | None = None,
+) -> list[dict]:
+    """Rank resumes against a job description; see ``match_and_rank_stream``."""
+    ranking = match_and_rank_stream(
+        job_description,
+        resume_ids=resume_ids,
+        skill_registry=skill_registry,
+        skill_filter=skill_filter,
+        top_k=top_k,
+        similarity=similarity,
+        approximate=approximate,
+    )
+    return ranking.results.page(0, ranking.total)
 
-    score_details = scorer.score(resume.text, job_description=job_description, return_details=True)
-    extracted = extract_skills(resume.text)
-    missing = missing_skills(resume.text, job_description)
-    category = predict_category(resume.text)
-
-    return {
-        "resume_id": resume.resume_id,
-        "filename": resume.filename,
-        "ats_score": score_details["ats_score"],
-        "predicted_category": category,
-        "extracted_skills": extracted,
-        "missing_skills": missing,
-        "score_breakdown": {
-            "tfidf_similarity": score_details["tfidf_similarity"],
-            "skill_coverage": score_details["skill_coverage"],
-            "structure_quality": score_details["structure_quality"],
-        },
-    }
 
+def match_and_rank_stream(
+    job_description: str,
+    resume_ids: list[str] | None = None,
+    skill_registry: SkillRegistry | None = None,
+    skill_filter: SkillFilter | None = None,
+    top_k: int | None = None,
+    similarity: str = "tfidf",
+    approximate: bool | None = None,
+    deadline: float | None = None,
+    facet_filter: FacetFilter | None = None,
+) -> Ranking:
+    """Rank resumes against a job description.
+
+    Pass ``skill_registry`` to pin the skills taxonomy version for the request;
+    otherwise the registry active at call time is used throughout. Resumes
+    failing ``skill_filter`` are dropped via the skill bitmaps before scoring,
+    and those failing ``facet_filter`` via the facet columns;
+    ``Ranking.facets`` counts the remaining resumes per predicted category.
+    With ``top_k`` every resume is scored but only the best ``top_k`` results
+    are built, in the same order as the head of the full ranking.
+    ``similarity="lsa"`` scores the similarity term in the dense LSA space.
+    With ``approximate`` (by default: ANN enabled and enough resumes) the
+    ``top_k`` candidates come from the IVF index and may miss true top rows.
 
-def match_and_rank(job_description: str, resume_ids: list[str] | None = None) -> list[dict]:
+    Scoring and ranking happen before this returns; the result payloads are
+    built as ``Ranking.chunks`` is consumed.
+
+    With a ``deadline`` (a ``time.monotonic()`` value) in-process scoring runs
+    in chunks, most promising resumes first by their skill and structure
+    terms, and stops once the deadline passes; the ranking then covers the
+    resumes scored so far and is marked partial. Sharded scoring is not cut.
+
+    Complete rankings of up to ``ats_result_cache_max_results`` results are
+    cached until the store, models or taxonomy change; concurrent identical
+    requests wait for one computation.
+    """
     if not job_description or not str(job_description).strip():
         raise HTTPException(status_code=400, detail="job_description is required.")
+    if similarity not in SIMILARITY_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"similarity must be one of: {', '.join(SIMILARITY_MODES)}.",
+        )
+    lsa = get_lsa() if similarity == "lsa" else None
+    if similarity == "lsa" and lsa is None:
+        raise HTTPException(
+            status_code=400,
+            detail="LSA similarity is disabled. Set ATS_LSA_COMPONENTS to enable it.",
+        )
+
+    registry = skill_registry or get_skill_registry()
+    options = (resume_ids, registry, skill_filter, top_k, lsa, approximate, facet_filter)
+    if not settings.ats_result_cache_enabled:
+        return _rank(job_description, *options, deadline)
+
+    key = _result_key(job_description, *options)
+    timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+    cached, leading = _RESULT_CACHE.begin(key, timeout)
+    if cached is not None:
+        # A cached ranking still uses its resumes.
+        _RESUME_STORE.touch(resume_ids)
+        return cached.ranking()
+    if not leading:
+        return _rank(job_description, *options, deadline)
+
+    shared = None
+    try:
+        ranking = _rank(job_description, *options, deadline)
+        if not ranking.partial and ranking.total <= settings.ats_result_cache_max_results:
+            ranking = ranking.compact()
+            shared = _CachedRanking(ranking.scored, ranking.results, ranking.facets)
+    finally:
+        _RESULT_CACHE.finish(key, shared, 0 if shared is None else shared.results.nbytes)
+    return ranking
+
+
+@dataclass
+class RankingPage:
+    """Results ``start:stop`` of a ranking, and the cursor of the page after it."""
+
+    ranking: Ranking
+    start: int
+    stop: int
+    next_cursor: str | None = None
 
+    def chunks(self, chunk_size: int | None = None, fields: frozenset[str] | None = None) -> Iterator[list[dict]]:
+        return self.ranking.chunks(chunk_size, self.start, self.stop, fields)
+
+
+def match_and_rank_page(
+    job_description: str,
+    resume_ids: list[str] | None = None,
+    skill_registry: SkillRegistry | None = None,
+    skill_filter: SkillFilter | None = None,
+    top_k: int | None = None,
+    similarity: str = "tfidf",
+    approximate: bool | None = None,
+    deadline: float | None = None,
+    limit: int = 0,
+    cursor: str | None = None,
+    facet_filter: FacetFilter | None = None,
+) -> RankingPage:
+    """Up to ``limit`` results (all when 0) of ``match_and_rank_stream``, from ``cursor`` on.
+
+    When results remain, the ranking is kept for ``ats_cursor_ttl_seconds``
+    and ``next_cursor`` reads the following page from it without scoring
+    again; later pages therefore reflect the store as of the first page. A
+    cursor only continues the request that produced it.
+    """
+    fingerprint = _request_fingerprint(
+        job_description, resume_ids, skill_filter, top_k, similarity, approximate, facet_filter
+    )
+    if cursor:
+        token, ranking, start = _RANKING_CURSORS.resolve(cursor, fingerprint)
+        start = min(start, ranking.total)
+    else:
+        ranking = match_and_rank_stream(
+            job_description,
+            resume_ids=resume_ids,
+            skill_registry=skill_registry,
+            skill_filter=skill_filter,
+            top_k=top_k,
+            similarity=similarity,
+            approximate=approximate,
+            deadline=deadline,
+            facet_filter=facet_filter,
+        )
+        token, start = None, 0
+
+    stop = ranking.total if limit <= 0 else min(start + limit, ranking.total)
+    page = RankingPage(ranking, start, stop)
+    if stop < ranking.total:
+        if token is None:
+            kept = ranking.compact()
+            token = _RANKING_CURSORS.open(kept, fingerprint, kept.results.nbytes)
+        if token is not None:
+            page.next_cursor = encode_cursor(token, stop)
+    return page
+
+
+def _request_fingerprint(
+    job_description: str,
+    resume_ids: list[str] | None,
+    skill_filter: SkillFilter | None,
+    top_k: int | None,
+    similarity: str,
+    approximate: bool | None,
+    facet_filter: FacetFilter | None,
+) -> str:
+    # Unlike the result cache key this leaves out the store generation: a cursor pages its snapshot.
+    skill_filter = skill_filter or SkillFilter()
+    parts = [
+        str(job_description).strip().lower(),
+        resume_ids,
+        [skill_filter.require, skill_filter.any_of, skill_filter.exclude],
+        top_k,
+        similarity,
+        approximate,
+        _facet_key(facet_filter),
+    ]
+    return hashlib.blake2b(json.dumps(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _result_key(
+    job_description: str,
+    resume_ids: list[str] | None,
+    registry: SkillRegistry,
+    skill_filter: SkillFilter | None,
+    top_k: int | None,
+    lsa: tuple[TruncatedSVD, str] | None,
+    approximate: bool | None,
+    facet_filter: FacetFilter | None,
+) -> str:
+    # Scoring lowercases the job description and ignores surrounding whitespace, so neither
+    # splits the cache; the store generation moves on every add, replace and eviction.
+    _sync_store()
+    skill_filter = skill_filter or SkillFilter()
+    parts = [
+        job_description.strip().lower(),
+        resume_ids,
+        [skill_filter.require, skill_filter.any_of, skill_filter.exclude],
+        top_k,
+        None if lsa is None else lsa[1],
+        approximate,
+        _facet_key(facet_filter),
+        _RESUME_STORE.generation,
+        _models_version(),
+        registry.version,
+    ]
+    return hashlib.blake2b(json.dumps(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _facet_key(facet_filter: FacetFilter | None) -> list:
+    facet_filter = facet_filter or FacetFilter()
+    return [
+        sorted(name.lower() for name in facet_filter.categories),
+        facet_filter.min_experience_years,
+        facet_filter.max_experience_years,
+    ]
+
+
+def _rank(
+    job_description: str,
+    resume_ids: list[str] | None,
+    registry: SkillRegistry,
+    skill_filter: SkillFilter | None,
+    top_k: int | None,
+    lsa: tuple[TruncatedSVD, str] | None,
+    approximate: bool | None,
+    facet_filter: FacetFilter | None,
+    deadline: float | None,
+) -> Ranking:
     resumes = get_resumes(resume_ids)
     if not resumes:
         raise HTTPException(
@@ -168,10 +1402,265 @@ def match_and_rank(job_description: str, resume_ids: list[str] | None = None) ->
             detail="No resumes available. Upload resumes first via /upload-resumes.",
         )
 
-    results = [analyze_resume_against_job(resume, job_description) for resume in resumes]
-    results.sort(key=lambda item: item["ats_score"], reverse=True)
+    if skill_filter is not None and not skill_filter.is_empty():
+        resumes = filter_by_skills(resumes, skill_filter, registry)
+        if not resumes:
+            return Ranking(_RankedList([]), scored=0)
+    if facet_filter is not None and not facet_filter.is_empty():
+        resumes = filter_by_facets(resumes, facet_filter, registry)
+        if not resumes:
+            return Ranking(_RankedList([]), scored=0)
+    facets = category_facets(resumes, registry)
+
+    # Only job-dependent terms are computed here; everything else was stored at ingest.
+    features = _ensure_features(resumes, registry)
+    job_skills = registry.incidence([registry.scan(job_description)])
+    vectorizer, _ = get_models()
+
+    if approximate is None:
+        approximate = settings.ats_ann_enabled and len(resumes) >= settings.ats_ann_min_resumes
+    approximate = approximate and lsa is None and top_k is not None and top_k < len(resumes)
+
+    sharded = None if lsa is not None or approximate else _score_sharded(
+        resumes, vectorizer, job_description, job_skills, registry, top_k
+    )
+    if sharded is not None:
+        rows, details = sharded
+        ranked = _ranked_rows(resumes, features, rows, details, job_skills, registry, top_k)
+        return Ranking(ranked, scored=len(resumes), facets=facets)
+
+    resume_skills = registry.columns_incidence(item.skill_columns for item in features)
+    coverage = ATSScorer.skill_coverage_many(resume_skills, job_skills)
+    structure_quality = np.array([item.structure_quality for item in features])
+    base_scores = 0.35 * coverage + 0.15 * structure_quality
+
+    rows = np.arange(len(resumes))
+    if lsa is not None:
+        # Dense mode scans every projected row; the inverted index only bounds sparse cosines.
+        scorer = ATSScorer(vectorizer=vectorizer, lsa=lsa[0])
+        resume_dense = _ensure_dense(features, *lsa)
+
+        def score(part: np.ndarray) -> dict[str, np.ndarray]:
+            return scorer.score_many(
+                None,
+                job_description,
+                skill_coverage=coverage[part],
+                structure_quality=structure_quality[part],
+                resume_dense=resume_dense[part],
+            )
+    else:
+        if top_k is not None and top_k < len(resumes):
+            job_vector = normalize(vectorizer.transform([job_description]))
+            candidates = None
+            if approximate:
+                candidates = approximate_candidates(resumes, job_vector, base_scores, top_k, registry)
+            if candidates is None:
+                # Dynamic pruning on the inverted index; only surviving rows get an exact cosine.
+                candidates = retrieve_candidates(resumes, job_vector, base_scores, top_k, registry)
+            if candidates is not None:
+                rows = candidates
+        scorer = ATSScorer(vectorizer=vectorizer)
+
+        def score(part: np.ndarray) -> dict[str, np.ndarray]:
+            return scorer.score_many(
+                None,
+                job_description,
+                skill_coverage=coverage[part],
+                resume_vectors=vstack([features[row].vector for row in part], format="csr"),
+                structure_quality=structure_quality[part],
+            )
+
+    scored_rows, details = _score_until(rows, score, base_scores, deadline)
+    ranked = _ranked_rows(resumes, features, scored_rows, details, job_skills, registry, top_k)
+    unscored = len(rows) - len(scored_rows)
+    return Ranking(ranked, scored=len(resumes) - unscored, unscored=unscored, facets=facets)
 
-    for index, result in enumerate(results, start=1):
-        result["rank"] = index
-    return results
 
+def _score_until(
+    rows: np.ndarray,
+    score: Callable[[np.ndarray], dict[str, np.ndarray]],
+    priority: np.ndarray,
+    deadline: float | None,
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Score ``rows`` in one go, or chunk by chunk until ``deadline`` passes.
+
+    Chunks go in descending ``priority``; at least one chunk is always scored.
+    Returns the scored rows, ascending, with their details.
+    """
+    if deadline is None or not len(rows):
+        return rows, score(rows)
+
+    order = rows[np.argsort(-priority[rows], kind="stable")]
+    chunk_size = settings.ats_deadline_chunk_size
+    parts: list[tuple[np.ndarray, dict[str, np.ndarray]]] = []
+    for start in range(0, len(order), chunk_size):
+        part = order[start:start + chunk_size]
+        parts.append((part, score(part)))
+        if time.monotonic() >= deadline:
+            break
+
+    scored = np.concatenate([part for part, _ in parts])
+    ascending = np.argsort(scored, kind="stable")
+    details = {
+        key: np.concatenate([values[key] for _, values in parts])[ascending]
+        for key in parts[0][1]
+    }
+    return scored[ascending], details
+
+
+def _publish_shards(registry: SkillRegistry) -> None:
+    # Resumes added or replaced since the last publish go out as an appended segment (_sync_store
+    # discards replaced and evicted ids); a model or taxonomy change republishes the whole store.
+    key = (_models_version(), registry.version)
+    generation = _RESUME_STORE.generation
+    if _SHARDED_SCORER.is_current(key, generation):
+        return
+    live = _RESUME_STORE.records()
+    append = _SHARDED_SCORER.can_append(key)
+    if append:
+        live = [record for record in live if record.resume_id not in _SHARDED_SCORER]
+    if live:
+        features = _ensure_features(live, registry)
+        _SHARDED_SCORER.publish(
+            key,
+            generation,
+            [record.resume_id for record in live],
+            vstack([item.vector for item in features], format="csr"),
+            registry.columns_incidence(item.skill_columns for item in features),
+            np.array([item.structure_quality for item in features]),
+            append=append,
+        )
+
+
+def _score_sharded(
+    resumes: list[ResumeRecord],
+    vectorizer: TfidfVectorizer,
+    job_description: str,
+    job_skills: csr_matrix,
+    registry: SkillRegistry,
+    top_k: int | None,
+) -> tuple[np.ndarray, dict[str, np.ndarray]] | None:
+    """Score ``resumes`` on the process pool; ``None`` if sharding is off or not applicable."""
+    if not _SHARDED_SCORER.enabled_for(len(resumes)):
+        return None
+    _publish_shards(registry)
+    return _SHARDED_SCORER.score(
+        [resume.resume_id for resume in resumes],
+        normalize(vectorizer.transform([job_description])),
+        job_skills,
+        top_k,
+    )
+
+
+def start_sharded_scoring() -> None:
+    _SHARDED_SCORER.start()
+
+
+def stop_sharded_scoring() -> None:
+    _SHARDED_SCORER.close()
+
+
+def get_sharded_scoring_status() -> dict:
+    return _SHARDED_SCORER.status()
+
+
+def _ranked_rows(
+    resumes: list[ResumeRecord],
+    features: list[ResumeFeatures],
+    rows: np.ndarray,
+    details: dict[str, np.ndarray],
+    job_skills: csr_matrix,
+    registry: SkillRegistry,
+    top_k: int | None,
+) -> _RankedRows:
+    """Rank scored ``rows`` of ``resumes`` now; result payloads are built as pages are read."""
+    # Rank on the reported (rounded) score, then hydrate payloads for the selected rows only.
+    ats_scores = [round(float(score), 2) for score in details["ats_score"]]
+    selected = top_rows(np.array(ats_scores), top_k)
+    return _RankedRows(resumes, features, rows, details, ats_scores, selected, job_skills, registry)
+
+
+def _ranked_results(
+    resumes: list[ResumeRecord],
+    features: list[ResumeFeatures],
+    rows: np.ndarray,
+    details: dict[str, np.ndarray],
+    job_skills: csr_matrix,
+    registry: SkillRegistry,
+    top_k: int | None,
+    fields: frozenset[str] | None = None,
+) -> list[dict]:
+    """Rank scored ``rows`` of ``resumes`` and build result payloads for the selected ones."""
+    ranked = _ranked_rows(resumes, features, rows, details, job_skills, registry, top_k)
+    return ranked.page(0, len(ranked), fields)
+
+
+def match_and_rank_many(
+    job_descriptions: list[str],
+    resume_ids: list[str] | None = None,
+    skill_registry: SkillRegistry | None = None,
+    skill_filter: SkillFilter | None = None,
+    top_k: int | None = None,
+    fields: frozenset[str] | None = None,
+) -> list[list[dict]]:
+    """Rank the same resumes against several job descriptions at once.
+
+    Similarities come from a single (resumes x terms) . (terms x jobs) sparse
+    product and skill coverage from a single incidence product, so the
+    resume matrix is assembled once however many jobs are scored. Entry ``j``
+    equals ``match_and_rank(job_descriptions[j], ...)``.
+    """
+    if not job_descriptions:
+        raise HTTPException(status_code=400, detail="job_descriptions must not be empty.")
+    for position, job_description in enumerate(job_descriptions):
+        if not job_description or not str(job_description).strip():
+            raise HTTPException(
+                status_code=400,
+                detail=f"job_descriptions[{position}] is required.",
+            )
+
+    resumes = get_resumes(resume_ids)
+    if not resumes:
+        raise HTTPException(
+            status_code=400,
+            detail="No resumes available. Upload resumes first via /upload-resumes.",
+        )
+
+    registry = skill_registry or get_skill_registry()
+    if skill_filter is not None and not skill_filter.is_empty():
+        resumes = filter_by_skills(resumes, skill_filter, registry)
+        if not resumes:
+            return [[] for _ in job_descriptions]
+
+    features = _ensure_features(resumes, registry)
+    resume_skills = registry.columns_incidence(item.skill_columns for item in features)
+    job_skills = registry.incidence(registry.scan(text) for text in job_descriptions)
+    structure_quality = np.array([item.structure_quality for item in features])
+
+    vectorizer, _ = get_models()
+    scorer = ATSScorer(vectorizer=vectorizer)
+    similarity = scorer.similarity_matrix(
+        vstack([item.vector for item in features], format="csr"),
+        job_descriptions,
+    )
+    coverage = ATSScorer.skill_coverage_matrix(resume_skills, job_skills)
+    details = ATSScorer.combine(
+        similarity,
+        coverage,
+        np.broadcast_to(structure_quality[:, None], similarity.shape),
+    )
+
+    rows = np.arange(len(resumes))
+    return [
+        _ranked_results(
+            resumes,
+            features,
+            rows,
+            {key: np.ascontiguousarray(values[:, job]) for key, values in details.items()},
+            job_skills[job],
+            registry,
+            top_k,
+            fields,
+        )
+        for job in range(len(job_descriptions))
+    ]
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+import numpy as np
+from fastapi import HTTPException
+
+
+@dataclass
+class FacetFilter:
+    """Predicted-category and experience-range constraints on the resumes to rank."""
+
+    categories: list[str] = field(default_factory=list)
+    min_experience_years: int | None = None
+    max_experience_years: int | None = None
+
+    @classmethod
+    def from_values(
+        cls,
+        categories: Iterable[str] | None = None,
+        min_experience_years: int | None = None,
+        max_experience_years: int | None = None,
+    ) -> FacetFilter:
+        # Accept repeated parameters as well as comma-separated values.
+        names = [part.strip() for value in categories or [] for part in str(value or "").split(",") if part.strip()]
+        if (
+            min_experience_years is not None
+            and max_experience_years is not None
+            and min_experience_years > max_experience_years
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail="min_experience_years must not exceed max_experience_years.",
+            )
+        return cls(names, min_experience_years, max_experience_years)
+
+    def is_empty(self) -> bool:
+        return not self.categories and self.min_experience_years is None and self.max_experience_years is None
+
+    def accepts(self, category: str, experience_years: int) -> bool:
+        """Whether one resume passes, as ``FacetIndex.matches`` decides for indexed ones."""
+        if self.categories and category.lower() not in {name.lower() for name in self.categories}:
+            return False
+        if self.min_experience_years is not None and experience_years < self.min_experience_years:
+            return False
+        return self.max_experience_years is None or experience_years <= self.max_experience_years
+
+
+class FacetIndex:
+    """Per-resume predicted category and experience years, stored column-wise.
+
+    Categories are dictionary-encoded as ``int32`` codes, so filters are
+    vectorized comparisons and per-category counts a single ``np.bincount``.
+    Rows are appended at ingest for the model version the index was built
+    for; a model reload makes the index stale until ``rebuild`` is called.
+    """
+
+    def __init__(self):
+        self.version: str | None = None
+        self._lock = threading.Lock()
+        self._positions: dict[str, int] = {}
+        self._categories: list[str] = []
+        self._codes: dict[str, int] = {}
+        self._category = np.zeros(64, dtype=np.int32)
+        self._experience = np.zeros(64, dtype=np.int32)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _reset(self, version: str) -> None:
+        self.version = version
+        self._positions = {}
+        self._categories = []
+        self._codes = {}
+        self._category = np.zeros(64, dtype=np.int32)
+        self._experience = np.zeros(64, dtype=np.int32)
+        self._size = 0
+
+    def _append(self, resume_id: str, category: str, experience_years: int) -> None:
+        if self._size == len(self._category):
+            self._category = np.concatenate([self._category, np.zeros_like(self._category)])
+            self._experience = np.concatenate([self._experience, np.zeros_like(self._experience)])
+        position = self._positions.get(resume_id)
+        if position is None:
+            position = self._size
+            self._positions[resume_id] = position
+            self._size += 1
+        code = self._codes.get(category)
+        if code is None:
+            code = self._codes[category] = len(self._categories)
+            self._categories.append(category)
+        self._category[position] = code
+        self._experience[position] = experience_years
+
+    def is_current(self, version: str) -> bool:
+        return self.version == version
+
+    def add(self, resume_id: str, category: str, experience_years: int, version: str) -> None:
+        with self._lock:
+            if self.version is None:
+                self._reset(version)
+            if self.version == version:
+                self._append(resume_id, category, experience_years)
+
+    def discard(self, resume_ids: Iterable[str]) -> None:
+        """Forget resumes; their rows stay allocated until ``rebuild``."""
+        with self._lock:
+            for resume_id in resume_ids:
+                self._positions.pop(resume_id, None)
+
+    def garbage(self) -> int:
+        return self._size - len(self._positions)
+
+    def rebuild(self, version: str, items: Iterable[tuple[str, str, int]]) -> None:
+        with self._lock:
+            self._reset(version)
+            for resume_id, category, experience_years in items:
+                self._append(resume_id, category, experience_years)
+
+    def _rows(self, resume_ids: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        # Row of each id (0 where missing) and a mask of the ids that are indexed.
+        rows = np.fromiter((self._positions.get(resume_id, -1) for resume_id in resume_ids), np.intp, len(resume_ids))
+        indexed = rows >= 0
+        rows[~indexed] = 0
+        return rows, indexed
+
+    def load(self, version: str, resume_ids: list[str], categories: list[str], experience_years: np.ndarray) -> None:
+        """Replace the index with whole columns, as ``rebuild`` would from the same rows."""
+        with self._lock:
+            self._reset(version)
+            # Codes in order of first appearance, the order ``_append`` would assign them.
+            self._categories = list(dict.fromkeys(categories))
+            self._codes = {category: code for code, category in enumerate(self._categories)}
+            count = len(resume_ids)
+            self._category = np.zeros(max(64, count), dtype=np.int32)
+            self._experience = np.zeros(max(64, count), dtype=np.int32)
+            self._category[:count] = [self._codes[category] for category in categories]
+            self._experience[:count] = experience_years
+            self._positions = {resume_id: position for position, resume_id in enumerate(resume_ids)}
+            self._size = count
+
+    def matches(
+        self,
+        resume_ids: list[str],
+        facet_filter: FacetFilter,
+        facets_of: Callable[[int], tuple[str, int]] | None = None,
+    ) -> np.ndarray:
+        """Boolean mask over ``resume_ids`` of the resumes that pass ``facet_filter``.
+
+        A resume missing from the index is judged on ``facets_of(i)``, its
+        category and experience years; without ``facets_of`` it matches nothing.
+        """
+        with self._lock:
+            rows, indexed = self._rows(resume_ids)
+            codes = self._category[rows]
+            years = self._experience[rows]
+            # Category names match case-insensitively; unknown names simply match nothing.
+            wanted = {name.lower() for name in facet_filter.categories}
+            wanted_codes = [code for code, name in enumerate(self._categories) if name.lower() in wanted]
+
+        keep = indexed.copy()
+        if facet_filter.categories:
+            keep &= np.isin(codes, wanted_codes)
+        if facet_filter.min_experience_years is not None:
+            keep &= years >= facet_filter.min_experience_years
+        if facet_filter.max_experience_years is not None:
+            keep &= years <= facet_filter.max_experience_years
+        if facets_of is not None:
+            for row in np.flatnonzero(~indexed).tolist():
+                keep[row] = facet_filter.accepts(*facets_of(row))
+        return keep
+
+    def category_counts(
+        self,
+        resume_ids: list[str],
+        facets_of: Callable[[int], tuple[str, int]] | None = None,
+    ) -> dict[str, int]:
+        """Resumes per predicted category among ``resume_ids``, most frequent first.
+
+        Resumes missing from the index count under ``facets_of(i)``'s category,
+        or not at all without ``facets_of``.
+        """
+        with self._lock:
+            rows, indexed = self._rows(resume_ids)
+            counts = np.bincount(self._category[rows[indexed]], minlength=len(self._categories))
+            totals = dict(zip(self._categories, counts.tolist()))
+        if facets_of is not None:
+            for row in np.flatnonzero(~indexed).tolist():
+                category = facets_of(row)[0]
+                totals[category] = totals.get(category, 0) + 1
+        # Stable: equal counts keep the order in which categories were first indexed.
+        return {category: count for category, count in sorted(totals.items(), key=lambda item: -item[1]) if count}
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import threading
+from typing import Iterable
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+# Scores are compared in ATS fractions (0..1). Anything within this margin of
+# the cut-off is kept, so float noise and rounding to 0.01 ATS points can never
+# prune a resume that the brute-force ranking would place in the top k.
+_PRUNE_MARGIN = 2e-4
+
+
+class InvertedIndex:
+    """Term -> (resume position, weight) postings over L2-normalized TF-IDF rows.
+
+    Postings are appended at ingest for the vectorizer version the index was
+    built for; a model reload makes the index stale until ``rebuild`` is called.
+    """
+
+    def __init__(self):
+        self.version: str | None = None
+        self._lock = threading.Lock()
+        self._positions: dict[str, int] = {}
+        self._postings: dict[int, tuple[list[int], list[float]]] = {}
+        self._max_weight: dict[int, float] = {}
+        self._frozen: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        self._next_position = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self._positions
+
+    def _reset(self, version: str) -> None:
+        self.version = version
+        self._positions = {}
+        self._postings = {}
+        self._max_weight = {}
+        self._frozen = {}
+        self._next_position = 0
+
+    def _append(self, resume_id: str, vector: csr_matrix) -> None:
+        if resume_id in self._positions:
+            return
+        position = self._next_position
+        self._next_position += 1
+        self._positions[resume_id] = position
+        for term, weight in zip(vector.indices.tolist(), vector.data.tolist()):
+            positions, weights = self._postings.setdefault(term, ([], []))
+            positions.append(position)
+            weights.append(weight)
+            self._max_weight[term] = max(self._max_weight.get(term, 0.0), weight)
+            self._frozen.pop(term, None)
+
+    def is_current(self, version: str) -> bool:
+        return self.version == version
+
+    def add(self, resume_id: str, vector: csr_matrix, version: str) -> None:
+        with self._lock:
+            if self.version is None:
+                self._reset(version)
+            if self.version == version:
+                self._append(resume_id, vector)
+
+    def discard(self, resume_ids: Iterable[str]) -> None:
+        """Forget resumes; their postings stay behind as garbage until ``rebuild``."""
+        with self._lock:
+            for resume_id in resume_ids:
+                self._positions.pop(resume_id, None)
+
+    def garbage(self) -> int:
+        return self._next_position - len(self._positions)
+
+    def rebuild(self, version: str, items: Iterable[tuple[str, csr_matrix]]) -> None:
+        with self._lock:
+            self._reset(version)
+            for resume_id, vector in items:
+                self._append(resume_id, vector)
+
+    def load(self, version: str, resume_ids: list[str], vectors: csr_matrix) -> None:
+        """Replace the index with row ``i`` of ``vectors`` as ``resume_ids[i]``, one term column at a time.
+
+        Builds exactly what ``rebuild`` would from the same rows, without a per-resume loop.
+        """
+        columns = vectors.tocsc()
+        columns.sort_indices()
+        with self._lock:
+            self._reset(version)
+            self._positions = {resume_id: position for position, resume_id in enumerate(resume_ids)}
+            self._next_position = len(resume_ids)
+            for term in np.flatnonzero(np.diff(columns.indptr)).tolist():
+                start, end = columns.indptr[term], columns.indptr[term + 1]
+                positions = columns.indices[start:end].astype(np.int64)
+                weights = columns.data[start:end].astype(np.float64)
+                self._postings[term] = (positions.tolist(), weights.tolist())
+                self._max_weight[term] = max(0.0, float(weights.max()))
+                self._frozen[term] = (positions, weights)
+
+    def _term_postings(self, term: int) -> tuple[np.ndarray, np.ndarray]:
+        frozen = self._frozen.get(term)
+        if frozen is None:
+            positions, weights = self._postings[term]
+            frozen = (np.asarray(positions, dtype=np.int64), np.asarray(weights, dtype=np.float64))
+            self._frozen[term] = frozen
+        return frozen
+
+    def top_candidates(
+        self,
+        resume_ids: list[str],
+        job_vector: csr_matrix,
+        base_scores: np.ndarray,
+        top_k: int,
+        similarity_weight: float = 0.50,
+    ) -> np.ndarray | None:
+        """Rows of ``resume_ids`` that can still reach the ``top_k`` ATS scores.
+
+        A resume's ATS fraction is ``similarity_weight * cosine + base_scores[row]``.
+        Query terms are visited in decreasing order of their maximal contribution
+        (MaxScore); once the terms left cannot lift any resume without postings
+        so far above the current k-th lower bound, no new resumes are opened.
+        Every row whose upper bound still reaches the cut-off is returned, in
+        ascending order, for exact rescoring. Returns ``None`` if a resume is
+        not indexed or listed twice.
+        """
+        with self._lock:
+            try:
+                universe = np.fromiter(
+                    (self._positions[resume_id] for resume_id in resume_ids),
+                    dtype=np.int64,
+                    count=len(resume_ids),
+                )
+            except KeyError:
+                return None
+            if np.unique(universe).size != universe.size:
+                return None
+            row_of = np.full(self._next_position, -1, dtype=np.int64)
+            row_of[universe] = np.arange(len(resume_ids))
+
+            terms = [
+                (term, weight, weight * self._max_weight[term])
+                for term, weight in zip(job_vector.indices.tolist(), job_vector.data.tolist())
+                if term in self._postings
+            ]
+            terms.sort(key=lambda item: item[2], reverse=True)
+            postings = [self._term_postings(term) for term, _, _ in terms]
+
+        count = len(resume_ids)
+        top_k = min(top_k, count)
+        accumulated = np.zeros(count)
+        # Squared norm of each row's already visited weights: with unit-length
+        # rows, Cauchy-Schwarz bounds the unvisited part of the cosine by
+        # ||q_remaining|| * sqrt(1 - visited), often far below the MaxScore sum.
+        visited = np.zeros(count)
+        touched = np.zeros(count, dtype=bool)
+        remaining = sum(bound for _, _, bound in terms)
+        remaining_square = sum(weight * weight for _, weight, _ in terms)
+        threshold = np.partition(base_scores, count - top_k)[count - top_k]
+
+        def upper_bounds() -> np.ndarray:
+            tail = np.sqrt(max(remaining_square, 0.0) * np.clip(1.0 - visited, 0.0, 1.0))
+            return similarity_weight * (accumulated + np.minimum(tail, max(remaining, 0.0))) + base_scores
+
+        for (_, weight, bound), (positions, weights) in zip(terms, postings):
+            unopened = ~touched
+            if not unopened.any() or (
+                similarity_weight * min(remaining, np.sqrt(max(remaining_square, 0.0)))
+                + base_scores[unopened].max()
+                + _PRUNE_MARGIN
+                < threshold
+            ):
+                break
+
+            rows = row_of[positions]
+            in_universe = rows >= 0
+            rows = rows[in_universe]
+            row_weights = weights[in_universe]
+            accumulated[rows] += row_weights * weight
+            visited[rows] += row_weights * row_weights
+            touched[rows] = True
+            remaining -= bound
+            remaining_square -= weight * weight
+
+            lower = similarity_weight * accumulated + base_scores
+            threshold = np.partition(lower, count - top_k)[count - top_k]
+
+        return np.flatnonzero(upper_bounds() + _PRUNE_MARGIN >= threshold)
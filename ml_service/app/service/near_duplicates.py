@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import re
+import threading
+import zlib
+from typing import Iterable
+
+import numpy as np
+
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+# Prime just above 2**32; with 32-bit shingle hashes and coefficients below 2**32 - 1,
+# a * x + b never overflows uint64.
+_PRIME = np.uint64(4294967311)
+
+
+class MinHashLSH:
+    """Near-duplicate lookup over word-shingle MinHash signatures.
+
+    Signatures of ``permutations`` hash functions are split into ``bands``
+    bands; two resumes become candidates when any band matches exactly, so a
+    lookup touches ``bands`` buckets instead of every stored resume.
+    Candidates are confirmed by their estimated Jaccard similarity.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        permutations: int = 128,
+        bands: int = 32,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        if permutations % bands:
+            raise ValueError("permutations must be a multiple of bands.")
+        self.threshold = threshold
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self._rows = permutations // bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**32 - 1, size=permutations, dtype=np.uint64)
+        self._b = rng.integers(0, 2**32 - 1, size=permutations, dtype=np.uint64)
+        self._lock = threading.Lock()
+        self._signatures: dict[str, np.ndarray] = {}
+        self._buckets: list[dict[bytes, set[str]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self._signatures
+
+    def signature(self, text: str) -> np.ndarray | None:
+        """MinHash of the text's word shingles; ``None`` for texts without words."""
+        tokens = _TOKEN_PATTERN.findall(str(text or "").lower())
+        if not tokens:
+            return None
+        size = min(self.shingle_size, len(tokens))
+        shingles = {" ".join(tokens[start:start + size]) for start in range(len(tokens) - size + 1)}
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        return ((np.outer(hashes, self._a) + self._b) % _PRIME).min(axis=0).astype(np.uint32)
+
+    def _keys(self, signature: np.ndarray) -> list[bytes]:
+        return [signature[band * self._rows:(band + 1) * self._rows].tobytes() for band in range(self.bands)]
+
+    def add(self, resume_id: str, text: str) -> None:
+        signature = self.signature(text)
+        if signature is None:
+            return
+        with self._lock:
+            if resume_id in self._signatures:
+                return
+            self._signatures[resume_id] = signature
+            for buckets, key in zip(self._buckets, self._keys(signature)):
+                buckets.setdefault(key, set()).add(resume_id)
+
+    @property
+    def params(self) -> list[int]:
+        """What a signature depends on; stored signatures are reusable only under equal params."""
+        return [len(self._a), self.shingle_size, self.seed]
+
+    def signatures(self, resume_ids: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Signatures of ``resume_ids`` (zero rows where none is stored) and a mask of the stored ones."""
+        with self._lock:
+            found = [self._signatures.get(resume_id) for resume_id in resume_ids]
+        present = np.array([signature is not None for signature in found], dtype=bool)
+        signatures = np.zeros((len(resume_ids), len(self._a)), dtype=np.uint32)
+        for row, signature in enumerate(found):
+            if signature is not None:
+                signatures[row] = signature
+        return signatures, present
+
+    def load(self, resume_ids: list[str], signatures: np.ndarray, present: np.ndarray) -> None:
+        """Add precomputed signatures for the rows where ``present``, skipping the shingling."""
+        signatures = np.array(signatures, dtype=np.uint32)
+        with self._lock:
+            for row in np.flatnonzero(present).tolist():
+                resume_id = resume_ids[row]
+                if resume_id in self._signatures:
+                    continue
+                self._signatures[resume_id] = signatures[row]
+                for buckets, key in zip(self._buckets, self._keys(signatures[row])):
+                    buckets.setdefault(key, set()).add(resume_id)
+
+    def discard(self, resume_ids: Iterable[str]) -> None:
+        with self._lock:
+            for resume_id in resume_ids:
+                signature = self._signatures.pop(resume_id, None)
+                if signature is None:
+                    continue
+                for buckets, key in zip(self._buckets, self._keys(signature)):
+                    members = buckets.get(key)
+                    if members is not None:
+                        members.discard(resume_id)
+                        if not members:
+                            del buckets[key]
+
+    def find(self, text: str) -> tuple[str, float] | None:
+        """The most similar stored resume at or above ``threshold``, with its estimated Jaccard."""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        with self._lock:
+            candidates: set[str] = set()
+            for buckets, key in zip(self._buckets, self._keys(signature)):
+                candidates.update(buckets.get(key, ()))
+            best = None
+            for resume_id in sorted(candidates):
+                similarity = float(np.mean(self._signatures[resume_id] == signature))
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (resume_id, similarity)
+        return best
+
+    def status(self) -> dict:
+        return {
+            "resumes": len(self),
+            "threshold": self.threshold,
+            "bands": self.bands,
+            "rows_per_band": self._rows,
+        }
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class ResultCache:
+    """Byte-bounded LRU of finished rankings with single-flight computation.
+
+    ``begin`` either returns a cached value or makes the caller the single
+    computation in flight for the key; identical requests arriving meanwhile
+    wait for it instead of scoring the store again. The leader must always
+    call ``finish``, with ``None`` when its result is not to be shared.
+
+    Waiting blocks the calling thread, so async code calls in from a worker
+    thread (``asyncio.to_thread``); called on a running event loop, ``begin``
+    does not wait and the caller computes on its own.
+    """
+
+    def __init__(self, max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._sizes: dict[Hashable, int] = {}
+        self._inflight: dict[Hashable, threading.Event] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._shared = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Hashable) -> Any | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def begin(self, key: Hashable, timeout: float | None = None) -> tuple[Any | None, bool]:
+        """``(value, False)`` on a hit, ``(None, True)`` for the leader, ``(None, False)`` otherwise.
+
+        A waiter gives up after ``timeout`` seconds, or when the leader shared
+        nothing, and then computes on its own without leading.
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self._hits += 1
+                return value, False
+            event = self._inflight.get(key)
+            if event is None:
+                self._inflight[key] = threading.Event()
+                self._misses += 1
+                return None, True
+
+        if _on_event_loop():
+            # Never park the event loop behind another request's scoring.
+            timeout = 0
+        event.wait(timeout)
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self._shared += 1
+                return value, False
+            self._misses += 1
+        return None, False
+
+    def finish(self, key: Hashable, value: Any | None, size: int = 0) -> None:
+        """Store the leader's ``value`` (unless ``None`` or over budget) and release its waiters."""
+        with self._lock:
+            if value is not None and size <= self.max_bytes:
+                self._bytes += size - self._sizes.get(key, 0)
+                self._entries[key] = value
+                self._sizes[key] = size
+                self._entries.move_to_end(key)
+                while self._bytes > self.max_bytes:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._bytes -= self._sizes.pop(evicted)
+                    self._evictions += 1
+            event = self._inflight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def status(self) -> dict:
+        return {
+            "entries": len(self),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "shared": self._shared,
+            "misses": self._misses,
+            "evictions": self._evictions,
+        }
@@ -4,38 +4,9 @@ import re
 from dataclasses import dataclass
 from datetime import datetime
 
+# KNOWN_SKILLS is re-exported; the aliases are compiled once by the shared registry.
+from .skill_registry import KNOWN_SKILLS, SkillRegistry, SkillScan, get_skill_registry  # noqa: F401
 
-KNOWN_SKILLS: list[tuple[str, list[str]]] = [
-    ("JavaScript", ["javascript", "js"]),
-    ("TypeScript", ["typescript", "ts"]),
-    ("React", ["react", "react.js"]),
-    ("Node.js", ["node", "nodejs", "node.js"]),
-    ("Express.js", ["express", "expressjs", "express.js"]),
-    ("Python", ["python"]),
-    ("SQL", ["sql", "mysql", "postgresql", "postgres"]),
-    ("MongoDB", ["mongodb", "mongo"]),
-    ("HTML", ["html", "html5"]),
-    ("CSS", ["css", "css3"]),
-    ("AWS", ["aws", "amazon web services"]),
-    ("Docker", ["docker"]),
-    ("Kubernetes", ["kubernetes", "k8s"]),
-    ("Git", ["git", "github"]),
-    ("Machine Learning", ["machine learning", "ml"]),
-    ("Deep Learning", ["deep learning"]),
-    ("TensorFlow", ["tensorflow"]),
-    ("PyTorch", ["pytorch"]),
-    ("NLP", ["nlp", "natural language processing"]),
-    ("Data Analysis", ["data analysis", "analytics"]),
-    ("Scikit-learn", ["scikit-learn", "sklearn"]),
-    ("Pandas", ["pandas"]),
-    ("NumPy", ["numpy"]),
-    ("Power BI", ["power bi", "powerbi"]),
-    ("Tableau", ["tableau"]),
-    ("REST APIs", ["rest api", "restful", "apis"]),
-    ("C++", ["c++", "cpp"]),
-    ("Java", ["java"]),
-    ("C#", ["c#", ".net", "dotnet"]),
-]
 
 SECTION_ALIASES: dict[str, list[str]] = {
     "skills": ["skills", "technical skills", "core skills", "technologies", "competencies"],
@@ -175,20 +146,10 @@ def _tokenize_skills(lines: list[str]) -> list[str]:
     return tokens
 
 
-def _find_known_skills(normalized_lower_text: str) -> list[str]:
-    def contains_alias(text: str, alias: str) -> bool:
-        alias = alias.lower().strip()
-        if not alias:
-            return False
-        escaped = re.escape(alias)
-        pattern = re.compile(rf"(?<!\w){escaped}(?!\w)", re.IGNORECASE)
-        return bool(pattern.search(text))
-
-    found: list[str] = []
-    for label, aliases in KNOWN_SKILLS:
-        if any(contains_alias(normalized_lower_text, alias) for alias in aliases):
-            found.append(label)
-    return found
+def scan_resume_text(text: str, registry: SkillRegistry | None = None) -> SkillScan:
+    """One registry scan of the whitespace-normalized text, where multi-word skills split by
+    spacing or line breaks still match; taxonomy and profile skills both come from it."""
+    return (registry or get_skill_registry()).scan(" ".join(_normalize_text(text).split()))
 
 
 def _pick_name(lines: list[str]) -> str:
@@ -358,11 +319,11 @@ def _pick_experience_years(full_text: str, lines: list[str]) -> int:
     return max(0, round(max_years))
 
 
-def extract_resume_profile(text: str) -> ResumeProfile:
+def extract_resume_profile(text: str, scan: SkillScan | None = None) -> ResumeProfile:
+    """Profile of ``text``; pass the ``scan_resume_text`` scan when the caller already has it."""
     lines = _split_lines(text)
-    normalized_lower_text = _normalize_text(" ".join(lines)).lower()
     skill_section_items = _tokenize_skills(_extract_section_lines(lines, "skills", max_items=12))
-    known_skills = _find_known_skills(normalized_lower_text)
+    known_skills = (scan or scan_resume_text(text)).known_skills
     merged_skills = _uniq_list([*skill_section_items, *known_skills], max_items=20)
 
     return ResumeProfile(
@@ -373,3 +334,8 @@ def extract_resume_profile(text: str) -> ResumeProfile:
         projects=_pick_projects(lines),
         experience_years=_pick_experience_years(text, lines),
     )
+
+
+def extract_experience_years(text: str) -> int:
+    """Years of experience as ``extract_resume_profile`` reports them, without the rest of the profile."""
+    return _pick_experience_years(text, _split_lines(text))
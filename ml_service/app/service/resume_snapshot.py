@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+SNAPSHOT_FORMAT = 1
+_CURRENT_FILE = "CURRENT"
+
+
+@dataclass
+class ResumeSnapshot:
+    """Column-oriented image of the resume store.
+
+    ``vectors`` row ``i``, ``skill_bitmaps`` row ``i`` (packed uint64 over the
+    taxonomy of ``skills_version``) and the other per-resume columns all
+    describe ``resume_ids[i]``.
+    """
+
+    resume_ids: list[str]
+    filenames: list[str]
+    compressed_texts: list[bytes]  # zlib
+    categories: list[str]
+    structure_quality: np.ndarray
+    vectors: csr_matrix
+    skill_bitmaps: np.ndarray
+    model_version: str
+    skills_version: str
+    generation: int = 0
+    created_at: float = 0.0
+    # Absent from snapshots written before experience years were stored.
+    experience_years: np.ndarray | None = None
+    # MinHash signatures of the texts (rows where ``minhash_present``) and the
+    # parameters they were computed with; absent when duplicate detection was off.
+    minhash_signatures: np.ndarray | None = None
+    minhash_present: np.ndarray | None = None
+    minhash_params: list[int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.resume_ids)
+
+    def vector_rows(self) -> list[csr_matrix]:
+        """Row ``i`` of ``vectors`` as its own 1 x n matrix, cut straight from the mapped arrays.
+
+        Much cheaper than indexing the matrix row by row; scipy still copies each small slice.
+        """
+        data, indices, indptr = self.vectors.data, self.vectors.indices, self.vectors.indptr.tolist()
+        shape = (1, self.vectors.shape[1])
+        return [
+            csr_matrix(
+                (data[start:end], indices[start:end], np.array([0, end - start], dtype=np.int32)),
+                shape=shape,
+            )
+            for start, end in zip(indptr[:-1], indptr[1:])
+        ]
+
+    def skill_columns(self) -> list[list[int]]:
+        bits = np.unpackbits(
+            np.ascontiguousarray(self.skill_bitmaps).view(np.uint8),
+            axis=1,
+            bitorder="little",
+        )
+        return [np.flatnonzero(row).tolist() for row in bits]
+
+
+def _fsync_dir(directory: Path) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_snapshot(root: Path, snapshot: ResumeSnapshot) -> Path:
+    """Write ``snapshot`` under ``root`` and atomically make it the current one.
+
+    Every snapshot goes to a fresh directory; the ``CURRENT`` pointer file is
+    swapped with ``os.replace`` only after all arrays are on disk, so a crash
+    mid-write leaves the previous snapshot in place.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    name = f"snapshot-{time.time_ns()}"
+    target = root / name
+    target.mkdir()
+
+    compressed = snapshot.compressed_texts
+    text_offsets = np.zeros(len(compressed) + 1, dtype=np.int64)
+    np.cumsum([len(blob) for blob in compressed], out=text_offsets[1:])
+    vectors = snapshot.vectors.tocsr()
+    # Restored rows view the mapped file, so they must never need sorting in place.
+    vectors.sort_indices()
+
+    arrays = {
+        "vectors_data": np.asarray(vectors.data, dtype=np.float64),
+        "vectors_indices": np.asarray(vectors.indices, dtype=np.int32),
+        "vectors_indptr": np.asarray(vectors.indptr, dtype=np.int64),
+        "skill_bitmaps": np.asarray(snapshot.skill_bitmaps, dtype=np.uint64),
+        "structure_quality": np.asarray(snapshot.structure_quality, dtype=np.float64),
+        "text_offsets": text_offsets,
+        "text_blob": np.frombuffer(b"".join(compressed), dtype=np.uint8),
+    }
+    if snapshot.experience_years is not None:
+        arrays["experience_years"] = np.asarray(snapshot.experience_years, dtype=np.int32)
+    if snapshot.minhash_signatures is not None:
+        arrays["minhash_signatures"] = np.asarray(snapshot.minhash_signatures, dtype=np.uint32)
+        arrays["minhash_present"] = np.asarray(snapshot.minhash_present, dtype=bool)
+    for key, value in arrays.items():
+        with (target / f"{key}.npy").open("wb") as file:
+            np.save(file, value)
+            file.flush()
+            os.fsync(file.fileno())
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "model_version": snapshot.model_version,
+        "skills_version": snapshot.skills_version,
+        "generation": snapshot.generation,
+        "created_at": time.time(),
+        "resumes": len(snapshot),
+        "vector_shape": list(vectors.shape),
+        "resume_ids": snapshot.resume_ids,
+        "filenames": snapshot.filenames,
+        "categories": snapshot.categories,
+        "minhash_params": snapshot.minhash_params,
+    }
+    with (target / "manifest.json").open("w", encoding="utf-8") as file:
+        json.dump(manifest, file)
+        file.flush()
+        os.fsync(file.fileno())
+    _fsync_dir(target)
+
+    pointer = root / f"{_CURRENT_FILE}.tmp"
+    pointer.write_text(name, encoding="utf-8")
+    os.replace(pointer, root / _CURRENT_FILE)
+    _fsync_dir(root)
+
+    for stale in root.glob("snapshot-*"):
+        if stale.name != name:
+            shutil.rmtree(stale, ignore_errors=True)
+    return target
+
+
+def read_snapshot(root: Path) -> ResumeSnapshot | None:
+    """Load the current snapshot under ``root``; arrays are memory-mapped, not copied."""
+    root = Path(root)
+    try:
+        name = (root / _CURRENT_FILE).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    directory = root / name
+    manifest = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        return None
+
+    def load(key: str) -> np.ndarray:
+        try:
+            return np.load(directory / f"{key}.npy", mmap_mode="r")
+        except ValueError:
+            # Zero-length arrays cannot be mapped.
+            return np.load(directory / f"{key}.npy")
+
+    text_offsets = load("text_offsets")
+    text_blob = load("text_blob")
+    compressed_texts = [
+        text_blob[start:end].tobytes()
+        for start, end in zip(text_offsets[:-1].tolist(), text_offsets[1:].tolist())
+    ]
+    vectors = csr_matrix(
+        (load("vectors_data"), load("vectors_indices"), load("vectors_indptr")),
+        shape=tuple(manifest["vector_shape"]),
+    )
+    if not vectors.has_sorted_indices:
+        # Written before rows were sorted on save; sort a private copy instead of the mapping.
+        vectors = vectors.sorted_indices()
+    minhash = (directory / "minhash_signatures.npy").exists() and manifest.get("minhash_params") is not None
+
+    return ResumeSnapshot(
+        resume_ids=manifest["resume_ids"],
+        filenames=manifest["filenames"],
+        compressed_texts=compressed_texts,
+        categories=manifest["categories"],
+        structure_quality=load("structure_quality"),
+        vectors=vectors,
+        skill_bitmaps=load("skill_bitmaps"),
+        model_version=manifest["model_version"],
+        skills_version=manifest["skills_version"],
+        generation=int(manifest.get("generation", 0)),
+        created_at=float(manifest.get("created_at", 0.0)),
+        experience_years=load("experience_years") if (directory / "experience_years.npy").exists() else None,
+        minhash_signatures=load("minhash_signatures") if minhash else None,
+        minhash_present=load("minhash_present") if minhash else None,
+        minhash_params=manifest["minhash_params"] if minhash else None,
+    )
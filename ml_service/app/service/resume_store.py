@@ -0,0 +1,375 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+# encode(record) -> (resume_id, filename, text, vector or None, JSON-serializable meta)
+RecordEncoder = Callable[[Any], tuple[str, str, str, csr_matrix | None, dict]]
+# decode(resume_id, filename, load_text, vector or None, meta) -> record; load_text() reads the text
+RecordDecoder = Callable[[str, str, Callable[[], str], csr_matrix | None, dict], Any]
+
+
+class MemoryResumeStore:
+    """Process-local resume store; the default for a single worker.
+
+    With ``max_bytes`` the least recently used resumes are evicted once the
+    estimated size of all records (``sizeof``) exceeds the budget; with
+    ``ttl_seconds`` resumes not used for that long are evicted as well. A
+    resume counts as used when it is added, read with ``get`` or ``touch``ed
+    by a ranking. ``records()`` keeps insertion order, so use never changes
+    rank ties.
+    """
+
+    backend = "memory"
+
+    def __init__(
+        self,
+        max_bytes: int = 0,
+        ttl_seconds: float = 0.0,
+        sizeof: Callable[[Any], int] | None = None,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof or (lambda record: 0)
+        self._records: dict[str, Any] = {}
+        self._sizes: dict[str, int] = {}
+        self._last_used: OrderedDict[str, float] = OrderedDict()
+        self._pending: list[Any] = []
+        self._evicted: list[str] = []
+        self._bytes = 0
+        self._evictions = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def _touch(self, resume_id: str) -> None:
+        self._last_used[resume_id] = time.monotonic()
+        self._last_used.move_to_end(resume_id)
+
+    def _resize(self, resume_id: str) -> None:
+        size = self._sizeof(self._records[resume_id])
+        self._bytes += size - self._sizes.get(resume_id, 0)
+        self._sizes[resume_id] = size
+
+    def _evict(self, keep: str | None = None) -> None:
+        # Walk from the least recently used end only as far as something must go.
+        expired_before = time.monotonic() - self.ttl_seconds
+        remaining = self._bytes
+        victims = []
+        for resume_id, last_used in self._last_used.items():
+            over_ttl = self.ttl_seconds > 0 and last_used < expired_before
+            over_budget = self.max_bytes > 0 and remaining > self.max_bytes
+            if not (over_ttl or over_budget):
+                break
+            if resume_id == keep:
+                continue
+            victims.append(resume_id)
+            remaining -= self._sizes[resume_id]
+        for resume_id in victims:
+            del self._records[resume_id]
+            del self._last_used[resume_id]
+            self._bytes -= self._sizes.pop(resume_id)
+            self._evicted.append(resume_id)
+            self._evictions += 1
+            self._generation += 1
+
+    def add(self, resume_id: str, record: Any) -> None:
+        with self._lock:
+            self._records[resume_id] = record
+            self._resize(resume_id)
+            self._touch(resume_id)
+            self._pending.append(record)
+            self._generation += 1
+            self._evict(keep=resume_id)
+
+    def replace(self, resume_id: str, record: Any) -> None:
+        """Swap in a new record under an existing id; it keeps its place in store order."""
+        self.add(resume_id, record)
+
+    def update(self, records: list[Any]) -> None:
+        # Records are shared objects here, so their new features are already visible.
+        with self._lock:
+            for record in records:
+                if record.resume_id in self._records:
+                    self._resize(record.resume_id)
+            self._generation += 1
+            self._evict()
+
+    def get(self, resume_id: str) -> Any | None:
+        with self._lock:
+            record = self._records.get(resume_id)
+            if record is not None:
+                self._touch(resume_id)
+            return record
+
+    def touch(self, resume_ids: Iterable[str] | None = None) -> None:
+        """Mark resumes (every one when ``None``) as used now."""
+        with self._lock:
+            now = time.monotonic()
+            if resume_ids is None:
+                # Same order, all at the most recent end.
+                self._last_used = OrderedDict.fromkeys(self._last_used, now)
+                return
+            for resume_id in resume_ids:
+                if resume_id in self._last_used:
+                    self._last_used[resume_id] = now
+                    self._last_used.move_to_end(resume_id)
+
+    def records(self) -> list[Any]:
+        return list(self._records.values())
+
+    def refresh(self) -> list[Any]:
+        """Records added since the previous call."""
+        with self._lock:
+            self._evict()
+            pending, self._pending = self._pending, []
+        return pending
+
+    def take_evicted(self) -> list[str]:
+        """Ids evicted since the previous call."""
+        with self._lock:
+            evicted, self._evicted = self._evicted, []
+        return evicted
+
+    def status(self) -> dict:
+        return {
+            "backend": self.backend,
+            "resumes": len(self),
+            "generation": self.generation,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "evictions": self._evictions,
+        }
+
+
+class SharedResumeStore:
+    """Resume store shared by all worker processes on one machine.
+
+    Metadata and text live in SQLite; sparse feature vectors are appended to
+    two flat files (column indices and weights) that every worker maps
+    read-only, so the OS page cache holds a single copy. A generation counter
+    in SQLite is bumped by every write; workers pull only the rows written
+    after the generation they last saw. Texts stay in SQLite and are read by
+    id when a record needs one, so workers do not each hold every text.
+    """
+
+    backend = "shared"
+
+    def __init__(self, directory: Path, encode: RecordEncoder, decode: RecordDecoder):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._db_path = self.directory / "resumes.sqlite3"
+        self._indices_path = self.directory / "vectors.indices.i4"
+        self._weights_path = self.directory / "vectors.weights.f8"
+        self._encode = encode
+        self._decode = decode
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._records: dict[str, Any] = {}
+        self._seen_generation = 0
+        self._mapped_entries = 0
+        self._indices_map: np.ndarray | None = None
+        self._weights_map: np.ndarray | None = None
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread, opened on first use; sqlite3 connections are not shared across threads.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self._db_path, timeout=30.0, isolation_level=None)
+        return conn
+
+    def _init_db(self) -> None:
+        with closing(sqlite3.connect(self._db_path, timeout=30.0, isolation_level=None)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS resumes (
+                    position INTEGER PRIMARY KEY AUTOINCREMENT,
+                    resume_id TEXT NOT NULL UNIQUE,
+                    filename TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    vector_offset INTEGER,
+                    vector_nnz INTEGER,
+                    vector_dim INTEGER,
+                    meta TEXT NOT NULL,
+                    generation INTEGER NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS resumes_generation ON resumes (generation)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS store_meta (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            conn.execute(
+                "INSERT OR IGNORE INTO store_meta (key, value) "
+                "VALUES ('generation', 0), ('vector_entries', 0)"
+            )
+
+    def __len__(self) -> int:
+        # Rows are never deleted, so after refresh() this worker holds every row.
+        return len(self._records)
+
+    @property
+    def generation(self) -> int:
+        """The generation this worker's records reflect, as of its last ``refresh``."""
+        return self._seen_generation
+
+    @staticmethod
+    def _read_meta(conn: sqlite3.Connection, key: str) -> int:
+        return int(conn.execute("SELECT value FROM store_meta WHERE key = ?", (key,)).fetchone()[0])
+
+    def _append_vector(self, conn: sqlite3.Connection, vector: csr_matrix | None) -> tuple:
+        if vector is None:
+            return None, None, None
+        offset = self._read_meta(conn, "vector_entries")
+        indices = np.ascontiguousarray(vector.indices, dtype=np.int32)
+        weights = np.ascontiguousarray(vector.data, dtype=np.float64)
+        # Write at the committed length, so bytes left by a crashed writer are overwritten.
+        for path, values in ((self._indices_path, indices), (self._weights_path, weights)):
+            with path.open("r+b" if path.exists() else "w+b") as file:
+                file.seek(offset * values.itemsize)
+                file.write(values.tobytes())
+                file.flush()
+                os.fsync(file.fileno())
+        conn.execute(
+            "UPDATE store_meta SET value = value + ? WHERE key = 'vector_entries'",
+            (len(indices),),
+        )
+        return offset, len(indices), vector.shape[1]
+
+    def _write(self, records: list[Any], insert: bool) -> None:
+        conn = self._connect()
+        # BEGIN IMMEDIATE takes SQLite's write lock, serializing writers across processes.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'generation'")
+            generation = self._read_meta(conn, "generation")
+            for record in records:
+                resume_id, filename, text, vector, meta = self._encode(record)
+                offset, nnz, dim = self._append_vector(conn, vector)
+                values = (filename, text, offset, nnz, dim, json.dumps(meta), generation, resume_id)
+                if insert:
+                    conn.execute(
+                        "INSERT INTO resumes (filename, text, vector_offset, vector_nnz, "
+                        "vector_dim, meta, generation, resume_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        values,
+                    )
+                else:
+                    conn.execute(
+                        "UPDATE resumes SET filename = ?, text = ?, vector_offset = ?, vector_nnz = ?, "
+                        "vector_dim = ?, meta = ?, generation = ? WHERE resume_id = ?",
+                        values,
+                    )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def add(self, resume_id: str, record: Any) -> None:
+        # The record becomes visible here through refresh(), in store order like every other worker.
+        self._write([record], insert=True)
+
+    def replace(self, resume_id: str, record: Any) -> None:
+        """Overwrite an existing row in place; every worker reloads it on its next refresh."""
+        self._write([record], insert=False)
+
+    def update(self, records: list[Any]) -> None:
+        """Persist recomputed features; old vector entries are left unreferenced."""
+        if records:
+            self._write(records, insert=False)
+
+    def _vector(self, offset: int | None, nnz: int | None, dim: int | None) -> csr_matrix | None:
+        if offset is None:
+            return None
+        if nnz == 0:
+            return csr_matrix((1, dim), dtype=np.float64)
+        if offset + nnz > self._mapped_entries:
+            # Another writer grew the files since they were mapped.
+            self._indices_map = np.memmap(self._indices_path, dtype=np.int32, mode="r")
+            self._weights_map = np.memmap(self._weights_path, dtype=np.float64, mode="r")
+            self._mapped_entries = min(len(self._indices_map), len(self._weights_map))
+        return csr_matrix(
+            (
+                self._weights_map[offset:offset + nnz],
+                self._indices_map[offset:offset + nnz],
+                np.array([0, nnz], dtype=np.int32),
+            ),
+            shape=(1, dim),
+        )
+
+    def text(self, resume_id: str) -> str:
+        """The stored text of ``resume_id``, read from SQLite."""
+        row = self._connect().execute("SELECT text FROM resumes WHERE resume_id = ?", (resume_id,)).fetchone()
+        return row[0] if row is not None else ""
+
+    def refresh(self) -> list[Any]:
+        """Load rows written by any worker since the previous call, in store order, without their texts."""
+        with self._lock:
+            conn = self._connect()
+            generation = self._read_meta(conn, "generation")
+            if generation == self._seen_generation:
+                return []
+            rows = conn.execute(
+                "SELECT resume_id, filename, vector_offset, vector_nnz, vector_dim, meta "
+                "FROM resumes WHERE generation > ? AND generation <= ? ORDER BY position",
+                (self._seen_generation, generation),
+            ).fetchall()
+
+            loaded = []
+            for resume_id, filename, offset, nnz, dim, meta in rows:
+                record = self._decode(
+                    resume_id,
+                    filename,
+                    partial(self.text, resume_id),
+                    self._vector(offset, nnz, dim),
+                    json.loads(meta),
+                )
+                self._records[resume_id] = record
+                loaded.append(record)
+            self._seen_generation = generation
+            return loaded
+
+    def get(self, resume_id: str) -> Any | None:
+        return self._records.get(resume_id)
+
+    def touch(self, resume_ids: Iterable[str] | None = None) -> None:
+        # Shared rows are never evicted, so use is not tracked.
+        pass
+
+    def records(self) -> list[Any]:
+        return list(self._records.values())
+
+    def take_evicted(self) -> list[str]:
+        # Shared rows are persistent and never evicted.
+        return []
+
+    def status(self) -> dict:
+        return {
+            "backend": self.backend,
+            "resumes": len(self),
+            "generation": self.generation,
+            "path": str(self.directory),
+        }
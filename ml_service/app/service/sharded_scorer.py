@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import math
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Hashable
+
+import numpy as np
+from loguru import logger
+from scipy.sparse import csr_matrix
+
+from ..models.ats_scorer import ATSScorer
+
+
+# (name, dtype) of every array in a published segment, in layout order.
+_ARRAYS = (
+    ("vector_data", np.float64),
+    ("vector_indices", np.int32),
+    ("vector_indptr", np.int64),
+    ("skill_indices", np.int32),
+    ("skill_indptr", np.int64),
+    ("structure_quality", np.float64),
+)
+
+
+def top_rows(scores: np.ndarray, top_k: int | None = None) -> np.ndarray:
+    """Rows of the ``top_k`` best scores, ordered like a stable descending sort."""
+    if top_k is None or top_k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+
+    # Partition instead of sorting everything; ties on the cut-off keep the earliest rows.
+    threshold = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+    above = np.flatnonzero(scores > threshold)
+    tied = np.flatnonzero(scores == threshold)[: top_k - len(above)]
+    rows = np.concatenate([above, tied])
+    return rows[np.argsort(-scores[rows], kind="stable")]
+
+
+# Republish everything once this many segments are live; appended segments are usually small.
+_MAX_SEGMENTS = 8
+
+# Worker side: segment name -> (shared memory, arrays) for the segments this process has mapped.
+_ATTACHED: dict[str, tuple[SharedMemory, dict[str, np.ndarray]]] = {}
+
+
+def _attach(segment: str, layout: dict) -> dict[str, np.ndarray]:
+    for name in [name for name in _ATTACHED if name not in layout["live"]]:
+        shm = _ATTACHED.pop(name)[0]
+        shm.close()
+    if segment not in _ATTACHED:
+        # Spawned workers report to the parent's resource tracker, which already tracks this
+        # segment; the parent unlinks it.
+        shm = SharedMemory(name=segment)
+        _ATTACHED[segment] = (
+            shm,
+            {
+                name: np.ndarray((count,), dtype=dtype, buffer=shm.buf, offset=offset)
+                for name, (offset, count, dtype) in layout["arrays"].items()
+            },
+        )
+    return _ATTACHED[segment][1]
+
+
+def _warm_up() -> int:
+    return 0
+
+
+def _score_shard(
+    segment: str,
+    layout: dict,
+    positions: np.ndarray,
+    job_vector: tuple[np.ndarray, np.ndarray],
+    job_columns: np.ndarray,
+    top_k: int | None,
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Score rows ``positions`` of one segment (in request order) and keep the local ``top_k``.
+
+    Returns indices into ``positions``, ascending, with their unrounded details.
+    """
+    arrays = _attach(segment, layout)
+    start, end = int(positions.min()), int(positions.max()) + 1
+    vector_indptr = arrays["vector_indptr"][start:end + 1]
+    skill_indptr = arrays["skill_indptr"][start:end + 1]
+    vectors = csr_matrix(
+        (
+            arrays["vector_data"][vector_indptr[0]:vector_indptr[-1]],
+            arrays["vector_indices"][vector_indptr[0]:vector_indptr[-1]],
+            vector_indptr - vector_indptr[0],
+        ),
+        shape=(end - start, layout["dimension"]),
+    )
+    skills = csr_matrix(
+        (
+            np.ones(int(skill_indptr[-1] - skill_indptr[0]), dtype=np.int32),
+            arrays["skill_indices"][skill_indptr[0]:skill_indptr[-1]],
+            skill_indptr - skill_indptr[0],
+        ),
+        shape=(end - start, layout["skills"]),
+    )
+    local = positions - start
+    if not np.array_equal(local, np.arange(end - start)):
+        vectors, skills = vectors[local], skills[local]
+
+    indices, data = job_vector
+    job = csr_matrix((data, indices, [0, len(indices)]), shape=(1, layout["dimension"]))
+    job_skills = csr_matrix(
+        (np.ones(len(job_columns), dtype=np.int32), job_columns, [0, len(job_columns)]),
+        shape=(1, layout["skills"]),
+    )
+    # Same operations, row for row, as ATSScorer.score_many in the single-process path.
+    details = ATSScorer.combine(
+        (vectors @ job.T).toarray().ravel(),
+        ATSScorer.skill_coverage_many(skills, job_skills),
+        arrays["structure_quality"][positions],
+    )
+
+    ats_scores = np.array([round(float(score), 2) for score in details["ats_score"]])
+    selected = np.sort(top_rows(ats_scores, top_k))
+    return selected, {key: values[selected] for key, values in details.items()}
+
+
+class ShardedScorer:
+    """Score large resume sets on a process pool, one contiguous shard per worker.
+
+    ``publish`` copies the store's L2-normalized vectors, skill columns and
+    structure quality into shared memory segments that the workers map once;
+    a query then ships only the job vector and row positions. Resumes added
+    or replaced later go out as an appended segment, so only new rows are
+    copied. Each shard returns its local ``top_k``; the union contains the
+    global ``top_k`` with exactly the scores the single-process path computes.
+    """
+
+    def __init__(self, workers: int = 0, min_resumes: int = 0):
+        self.workers = workers
+        self.min_resumes = min_resumes
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+        # (shared memory, first position, array layout) per segment, in position order.
+        self._segments: list[tuple[SharedMemory, int, dict]] = []
+        self._dimensions: tuple[int, int] = (0, 0)
+        self._key: Hashable = None
+        self._generation: Hashable = None
+        self._positions: dict[str, int] = {}
+        self._rows = 0
+        self._publishes = 0
+        self._appends = 0
+        self._queries = 0
+
+    def enabled_for(self, count: int) -> bool:
+        return self.workers > 1 and count > 0 and count >= self.min_resumes
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned workers do not inherit the server's threads and locks.
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context("spawn"))
+        return self._pool
+
+    def start(self) -> None:
+        """Start the workers ahead of the first query."""
+        if self.workers > 1:
+            with self._lock:
+                pool = self._executor()
+            try:
+                for future in [pool.submit(_warm_up) for _ in range(self.workers)]:
+                    future.result()
+            except BrokenProcessPool as error:
+                self._discard_pool(error)
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self._positions
+
+    def is_current(self, key: Hashable, generation: Hashable) -> bool:
+        return bool(self._segments) and self._key == key and self._generation == generation
+
+    def can_append(self, key: Hashable) -> bool:
+        """Whether rows built under ``key`` may be appended instead of republishing everything."""
+        return (
+            bool(self._segments)
+            and self._key == key
+            and len(self._segments) < _MAX_SEGMENTS
+            and self._rows - len(self._positions) <= len(self._positions)
+        )
+
+    def discard(self, resume_ids: list[str]) -> None:
+        """Forget evicted or replaced resumes; their rows stay in place until the next full publish."""
+        with self._lock:
+            for resume_id in resume_ids:
+                self._positions.pop(resume_id, None)
+
+    def publish(
+        self,
+        key: Hashable,
+        generation: Hashable,
+        resume_ids: list[str],
+        vectors: csr_matrix,
+        skills: csr_matrix,
+        structure_quality: np.ndarray,
+        append: bool = False,
+    ) -> None:
+        """Publish rows built under ``key`` (models and taxonomy) as of store ``generation``.
+
+        With ``append`` the rows join the published ones, replacing any entry under the same id;
+        otherwise they replace everything.
+        """
+        values = {
+            "vector_data": vectors.data,
+            "vector_indices": vectors.indices,
+            "vector_indptr": vectors.indptr,
+            "skill_indices": skills.indices,
+            "skill_indptr": skills.indptr,
+            "structure_quality": structure_quality,
+        }
+        arrays = {}
+        size = 0
+        for name, dtype in _ARRAYS:
+            count = len(values[name])
+            arrays[name] = (size, count, dtype)
+            size += 8 * math.ceil(count * np.dtype(dtype).itemsize / 8)
+
+        shm = SharedMemory(create=True, size=max(size, 8))
+        for name, (offset, count, dtype) in arrays.items():
+            np.ndarray((count,), dtype=dtype, buffer=shm.buf, offset=offset)[:] = values[name]
+
+        with self._lock:
+            previous = []
+            if not append:
+                previous, self._segments = self._segments, []
+                self._positions = {}
+                self._rows = 0
+                self._publishes += 1
+            else:
+                self._appends += 1
+            self._segments.append((shm, self._rows, arrays))
+            self._positions.update(
+                (resume_id, self._rows + position) for position, resume_id in enumerate(resume_ids)
+            )
+            self._rows += len(resume_ids)
+            self._dimensions = (vectors.shape[1], skills.shape[1])
+            self._key = key
+            self._generation = generation
+        for segment, _, _ in previous:
+            # Workers still mapping an old segment keep it alive until they move on.
+            segment.close()
+            segment.unlink()
+
+    def score(
+        self,
+        resume_ids: list[str],
+        job_vector: csr_matrix,
+        job_skills: csr_matrix,
+        top_k: int | None,
+    ) -> tuple[np.ndarray, dict[str, np.ndarray]] | None:
+        """Rows of ``resume_ids`` that hold its ``top_k`` (ascending) and their unrounded details.
+
+        Returns ``None`` if a resume is not in the published rows.
+        """
+        with self._lock:
+            if not self._segments:
+                return None
+            try:
+                positions = np.fromiter(
+                    (self._positions[resume_id] for resume_id in resume_ids),
+                    dtype=np.int64,
+                    count=len(resume_ids),
+                )
+            except KeyError:
+                return None
+            segments = list(self._segments)
+            dimension, skill_count = self._dimensions
+            total_rows = self._rows
+            pool = self._executor()
+            self._queries += 1
+
+        live = tuple(shm.name for shm, _, _ in segments)
+        starts = np.array([start for _, start, _ in segments], dtype=np.int64)
+        # A shard never spans two segments: group rows by segment first, then by contiguous shard.
+        segment_of = np.searchsorted(starts, positions, side="right") - 1
+        shard_size = max(1, math.ceil(total_rows / self.workers))
+        group = segment_of * (self.workers + 1) + positions // shard_size
+        order = np.argsort(group, kind="stable")
+        bounds = np.flatnonzero(np.diff(group[order])) + 1
+        job = (np.asarray(job_vector.indices), np.asarray(job_vector.data))
+        job_columns = np.asarray(job_skills.indices, dtype=np.int32)
+
+        futures = []
+        for rows in np.split(order, bounds):
+            if not len(rows):
+                continue
+            shm, start, arrays = segments[segment_of[rows[0]]]
+            layout = {"arrays": arrays, "dimension": dimension, "skills": skill_count, "live": live}
+            future = pool.submit(_score_shard, shm.name, layout, positions[rows] - start, job, job_columns, top_k)
+            futures.append((rows, future))
+        kept_rows = []
+        kept_details = []
+        for rows, future in futures:
+            try:
+                selected, details = future.result()
+            except FileNotFoundError:
+                # A concurrent publish unlinked the segment before this shard attached.
+                return None
+            except BrokenProcessPool as error:
+                self._discard_pool(error)
+                return None
+            kept_rows.append(rows[selected])
+            kept_details.append(details)
+
+        rows = np.concatenate(kept_rows)
+        ascending = np.argsort(rows, kind="stable")
+        details = {
+            key: np.concatenate([item[key] for item in kept_details])[ascending]
+            for key in kept_details[0]
+        }
+        return rows[ascending], details
+
+    def _discard_pool(self, error: Exception) -> None:
+        # The caller falls back to single-process scoring; the next query starts a new pool.
+        logger.warning(f"Sharded scoring pool failed: {error}")
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+            segments, self._segments = self._segments, []
+            self._key = None
+            self._generation = None
+            self._positions = {}
+            self._rows = 0
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        for shm, _, _ in segments:
+            shm.close()
+            shm.unlink()
+
+    def status(self) -> dict:
+        return {
+            "workers": self.workers,
+            "min_resumes": self.min_resumes,
+            "published_resumes": len(self._positions),
+            "segments": len(self._segments),
+            "publishes": self._publishes,
+            "appends": self._appends,
+            "queries": self._queries,
+        }
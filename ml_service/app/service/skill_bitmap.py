@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+import numpy as np
+from fastapi import HTTPException
+
+from .skill_registry import SkillRegistry
+
+
+@dataclass
+class SkillFilter:
+    """Hard skill requirements applied before any scoring."""
+
+    require: list[str] = field(default_factory=list)
+    any_of: list[str] = field(default_factory=list)
+    exclude: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_values(
+        cls,
+        require: Iterable[str] | None = None,
+        any_of: Iterable[str] | None = None,
+        exclude: Iterable[str] | None = None,
+    ) -> SkillFilter:
+        # Accept repeated parameters as well as comma-separated values.
+        def split(values: Iterable[str] | None) -> list[str]:
+            return [
+                part.strip()
+                for value in values or []
+                for part in str(value or "").split(",")
+                if part.strip()
+            ]
+
+        return cls(require=split(require), any_of=split(any_of), exclude=split(exclude))
+
+    def is_empty(self) -> bool:
+        return not (self.require or self.any_of or self.exclude)
+
+
+def _word_count(skill_count: int) -> int:
+    return max(1, (skill_count + 63) // 64)
+
+
+def _encode(columns: Iterable[int], words: int) -> np.ndarray:
+    bits = np.zeros(words * 64, dtype=bool)
+    bits[list(columns)] = True
+    return np.packbits(bits, bitorder="little").view(np.uint64)
+
+
+def pack_skill_columns(rows: Iterable[Iterable[int]], skill_count: int) -> np.ndarray:
+    """Packed bitmaps (one uint64 row per item) in the layout used by SkillBitmapIndex."""
+    words = _word_count(skill_count)
+    return np.array([_encode(columns, words) for columns in rows], dtype=np.uint64).reshape(-1, words)
+
+
+class SkillBitmapIndex:
+    """Packed per-resume skill bitmaps for boolean skill filters.
+
+    Bit ``j`` of a row is taxonomy column ``j`` of the registry version the
+    index was built for. Rows are appended at ingest; a taxonomy reload makes
+    the index stale until ``rebuild`` is called with the new registry.
+    """
+
+    def __init__(self):
+        self.version: str | None = None
+        self._lock = threading.Lock()
+        self._positions: dict[str, int] = {}
+        self._words = 1
+        self._bits = np.zeros((64, 1), dtype=np.uint64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _reset(self, registry: SkillRegistry) -> None:
+        self.version = registry.version
+        self._positions = {}
+        self._words = _word_count(len(registry.skills))
+        self._bits = np.zeros((64, self._words), dtype=np.uint64)
+        self._size = 0
+
+    def _append(self, resume_id: str, columns: Iterable[int]) -> None:
+        if self._size == self._bits.shape[0]:
+            grown = np.zeros((max(64, self._size * 2), self._words), dtype=np.uint64)
+            grown[: self._size] = self._bits[: self._size]
+            self._bits = grown
+        position = self._positions.get(resume_id)
+        if position is None:
+            position = self._size
+            self._positions[resume_id] = position
+            self._size += 1
+        self._bits[position] = _encode(columns, self._words)
+
+    def is_current(self, registry: SkillRegistry) -> bool:
+        return self.version == registry.version
+
+    def add(self, resume_id: str, columns: Iterable[int], registry: SkillRegistry) -> None:
+        with self._lock:
+            if self.version is None:
+                self._reset(registry)
+            if self.version == registry.version:
+                self._append(resume_id, columns)
+
+    def discard(self, resume_ids: Iterable[str]) -> None:
+        """Forget resumes; their rows stay allocated until ``rebuild``."""
+        with self._lock:
+            for resume_id in resume_ids:
+                self._positions.pop(resume_id, None)
+
+    def garbage(self) -> int:
+        return self._size - len(self._positions)
+
+    def rebuild(self, registry: SkillRegistry, items: Iterable[tuple[str, Iterable[int]]]) -> None:
+        with self._lock:
+            self._reset(registry)
+            for resume_id, columns in items:
+                self._append(resume_id, columns)
+
+    def load(self, registry: SkillRegistry, resume_ids: list[str], bitmaps: np.ndarray) -> None:
+        """Replace the index with packed rows (``pack_skill_columns`` layout) for ``registry``."""
+        with self._lock:
+            self._reset(registry)
+            if bitmaps.shape[1] != self._words:
+                raise ValueError("Bitmaps were packed for a different taxonomy size.")
+            count = len(resume_ids)
+            self._bits = np.zeros((max(64, count), self._words), dtype=np.uint64)
+            self._bits[:count] = bitmaps
+            self._positions = {resume_id: position for position, resume_id in enumerate(resume_ids)}
+            self._size = count
+
+    def _mask(self, registry: SkillRegistry, skills: list[str]) -> np.ndarray:
+        unknown = [skill for skill in skills if registry.skill_column(skill) is None]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown skill(s) in filter: {', '.join(unknown)}.",
+            )
+        return _encode((registry.skill_column(skill) for skill in skills), self._words)
+
+    def matches(
+        self,
+        resume_ids: list[str],
+        skill_filter: SkillFilter,
+        registry: SkillRegistry,
+        columns_of: Callable[[int], Iterable[int]] | None = None,
+    ) -> np.ndarray:
+        """Boolean mask over ``resume_ids`` of the resumes that pass ``skill_filter``.
+
+        A resume missing from the index is encoded from ``columns_of(i)``, its
+        taxonomy columns; without ``columns_of`` it matches nothing.
+        """
+        with self._lock:
+            positions = [self._positions.get(resume_id) for resume_id in resume_ids]
+            rows = self._bits[[0 if position is None else position for position in positions]]
+        missing = [row for row, position in enumerate(positions) if position is None]
+        for row in missing:
+            rows[row] = _encode(columns_of(row) if columns_of is not None else (), self._words)
+
+        keep = np.ones(len(resume_ids), dtype=bool)
+        if skill_filter.require:
+            required = self._mask(registry, skill_filter.require)
+            keep &= ((rows & required) == required).all(axis=1)
+        if skill_filter.any_of:
+            keep &= (rows & self._mask(registry, skill_filter.any_of)).any(axis=1)
+        if skill_filter.exclude:
+            keep &= ~(rows & self._mask(registry, skill_filter.exclude)).any(axis=1)
+        if columns_of is None:
+            keep[missing] = False
+        return keep
@@ -1,62 +1,76 @@
 from __future__ import annotations
 
-import json
-import re
 from functools import lru_cache
-from pathlib import Path
 from typing import Iterable
 
-from ..config import settings
+import numpy as np
+from scipy.sparse import csr_matrix
 
+from .skill_matcher import SkillMatcher
+# Taxonomy loaders live with the registry; re-exported here for existing callers.
+from .skill_registry import get_skill_registry, load_all_skills, load_skills_map  # noqa: F401
 
-def _safe_boundary_pattern(skill: str) -> str:
-    escaped = re.escape(skill.strip().lower())
-    return rf"(?<!\w){escaped}(?!\w)"
 
-
-@lru_cache(maxsize=1)
-def load_skills_map(skills_path: Path | None = None) -> dict[str, list[str]]:
-    source_path = skills_path or settings.ats_skills_path
-    with Path(source_path).open("r", encoding="utf-8") as file:
-        payload = json.load(file)
-    return {str(key): [str(item) for item in value] for key, value in payload.items()}
-
-
-@lru_cache(maxsize=1)
-def load_all_skills() -> list[str]:
-    skills_map = load_skills_map()
-    seen: dict[str, str] = {}
-
-    for values in skills_map.values():
-        for value in values:
-            lowered = value.strip().lower()
-            if lowered and lowered not in seen:
-                seen[lowered] = value.strip()
-
-    return list(seen.values())
+@lru_cache(maxsize=32)
+def _compile_matcher(skill_candidates: tuple[str, ...]) -> SkillMatcher:
+    return SkillMatcher(skill_candidates)
 
 
 def extract_skills(text: str, skill_candidates: Iterable[str] | None = None) -> list[str]:
+    if skill_candidates is None:
+        return get_skill_registry().scan(text).skills
     normalized = str(text or "").lower()
-    candidates = list(skill_candidates) if skill_candidates is not None else load_all_skills()
-
-    found: list[str] = []
-    for skill in candidates:
-        if not skill:
-            continue
-        if re.search(_safe_boundary_pattern(skill), normalized):
-            found.append(skill)
-
-    ordered_unique: dict[str, str] = {}
-    for skill in found:
-        lowered = skill.lower()
-        if lowered not in ordered_unique:
-            ordered_unique[lowered] = skill
-    return list(ordered_unique.values())
+    return _compile_matcher(tuple(skill_candidates)).extract(normalized)
+
+
+def extract_skills_many(
+    texts: Iterable[str],
+    skill_candidates: Iterable[str] | None = None,
+) -> tuple[csr_matrix, list[str]]:
+    """Extract skills for many documents at once.
+
+    Returns a (documents x skills) 0/1 CSR matrix and the skill label of each
+    column. Row ``i`` holds exactly the skills ``extract_skills(texts[i])``
+    would return, in column order.
+    """
+    if skill_candidates is None:
+        registry = get_skill_registry()
+        return registry.incidence(registry.scan(text) for text in texts), list(registry.skills)
+
+    matcher = _compile_matcher(tuple(skill_candidates))
+    indptr = [0]
+    indices: list[int] = []
+    for text in texts:
+        indices.extend(matcher.find_columns(str(text or "").lower()))
+        indptr.append(len(indices))
+
+    matrix = csr_matrix(
+        (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int32), indptr),
+        shape=(len(indptr) - 1, len(matcher)),
+    )
+    return matrix, list(matcher.labels)
+
+
+def skill_presence(resume_skills: csr_matrix, job_skills: csr_matrix) -> tuple[np.ndarray, np.ndarray]:
+    """Return the job's skill columns and a (resumes x job skills) boolean presence matrix."""
+    job_columns = job_skills.indices
+    present = resume_skills[:, job_columns].toarray() > 0
+    return job_columns, present
+
+
+def missing_skills_many(
+    resume_skills: csr_matrix,
+    job_skills: csr_matrix,
+    skill_index: list[str],
+) -> list[list[str]]:
+    job_columns, present = skill_presence(resume_skills, job_skills)
+    return [
+        [skill_index[column] for column in job_columns[~row]]
+        for row in present
+    ]
 
 
 def missing_skills(resume_text: str, job_description: str) -> list[str]:
-    resume_skills = set(skill.lower() for skill in extract_skills(resume_text))
-    job_skills = extract_skills(job_description)
-    return [skill for skill in job_skills if skill.lower() not in resume_skills]
+    matrix, skill_index = extract_skills_many([resume_text, job_description])
+    return missing_skills_many(matrix[0], matrix[1], skill_index)[0]
 
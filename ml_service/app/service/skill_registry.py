@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+from loguru import logger
+from scipy.sparse import csr_matrix
+
+from ..config import settings
+from .skill_matcher import SkillMatcher
+
+
+# Canonical label -> aliases recognised by resume profile extraction.
+KNOWN_SKILLS: list[tuple[str, list[str]]] = [
+    ("JavaScript", ["javascript", "js"]),
+    ("TypeScript", ["typescript", "ts"]),
+    ("React", ["react", "react.js"]),
+    ("Node.js", ["node", "nodejs", "node.js"]),
+    ("Express.js", ["express", "expressjs", "express.js"]),
+    ("Python", ["python"]),
+    ("SQL", ["sql", "mysql", "postgresql", "postgres"]),
+    ("MongoDB", ["mongodb", "mongo"]),
+    ("HTML", ["html", "html5"]),
+    ("CSS", ["css", "css3"]),
+    ("AWS", ["aws", "amazon web services"]),
+    ("Docker", ["docker"]),
+    ("Kubernetes", ["kubernetes", "k8s"]),
+    ("Git", ["git", "github"]),
+    ("Machine Learning", ["machine learning", "ml"]),
+    ("Deep Learning", ["deep learning"]),
+    ("TensorFlow", ["tensorflow"]),
+    ("PyTorch", ["pytorch"]),
+    ("NLP", ["nlp", "natural language processing"]),
+    ("Data Analysis", ["data analysis", "analytics"]),
+    ("Scikit-learn", ["scikit-learn", "sklearn"]),
+    ("Pandas", ["pandas"]),
+    ("NumPy", ["numpy"]),
+    ("Power BI", ["power bi", "powerbi"]),
+    ("Tableau", ["tableau"]),
+    ("REST APIs", ["rest api", "restful", "apis"]),
+    ("C++", ["c++", "cpp"]),
+    ("Java", ["java"]),
+    ("C#", ["c#", ".net", "dotnet"]),
+]
+
+# Keyword -> career used by CareerPredictor when no trained model is available.
+CAREER_SKILL_KEYWORDS: dict[str, str] = {
+    "python": "Data Scientist",
+    "django": "Backend Developer",
+    "fastapi": "Backend Developer",
+    "nodejs": "Backend Developer",
+    "node": "Backend Developer",
+    "react": "Frontend Developer",
+    "vue": "Frontend Developer",
+    "angular": "Frontend Developer",
+    "typescript": "Frontend Developer",
+    "javascript": "Frontend Developer",
+    "aws": "DevOps Engineer",
+    "kubernetes": "DevOps Engineer",
+    "docker": "DevOps Engineer",
+    "terraform": "DevOps Engineer",
+    "sql": "Database Administrator",
+    "mongodb": "Backend Developer",
+    "postgresql": "Backend Developer",
+    "machine learning": "Data Scientist",
+    "tensorflow": "Data Scientist",
+    "pytorch": "Data Scientist",
+    "deep learning": "Data Scientist",
+    "nlp": "Data Scientist",
+    "java": "Backend Developer",
+    "c++": "Software Engineer",
+    "golang": "Backend Developer",
+    "rust": "Systems Engineer",
+    "product": "Product Manager",
+    "leadership": "Product Manager",
+    "management": "Project Manager",
+    "agile": "Project Manager",
+}
+
+# Role -> skill -> weight used to weakly label training rows (see train_models.py).
+ROLE_SKILL_WEIGHTS: dict[str, dict[str, float]] = {
+    "Data Scientist": {
+        "python": 2.0,
+        "machine learning": 3.0,
+        "tensorflow": 3.0,
+        "numpy": 3.0,
+        "pandas": 3.0,
+        "data analysis": 2.5,
+        "tableau": 2.0,
+        "power bi": 2.0,
+    },
+    "Backend Developer": {
+        "django": 3.0,
+        "flask": 2.8,
+        "node.js": 3.0,
+        "java": 2.4,
+        "sql": 2.0,
+        "git": 1.0,
+    },
+    "Frontend Developer": {
+        "react": 3.0,
+        "html": 2.5,
+        "css": 2.5,
+        "git": 1.0,
+    },
+    "DevOps Engineer": {
+        "docker": 3.0,
+        "kubernetes": 3.0,
+        "aws": 2.3,
+        "azure": 2.3,
+        "git": 1.6,
+    },
+    "Cloud Architect": {
+        "aws": 3.2,
+        "azure": 3.2,
+        "docker": 1.7,
+        "kubernetes": 1.7,
+    },
+    "Software Engineer": {
+        "c++": 2.0,
+        "java": 1.7,
+        "sql": 1.5,
+        "git": 1.0,
+    },
+}
+
+CAREER_HEURISTIC_TABLE = "career_heuristic"
+WEAK_LABEL_TABLE = "weak_label"
+
+
+def _term_key(term: str) -> str:
+    return str(term or "").strip().lower()
+
+
+def _default_role_tables() -> dict[str, dict[str, dict[str, float]]]:
+    weak_label: dict[str, dict[str, float]] = {}
+    for role, weights in ROLE_SKILL_WEIGHTS.items():
+        for term, weight in weights.items():
+            weak_label.setdefault(_term_key(term), {})[role] = weight
+
+    return {
+        CAREER_HEURISTIC_TABLE: {
+            _term_key(term): {career: 1.0} for term, career in CAREER_SKILL_KEYWORDS.items()
+        },
+        WEAK_LABEL_TABLE: weak_label,
+    }
+
+
+def _parse_skills_map(payload: bytes) -> dict[str, list[str]]:
+    data = json.loads(payload.decode("utf-8"))
+    return {str(key): [str(item) for item in value] for key, value in data.items()}
+
+
+def _flatten_skills_map(skills_map: dict[str, list[str]]) -> list[str]:
+    seen: dict[str, str] = {}
+
+    for values in skills_map.values():
+        for value in values:
+            lowered = value.strip().lower()
+            if lowered and lowered not in seen:
+                seen[lowered] = value.strip()
+
+    return list(seen.values())
+
+
+def load_skills_map(skills_path: Path | None = None) -> dict[str, list[str]]:
+    source_path = skills_path or settings.ats_skills_path
+    return _parse_skills_map(Path(source_path).read_bytes())
+
+
+def load_all_skills(skills_path: Path | None = None) -> list[str]:
+    """Taxonomy skills of ``skills_path``, or of the active registry when omitted."""
+    if skills_path is None:
+        return list(get_skill_registry().skills)
+    return _flatten_skills_map(load_skills_map(skills_path))
+
+
+@dataclass(frozen=True)
+class SkillScan:
+    """Result of scanning one document against a SkillRegistry."""
+
+    registry: SkillRegistry
+    counts: dict[int, int]
+
+    @property
+    def columns(self) -> list[int]:
+        """Taxonomy columns present in the document, in taxonomy order."""
+        taxonomy_size = len(self.registry.skills)
+        return sorted(column for column in self.counts if column < taxonomy_size)
+
+    @property
+    def skills(self) -> list[str]:
+        """Taxonomy skills present in the document, as ``extract_skills`` returns them."""
+        return [self.registry.skills[column] for column in self.columns]
+
+    @property
+    def known_skills(self) -> list[str]:
+        """Profile skill labels with at least one alias hit, in KNOWN_SKILLS order."""
+        label_indices: set[int] = set()
+        for column in self.counts:
+            label_indices.update(self.registry.known_labels_for_column(column))
+        return [self.registry.known_skill_labels[index] for index in sorted(label_indices)]
+
+    @property
+    def alias_hits(self) -> dict[str, int]:
+        """Occurrences of every matched term, keyed by its lowercased spelling."""
+        terms = self.registry.terms
+        return {_term_key(terms[column]): count for column, count in sorted(self.counts.items())}
+
+    def role_weights(self, table: str) -> dict[str, float]:
+        """Sum ``count * weight`` per role for the given role-weight table."""
+        totals: dict[str, float] = {}
+        for column, count in sorted(self.counts.items()):
+            for role, weight in self.registry.roles_for_column(table, column).items():
+                totals[role] = totals.get(role, 0.0) + count * weight
+        return totals
+
+
+class SkillRegistry:
+    """One compiled, alias-aware dictionary for every skill vocabulary.
+
+    Columns ``0..len(skills)-1`` of the underlying matcher are the skills.json
+    taxonomy in ``load_all_skills`` order; the remaining columns hold profile
+    aliases and role keywords. A single scan of a document therefore yields
+    taxonomy skills, profile skills, alias counts and role weights together.
+    """
+
+    def __init__(
+        self,
+        taxonomy: Iterable[str],
+        known_skills: list[tuple[str, list[str]]] = KNOWN_SKILLS,
+        role_tables: dict[str, dict[str, dict[str, float]]] | None = None,
+        version: str = "unversioned",
+        source_path: Path | None = None,
+        source_mtime_ns: int | None = None,
+    ):
+        self.version = version
+        self.source_path = source_path
+        self.source_mtime_ns = source_mtime_ns
+        self.loaded_at = time.time()
+
+        unique: dict[str, str] = {}
+        for skill in taxonomy:
+            key = _term_key(skill)
+            if key and key not in unique:
+                unique[key] = skill.strip()
+        self.skills: list[str] = list(unique.values())
+        self._skill_columns: dict[str, int] = {key: column for column, key in enumerate(unique)}
+        self.known_skill_labels: list[str] = [label for label, _ in known_skills]
+        self._role_tables = role_tables if role_tables is not None else _default_role_tables()
+
+        terms: list[str] = [*self.skills]
+        for _, aliases in known_skills:
+            terms.extend(aliases)
+        for table in self._role_tables.values():
+            terms.extend(table)
+        self._matcher = SkillMatcher(term.strip() for term in terms if _term_key(term))
+        self.terms: list[str] = self._matcher.labels
+
+        column_of = {_term_key(term): column for column, term in enumerate(self.terms)}
+        self._known_by_column: dict[int, tuple[int, ...]] = {}
+        for label_index, (_, aliases) in enumerate(known_skills):
+            for alias in aliases:
+                column = column_of.get(_term_key(alias))
+                if column is not None:
+                    self._known_by_column[column] = (*self._known_by_column.get(column, ()), label_index)
+
+        # Profile aliases ("k8s", "sklearn") resolve to the taxonomy skill of their label.
+        for label, aliases in known_skills:
+            label_column = self._skill_columns.get(_term_key(label))
+            if label_column is None:
+                continue
+            for alias in aliases:
+                self._skill_columns.setdefault(_term_key(alias), label_column)
+
+        self._roles_by_column: dict[str, dict[int, dict[str, float]]] = {
+            name: {column_of[term]: weights for term, weights in table.items() if term in column_of}
+            for name, table in self._role_tables.items()
+        }
+
+    def skill_column(self, name: str) -> int | None:
+        """Taxonomy column for a skill name or one of its profile aliases."""
+        return self._skill_columns.get(_term_key(name))
+
+    def known_labels_for_column(self, column: int) -> tuple[int, ...]:
+        return self._known_by_column.get(column, ())
+
+    def roles_for_column(self, table: str, column: int) -> dict[str, float]:
+        return self._roles_by_column.get(table, {}).get(column, {})
+
+    def term_role_weights(self, term: str, table: str) -> dict[str, float]:
+        """Exact (non-scanning) lookup for already tokenized input."""
+        return self._role_tables.get(table, {}).get(_term_key(term), {})
+
+    def scan(self, text: str) -> SkillScan:
+        return SkillScan(registry=self, counts=self._matcher.count_columns(str(text or "").lower()))
+
+    def incidence(self, scans: Iterable[SkillScan]) -> csr_matrix:
+        """Stack scans into a (documents x taxonomy skills) 0/1 CSR matrix."""
+        return self.columns_incidence(scan.columns for scan in scans)
+
+    def columns_incidence(self, rows: Iterable[Iterable[int]]) -> csr_matrix:
+        """Stack sorted taxonomy column lists (e.g. ``SkillScan.columns``) into a 0/1 CSR matrix."""
+        indptr = [0]
+        indices: list[int] = []
+        for columns in rows:
+            indices.extend(columns)
+            indptr.append(len(indices))
+
+        return csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int32), indptr),
+            shape=(len(indptr) - 1, len(self.skills)),
+        )
+
+    def status(self) -> dict:
+        return {
+            "version": self.version,
+            "source_path": str(self.source_path) if self.source_path else None,
+            "skills": len(self.skills),
+            "terms": len(self.terms),
+            "loaded_at": self.loaded_at,
+        }
+
+
+def build_skill_registry(skills_path: Path | None = None) -> SkillRegistry:
+    """Compile a registry from a skills.json file; the version is a hash of its content."""
+    source_path = Path(skills_path or settings.ats_skills_path)
+    mtime_ns = source_path.stat().st_mtime_ns
+    payload = source_path.read_bytes()
+    return SkillRegistry(
+        _flatten_skills_map(_parse_skills_map(payload)),
+        version=hashlib.sha256(payload).hexdigest()[:12],
+        source_path=source_path,
+        source_mtime_ns=mtime_ns,
+    )
+
+
+# Readers take a reference to the active registry without locking and keep
+# using it for the whole request; reloads compile a new registry first and
+# then swap the reference, so in-flight work never sees a mixed taxonomy.
+_ACTIVE_REGISTRY: SkillRegistry | None = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_skill_registry() -> SkillRegistry:
+    global _ACTIVE_REGISTRY
+
+    registry = _ACTIVE_REGISTRY
+    if registry is not None:
+        return registry
+
+    with _REGISTRY_LOCK:
+        if _ACTIVE_REGISTRY is None:
+            _ACTIVE_REGISTRY = build_skill_registry()
+        return _ACTIVE_REGISTRY
+
+
+def reload_skill_registry(skills_path: Path | None = None) -> SkillRegistry:
+    """Compile the taxonomy at ``skills_path`` and atomically make it active."""
+    global _ACTIVE_REGISTRY
+
+    with _REGISTRY_LOCK:
+        registry = build_skill_registry(skills_path)
+        _ACTIVE_REGISTRY = registry
+    return registry
+
+
+def refresh_skill_registry_if_changed() -> SkillRegistry:
+    """Reload the active registry's source file if its mtime has changed."""
+    current = get_skill_registry()
+    if current.source_path is None:
+        return current
+    try:
+        mtime_ns = current.source_path.stat().st_mtime_ns
+    except OSError:
+        return current
+    if mtime_ns == current.source_mtime_ns:
+        return current
+    return reload_skill_registry(current.source_path)
+
+
+async def watch_skill_registry(interval_seconds: float) -> None:
+    """Poll the taxonomy file and hot-swap the registry when it changes."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(refresh_skill_registry_if_changed)
+        except Exception as error:
+            # Keep serving the previous version until the file is valid again.
+            logger.warning(f"Skills taxonomy reload failed: {error}")
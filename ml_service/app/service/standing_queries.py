@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from fastapi import HTTPException
+
+from .skill_bitmap import SkillFilter
+
+
+@dataclass
+class StandingQuery:
+    """A job description whose top-k ranking is kept up to date as resumes arrive."""
+
+    query_id: str
+    job_description: str
+    top_k: int
+    skill_filter: SkillFilter
+    created_at: float = field(default_factory=time.time)
+    results: list[dict] = field(default_factory=list)
+    # (models version, taxonomy version) the results were ranked with.
+    fingerprint: tuple = ()
+    version: int = 0
+    updated_at: float = 0.0
+    stale: bool = True
+    error: str | None = None
+
+
+def merge_ranked(results: list[dict], incoming: list[dict], top_k: int) -> list[dict]:
+    """Top ``top_k`` of two rankings, where ``incoming`` was stored after every resume in ``results``.
+
+    Ties keep store order like ``top_rows``: current entries stay ahead of newer ones.
+    """
+    merged = sorted(results + incoming, key=lambda result: -result["ats_score"])[:top_k]
+    return [{**result, "rank": rank} for rank, result in enumerate(merged, start=1)]
+
+
+class StandingQueries:
+    """Process-local standing queries and the resumes they have yet to absorb.
+
+    The matcher reports added resumes (``note_added``) and changed or evicted
+    ones (``invalidate``); ``take_added`` hands the additions to the next
+    update. Results are replaced as a whole, so readers never see a half
+    merged ranking.
+    """
+
+    def __init__(self, max_queries: int = 500):
+        self.max_queries = max_queries
+        self._lock = threading.Lock()
+        self._queries: dict[str, StandingQuery] = {}
+        self._added: list[str] = []
+        self._merges = 0
+        self._rebuilds = 0
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def add(self, query: StandingQuery) -> None:
+        with self._lock:
+            if len(self._queries) >= self.max_queries:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"At most {self.max_queries} standing queries can be registered.",
+                )
+            self._queries[query.query_id] = query
+
+    def get(self, query_id: str) -> StandingQuery | None:
+        return self._queries.get(query_id)
+
+    def remove(self, query_id: str) -> bool:
+        with self._lock:
+            return self._queries.pop(query_id, None) is not None
+
+    def queries(self) -> list[StandingQuery]:
+        with self._lock:
+            return list(self._queries.values())
+
+    def note_added(self, resume_ids: Iterable[str]) -> None:
+        with self._lock:
+            if self._queries:
+                self._added.extend(resume_ids)
+
+    def take_added(self) -> list[str]:
+        with self._lock:
+            added, self._added = self._added, []
+        return added
+
+    def invalidate(self, resume_ids: Iterable[str] | None = None) -> None:
+        """Mark queries for a full re-rank: all of them, or those ranking any of ``resume_ids``."""
+        with self._lock:
+            if resume_ids is None:
+                for query in self._queries.values():
+                    query.stale = True
+                return
+            resume_ids = set(resume_ids)
+            for query in self._queries.values():
+                if any(result["resume_id"] in resume_ids for result in query.results):
+                    query.stale = True
+
+    def set_results(
+        self,
+        query: StandingQuery,
+        results: list[dict],
+        fingerprint: tuple,
+        error: str | None = None,
+    ) -> None:
+        with self._lock:
+            self._publish(query, results)
+            query.fingerprint = fingerprint
+            query.stale = False
+            query.error = error
+            self._rebuilds += 1
+
+    def merge(self, query: StandingQuery, incoming: list[dict]) -> None:
+        with self._lock:
+            known = {result["resume_id"] for result in query.results}
+            if any(result["resume_id"] in known for result in incoming):
+                # Already ranked under its old content: only a full re-rank places it right.
+                query.stale = True
+                return
+            self._publish(query, merge_ranked(query.results, incoming, query.top_k))
+            self._merges += 1
+
+    def _publish(self, query: StandingQuery, results: list[dict]) -> None:
+        if results != query.results:
+            query.results = results
+            query.version += 1
+        query.updated_at = time.time()
+
+    def snapshot(self, query_id: str) -> dict | None:
+        """The query and its current ranking, read consistently."""
+        with self._lock:
+            query = self._queries.get(query_id)
+            if query is None:
+                return None
+            return {
+                "query_id": query.query_id,
+                "job_description": query.job_description,
+                "top_k": query.top_k,
+                "require_skills": list(query.skill_filter.require),
+                "any_skills": list(query.skill_filter.any_of),
+                "exclude_skills": list(query.skill_filter.exclude),
+                "version": query.version,
+                "created_at": query.created_at,
+                "updated_at": query.updated_at,
+                "error": query.error,
+                "total_ranked": len(query.results),
+                "results": query.results,
+            }
+
+    def status(self) -> dict:
+        return {
+            "queries": len(self),
+            "max_queries": self.max_queries,
+            "pending_resumes": len(self._added),
+            "merges": self._merges,
+            "rebuilds": self._rebuilds,
+        }
@@ -0,0 +1,121 @@
+"""
+Report recall@k and latency of IVF candidate retrieval against exact ranking.
+
+Resumes from the dataset are loaded into the in-memory store (with shuffled,
+truncated variants up to ``--resumes``); every labelled ATS text is used as a
+job description. For each probes / min-candidates setting, the approximate
+top-k is compared with the exact top-k of ``match_and_rank``.
+
+Usage:
+  python benchmark_ann.py
+  python benchmark_ann.py --resumes 200000 --top-k 20 --probes 1 4 16 --min-candidates 0 4000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Repeated queries must be scored every time, not answered from the result cache.
+os.environ["ATS_RESULT_CACHE_ENABLED"] = "false"
+
+from app.config import settings  # noqa: E402
+from app.service import ats_matcher  # noqa: E402
+from app.service.ats_matcher import _load_training_data, add_resumes, match_and_rank  # noqa: E402
+from benchmark_similarity import load_resume_texts  # noqa: E402
+
+
+def build_store(dataset: Path, resumes: int, seed: int = 42) -> int:
+    texts = load_resume_texts(dataset)
+    rng = random.Random(seed)
+    files = []
+    for row in range(resumes):
+        words = texts[row % len(texts)].split()
+        if row >= len(texts):
+            rng.shuffle(words)
+            words = words[: rng.randint(max(1, len(words) // 2), len(words))]
+        files.append((f"resume-{row}.txt", " ".join(words)))
+    for start in range(0, len(files), 5000):
+        add_resumes(files[start:start + 5000])
+    return len(files)
+
+
+def benchmark(jobs: list[str], top_k: int, probes: list[int], min_candidates: list[int]) -> list[dict]:
+    sizes: list[int] = []
+    approximate_candidates = ats_matcher.approximate_candidates
+
+    def counted(*args, **kwargs):
+        rows = approximate_candidates(*args, **kwargs)
+        sizes.append(0 if rows is None else len(rows))
+        return rows
+
+    ats_matcher.approximate_candidates = counted
+    exact, exact_seconds = [], []
+    for job in jobs:
+        started = time.perf_counter()
+        exact.append({item["resume_id"] for item in match_and_rank(job, top_k=top_k, approximate=False)})
+        exact_seconds.append(time.perf_counter() - started)
+
+    # Train the index outside the timings.
+    match_and_rank(jobs[0], top_k=top_k, approximate=True)
+    results = []
+    for probe in probes:
+        for minimum in min_candidates:
+            ats_matcher._ANN_INDEX.probes = probe
+            ats_matcher._ANN_INDEX.min_candidates = minimum
+            sizes.clear()
+            recall, seconds = [], []
+            for job, expected in zip(jobs, exact):
+                started = time.perf_counter()
+                found = {item["resume_id"] for item in match_and_rank(job, top_k=top_k, approximate=True)}
+                seconds.append(time.perf_counter() - started)
+                recall.append(len(found & expected) / max(len(expected), 1))
+            results.append(
+                {
+                    "probes": probe,
+                    "min_candidates": minimum,
+                    "recall": float(np.mean(recall)),
+                    "min_recall": float(np.min(recall)),
+                    "candidates": float(np.mean(sizes)),
+                    "approximate_ms": float(np.median(seconds)) * 1000.0,
+                    "exact_ms": float(np.median(exact_seconds)) * 1000.0,
+                }
+            )
+    ats_matcher.approximate_candidates = approximate_candidates
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    default_dataset = Path(__file__).resolve().parent.parent / "students_resume_dataset.csv"
+    parser = argparse.ArgumentParser(description="Recall@k report for IVF candidate retrieval.")
+    parser.add_argument("--dataset", type=Path, default=default_dataset, help="Resume CSV to load.")
+    parser.add_argument("--resumes", type=int, default=50000, help="Store size, padded with variants of the dataset rows.")
+    parser.add_argument("--top-k", type=int, default=20, help="k of recall@k.")
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="Cells visited per query.")
+    parser.add_argument("--min-candidates", type=int, nargs="+", default=[0, 2000], help="Rows rescored at least.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    stored = build_store(args.dataset, args.resumes)
+    jobs, _ = _load_training_data(settings.ats_training_dataset_path)
+    print(f"IVF recall@{args.top_k} over {stored} resumes, {len(jobs)} job descriptions")
+    rows = benchmark(jobs, args.top_k, args.probes, args.min_candidates)
+    print(f"  index: {ats_matcher.get_ann_status()}")
+    for row in rows:
+        print(
+            f"  probes={row['probes']:<3} min_candidates={row['min_candidates']:<6} "
+            f"recall={row['recall']:.4f} (min {row['min_recall']:.2f})  "
+            f"candidates={row['candidates']:.0f}  "
+            f"approximate_ms={row['approximate_ms']:.1f}  exact_ms={row['exact_ms']:.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,133 @@
+"""
+Compare the dense LSA similarity mode with sparse TF-IDF cosine.
+
+Reports ranking agreement (Spearman rho and top-k overlap, on the raw
+similarity and on the full ATS score) and per-query latency of both modes.
+
+Usage:
+  python benchmark_similarity.py
+  python benchmark_similarity.py --components 256 --resumes 100000 --top-k 20
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import time
+from pathlib import Path
+
+import numpy as np
+from scipy.sparse import vstack
+from scipy.stats import spearmanr
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+
+from app.config import settings
+from app.models.ats_scorer import ATSScorer
+from app.service.ats_matcher import _load_training_data, get_models
+from app.service.skill_registry import get_skill_registry
+
+
+def load_resume_texts(dataset_path: Path) -> list[str]:
+    with dataset_path.open("r", encoding="utf-8", newline="") as file:
+        return [
+            " ".join(str(value) for key, value in row.items() if key != "Name" and value)
+            for row in csv.DictReader(file)
+        ]
+
+
+def top_k_overlap(left: np.ndarray, right: np.ndarray, top_k: int) -> float:
+    left_top = set(np.argsort(-left, kind="stable")[:top_k].tolist())
+    right_top = set(np.argsort(-right, kind="stable")[:top_k].tolist())
+    return len(left_top & right_top) / top_k
+
+
+def median_ms(samples: list[float]) -> float:
+    return float(np.median(samples)) * 1000.0
+
+
+def benchmark(dataset: Path, components: int, resumes: int, top_k: int) -> dict:
+    vectorizer, _ = get_models()
+    texts = load_resume_texts(dataset)
+    jobs, _ = _load_training_data(settings.ats_training_dataset_path)
+
+    corpus = normalize(vectorizer.transform(texts)).tocsr()
+    components = max(1, min(components, corpus.shape[0] - 1, corpus.shape[1] - 1))
+    lsa = TruncatedSVD(n_components=components, random_state=42).fit(corpus)
+    scorer = ATSScorer(vectorizer=vectorizer, lsa=lsa)
+
+    # Tile the corpus up to the requested store size.
+    repeats = max(1, -(-resumes // corpus.shape[0]))
+    sparse_rows = vstack([corpus] * repeats, format="csr")[:resumes]
+    dense_rows = ATSScorer.project(lsa, sparse_rows)
+    structure_quality = np.tile(
+        [ATSScorer.structure_quality(text) for text in texts], repeats
+    )[:resumes]
+    registry = get_skill_registry()
+    resume_skills = vstack(
+        [registry.incidence(registry.scan(text) for text in texts)] * repeats, format="csr"
+    )[:resumes]
+
+    rho, overlap, ats_overlap = [], [], []
+    sparse_seconds, dense_seconds = [], []
+    for job in jobs:
+        started = time.perf_counter()
+        sparse = scorer.similarity_many(None, job, sparse_rows)
+        sparse_seconds.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        dense = scorer.dense_similarity_many(dense_rows, job)
+        dense_seconds.append(time.perf_counter() - started)
+
+        coverage = ATSScorer.skill_coverage_many(resume_skills, registry.incidence([registry.scan(job)]))
+        if np.ptp(sparse) > 0 and np.ptp(dense) > 0:
+            rho.append(spearmanr(sparse, dense).statistic)
+        overlap.append(top_k_overlap(sparse, dense, top_k))
+        ats_overlap.append(
+            top_k_overlap(
+                ATSScorer.combine(sparse, coverage, structure_quality)["ats_score"],
+                ATSScorer.combine(dense, coverage, structure_quality)["ats_score"],
+                top_k,
+            )
+        )
+
+    return {
+        "resumes": sparse_rows.shape[0],
+        "queries": len(jobs),
+        "tfidf_features": sparse_rows.shape[1],
+        "lsa_components": components,
+        "spearman_rho": float(np.mean(rho)) if rho else float("nan"),
+        "similarity_overlap": float(np.mean(overlap)),
+        "ats_overlap": float(np.mean(ats_overlap)),
+        "sparse_ms": median_ms(sparse_seconds),
+        "dense_ms": median_ms(dense_seconds),
+        "sparse_bytes": sparse_rows.data.nbytes + sparse_rows.indices.nbytes + sparse_rows.indptr.nbytes,
+        "dense_bytes": dense_rows.nbytes,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    default_dataset = Path(__file__).resolve().parent.parent / "students_resume_dataset.csv"
+    parser = argparse.ArgumentParser(description="Benchmark dense LSA similarity against sparse TF-IDF cosine.")
+    parser.add_argument("--dataset", type=Path, default=default_dataset, help="Resume CSV to score.")
+    parser.add_argument("--components", type=int, default=256, help="LSA dimensions.")
+    parser.add_argument("--resumes", type=int, default=50000, help="Store size; the dataset is tiled up to it.")
+    parser.add_argument("--top-k", type=int, default=20, help="Cut-off for the top-k overlap.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    result = benchmark(args.dataset, args.components, args.resumes, args.top_k)
+    print("Similarity benchmark")
+    print(f"  resumes: {result['resumes']}  queries: {result['queries']}")
+    print(f"  tfidf_features: {result['tfidf_features']}  lsa_components: {result['lsa_components']}")
+    print(f"  spearman_rho: {result['spearman_rho']:.4f}")
+    print(f"  top{args.top_k}_overlap_similarity: {result['similarity_overlap']:.4f}")
+    print(f"  top{args.top_k}_overlap_ats: {result['ats_overlap']:.4f}")
+    print(f"  sparse_ms: {result['sparse_ms']:.2f}  dense_ms: {result['dense_ms']:.2f}")
+    print(f"  sparse_bytes: {result['sparse_bytes']}  dense_bytes: {result['dense_bytes']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
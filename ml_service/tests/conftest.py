@@ -0,0 +1,41 @@
+import os
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Tests import the service as ``app``, the way it runs from this directory.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("ATS_SNAPSHOT_ENABLED", "false")
+
+SKILL_WORDS = [
+    "Python", "Java", "SQL", "React", "Node.js", "Docker", "Kubernetes", "AWS", "TensorFlow",
+    "Pandas", "Tableau", "Flutter", "TypeScript", "MongoDB", "Terraform", "Power BI", "Excel",
+]
+FILLER_WORDS = [
+    "built", "designed", "maintained", "services", "dashboards", "pipelines", "team", "customers",
+    "reports", "tested", "deployed", "migrated", "analysis", "models", "features", "latency",
+]
+
+
+def resume_text(rng: random.Random) -> str:
+    skills = rng.sample(SKILL_WORDS, rng.randint(2, 7))
+    summary = " ".join(rng.choice(FILLER_WORDS) for _ in range(rng.randint(15, 60)))
+    return (
+        f"Experience\n{rng.randint(0, 12)} years of experience. {summary}\n"
+        f"Skills: {', '.join(skills)}\n"
+        "Education\nB.Sc. Computer Science\n"
+    )
+
+
+@pytest.fixture
+def make_resumes():
+    """Store ``count`` generated resumes and return their ids."""
+    from app.service import ats_matcher
+
+    def make(count: int, prefix: str, seed: int = 0) -> list[str]:
+        rng = random.Random(seed)
+        return ats_matcher.add_resumes((f"{prefix}-{i}.txt", resume_text(rng)) for i in range(count))
+
+    return make
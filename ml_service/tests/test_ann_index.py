@@ -0,0 +1,51 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse import random as sparse_random
+from sklearn.preprocessing import normalize
+
+from app.service.ann_index import IVFIndex
+
+
+def _clustered_rows(count: int, topics: int, seed: int) -> csr_matrix:
+    rng = np.random.default_rng(seed)
+    centers = sparse_random(topics, 400, density=0.05, format="csr", random_state=seed)
+    noise = sparse_random(count, 400, density=0.01, format="csr", random_state=seed + 1)
+    return normalize(csr_matrix(centers[rng.integers(0, topics, count)] + 0.3 * noise))
+
+
+def test_recall_against_brute_force_at_a_fixed_seed():
+    vectors = _clustered_rows(2000, 20, seed=5)
+    ids = [f"r{row}" for row in range(2000)]
+    index = IVFIndex(lists=20, probes=3, min_candidates=100, seed=42)
+    index.rebuild("v1", zip(ids, vectors))
+
+    recalls = []
+    for query in range(25):
+        job = vectors[query * 37]
+        truth = np.argsort(-(vectors @ job.T).toarray().ravel(), kind="stable")[:10]
+        candidates = index.candidates(ids, job)
+        recalls.append(np.isin(truth, candidates).mean())
+        assert len(candidates) < len(ids)
+    assert np.mean(recalls) >= 0.95
+
+
+def test_every_row_is_a_candidate_when_every_cell_is_probed():
+    vectors = _clustered_rows(300, 6, seed=6)
+    ids = [f"r{row}" for row in range(300)]
+    index = IVFIndex(lists=6, probes=6, min_candidates=1, seed=42)
+    index.rebuild("v1", zip(ids, vectors))
+
+    assert index.candidates(ids[::2], vectors[0]).tolist() == list(range(150))
+
+
+def test_unindexed_or_repeated_ids_fall_back_to_none():
+    vectors = _clustered_rows(100, 4, seed=7)
+    ids = [f"r{row}" for row in range(100)]
+    index = IVFIndex(lists=4, probes=1, min_candidates=1, seed=42)
+
+    assert index.candidates(ids, vectors[0]) is None
+    index.rebuild("v1", zip(ids, vectors))
+    index.discard(["r3"])
+    assert index.candidates(ids, vectors[0]) is None
+    assert index.candidates(ids[:2] + ids[:1], vectors[0]) is None
+    assert index.candidates(ids[4:], vectors[0]) is not None
@@ -0,0 +1,174 @@
+import dataclasses
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.service import ats_matcher
+from app.service.skill_registry import SkillRegistry
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def test_predict_finds_multi_word_skills_split_by_spacing_or_line_breaks(client, monkeypatch):
+    async def no_jobs(**kwargs):
+        return []
+
+    monkeypatch.setattr(main.job_fetcher, "search_jobs", no_jobs)
+    monkeypatch.setattr(main.db, "create_prediction", lambda **kwargs: None)
+    text = (
+        "Jane Doe\n"
+        "Experience\n"
+        "Data Analyst at Acme Corp. Built machine   learning models and Power\n"
+        "BI dashboards for the sales team.\n"
+        "Education\n"
+        "B.Sc. Computer Science, State University\n"
+    )
+
+    response = client.post("/predict", files={"file": ("resume.txt", text.encode(), "text/plain")})
+
+    assert response.status_code == 200
+    skills = response.json()["extracted_skills"]
+    assert "Machine Learning" in skills
+    assert "Power BI" in skills
+
+
+def test_upload_links_replaces_or_keeps_near_duplicates(client):
+    text = (
+        "Marine biologist surveying coral reefs, logging sonar transects and publishing reef health reports.\n"
+        "Skills: Python, SQL, Tableau\n"
+    )
+
+    def upload(body: str, on_duplicate: str) -> dict:
+        response = client.post(
+            "/upload-resumes",
+            files=[("resumes", ("reef.txt", body.encode(), "text/plain"))],
+            data={"on_duplicate": on_duplicate},
+        )
+        assert response.status_code == 200
+        return response.json()["resumes"][0]
+
+    original = upload(text, "link")
+    assert original["action"] == "added"
+
+    linked = upload(text + "Diving instructor.\n", "link")
+    assert (linked["action"], linked["resume_id"]) == ("linked", original["resume_id"])
+
+    replaced = upload(text + "Diving instructor.\n", "replace")
+    assert (replaced["action"], replaced["resume_id"]) == ("replaced", original["resume_id"])
+    assert "Diving instructor" in ats_matcher.get_resumes([original["resume_id"]])[0].text
+
+    kept = upload(text, "keep")
+    assert kept["action"] == "added" and kept["duplicate_of"] == original["resume_id"]
+    assert kept["resume_id"] != original["resume_id"]
+
+
+def test_upload_stores_new_files_in_one_batch_and_links_duplicates_within_it(client, monkeypatch):
+    batches = []
+    add_resumes = ats_matcher.add_resumes
+
+    def spy(files):
+        files = list(files)
+        batches.append(len(files))
+        return add_resumes(files)
+
+    monkeypatch.setattr(ats_matcher, "add_resumes", spy)
+    glacier = (
+        "Glaciologist drilling ice cores in Greenland and modelling meltwater runoff for climate reports.\n"
+        "Skills: Python, SQL, Pandas\n"
+    )
+    bakery = (
+        "Pastry chef running a sourdough bakery, costing recipes and training apprentices every season.\n"
+        "Skills: Excel, Power BI\n"
+    )
+    files = [
+        ("resumes", ("glacier.txt", glacier.encode(), "text/plain")),
+        ("resumes", ("glacier-copy.txt", (glacier + "Field season lead.\n").encode(), "text/plain")),
+        ("resumes", ("bakery.txt", bakery.encode(), "text/plain")),
+    ]
+
+    response = client.post("/upload-resumes", files=files, data={"on_duplicate": "link"})
+
+    assert response.status_code == 200
+    resumes = response.json()["resumes"]
+    assert [item["action"] for item in resumes] == ["added", "linked", "added"]
+    assert resumes[1]["resume_id"] == resumes[1]["duplicate_of"] == resumes[0]["resume_id"]
+    assert batches == [2]
+
+
+def test_predict_scans_the_resume_once(client, monkeypatch):
+    async def no_jobs(**kwargs):
+        return []
+
+    monkeypatch.setattr(main.job_fetcher, "search_jobs", no_jobs)
+    monkeypatch.setattr(main.db, "create_prediction", lambda **kwargs: None)
+    scanned = []
+    scan = SkillRegistry.scan
+
+    def spy(registry, text):
+        scanned.append(text)
+        return scan(registry, text)
+
+    monkeypatch.setattr(SkillRegistry, "scan", spy)
+    text = "Experience\nBuilt Docker and Kubernetes platforms on AWS.\nEducation\nB.Sc. Computer Science\n"
+
+    response = client.post(
+        "/predict",
+        files={"file": ("resume.txt", text.encode(), "text/plain")},
+        data={"job_description": "Platform engineer with Docker and Terraform."},
+    )
+
+    assert response.status_code == 200
+    assert sum("Kubernetes" in item for item in scanned) == 1
+    assert {"Docker", "Kubernetes"} <= set(response.json()["extracted_skills"])
+
+
+def test_match_batch_ranks_each_job_like_match_and_rank(client, make_resumes):
+    resume_ids = make_resumes(20, "batch", seed=17)
+    jobs = [
+        "Data analyst with SQL, Pandas and Tableau reporting experience.",
+        "Cloud engineer running Docker and Kubernetes services on AWS.",
+        "Mobile developer shipping Flutter apps with a MongoDB backend.",
+    ]
+    # A nightly run over a few hundred requisitions fits in one request.
+    jobs += [f"{jobs[position % 3]} Requisition {position}." for position in range(297)]
+
+    response = client.post("/match/batch", json={"job_descriptions": jobs, "resume_ids": resume_ids, "top_k": 5})
+
+    assert response.status_code == 200
+    rankings = response.json()["rankings"]
+    assert len(rankings) == 300
+    for position in (0, 1, 2, 150, 299):
+        ats_matcher._RESULT_CACHE.clear()
+        expected = ats_matcher.match_and_rank(jobs[position], resume_ids=resume_ids, top_k=5)
+        assert rankings[position]["results"] == expected
+
+
+def test_rank_top_k_is_the_head_of_the_full_ranking(client, make_resumes):
+    make_resumes(40, "top-k", seed=20)
+    job = "Backend engineer with Java, SQL and Docker experience building services."
+
+    full = client.get("/rank", params={"job_description": job}).json()["results"]
+
+    for top_k in (1, 7, 25):
+        response = client.get("/rank", params={"job_description": job, "top_k": top_k})
+        assert response.json()["results"] == full[:top_k]
+
+
+def test_streamed_rank_is_a_header_line_then_one_line_per_result(client, make_resumes, monkeypatch):
+    resume_ids = make_resumes(15, "stream", seed=23)
+    monkeypatch.setattr(main, "settings", dataclasses.replace(main.settings, ats_stream_chunk_size=4))
+    body = {"job_description": "Data engineer with Python, SQL and AWS pipelines.", "resume_ids": resume_ids}
+
+    response = client.post("/match", json=body, headers={"accept": "application/x-ndjson"})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    header, results = lines[0], lines[1:]
+    assert header["total_matched"] == len(results) == 15
+    assert results == client.post("/match", json=body).json()["results"]
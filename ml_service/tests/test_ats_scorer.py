@@ -0,0 +1,62 @@
+import time
+from dataclasses import replace
+
+from app.models.ats_scorer import ATSScorer
+from app.service import ats_matcher
+from app.service.skill_extractor import extract_skills, missing_skills
+
+JOBS = [
+    "Backend engineer with Python, SQL, Docker and AWS experience building data pipelines.",
+    "Frontend developer with React, TypeScript and Node.js experience building dashboards.",
+    "Data analyst reporting in Excel, Power BI and Tableau for the sales team.",
+]
+
+
+def _per_resume_ranking(job_description: str, resume_ids: list[str]) -> list[dict]:
+    # The scoring path before batching: one ATSScorer.score call per resume, then a stable sort.
+    vectorizer, _ = ats_matcher.get_models()
+    scorer = ATSScorer(vectorizer=vectorizer)
+    results = []
+    for resume in ats_matcher.get_resumes(resume_ids):
+        details = scorer.score(resume.text, job_description=job_description, return_details=True)
+        results.append(
+            {
+                "resume_id": resume.resume_id,
+                "filename": resume.filename,
+                "ats_score": details["ats_score"],
+                "predicted_category": ats_matcher.predict_category(resume.text),
+                "extracted_skills": extract_skills(resume.text),
+                "missing_skills": missing_skills(resume.text, job_description),
+                "score_breakdown": {
+                    "tfidf_similarity": details["tfidf_similarity"],
+                    "skill_coverage": details["skill_coverage"],
+                    "structure_quality": details["structure_quality"],
+                },
+            }
+        )
+    results.sort(key=lambda item: item["ats_score"], reverse=True)
+    return [{**result, "rank": rank} for rank, result in enumerate(results, start=1)]
+
+
+def test_batch_scoring_ranks_like_per_resume_scoring(make_resumes):
+    resume_ids = make_resumes(60, "scorer", seed=18)
+
+    for job_description in JOBS:
+        ats_matcher._RESULT_CACHE.clear()
+        assert ats_matcher.match_and_rank(job_description, resume_ids=resume_ids) == _per_resume_ranking(
+            job_description, resume_ids
+        )
+
+
+def test_passed_deadline_scores_one_chunk_and_marks_the_ranking_partial(make_resumes, monkeypatch):
+    resume_ids = make_resumes(10, "deadline", seed=29)
+    monkeypatch.setattr(ats_matcher, "settings", replace(ats_matcher.settings, ats_deadline_chunk_size=4))
+
+    ranking = ats_matcher.match_and_rank_stream(JOBS[0], resume_ids, deadline=time.monotonic() - 1)
+
+    assert ranking.partial
+    assert (ranking.scored, ranking.unscored) == (4, 6)
+    assert ranking.total == 4
+    results = [result for chunk in ranking.chunks() for result in chunk]
+    assert {result["resume_id"] for result in results} < set(resume_ids)
+    assert len(results) == 4
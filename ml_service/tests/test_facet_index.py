@@ -0,0 +1,84 @@
+import pytest
+from fastapi import HTTPException
+
+from app.service import ats_matcher
+from app.service.facet_index import FacetFilter, FacetIndex
+
+JOB = "Data analyst with SQL, Pandas, Tableau and Excel reporting experience."
+
+
+@pytest.fixture
+def index():
+    facets = FacetIndex()
+    for resume_id, category, years in [
+        ("a", "Data Science", 2),
+        ("b", "DevOps", 7),
+        ("c", "Data Science", 5),
+        ("d", "Web Development", 0),
+    ]:
+        facets.add(resume_id, category, years, "v1")
+    return facets
+
+
+def test_filters_on_category_and_experience_range(index):
+    ids = ["a", "b", "c", "d"]
+
+    assert index.matches(ids, FacetFilter.from_values(["data science"])).tolist() == [True, False, True, False]
+    assert index.matches(ids, FacetFilter.from_values(None, 2, 5)).tolist() == [True, False, True, False]
+    assert index.matches(ids, FacetFilter.from_values(["DevOps,Web Development"], 1)).tolist() == [
+        False, True, False, False,
+    ]
+    assert index.category_counts(ids) == {"Data Science": 2, "DevOps": 1, "Web Development": 1}
+
+
+def test_unindexed_and_discarded_ids_are_skipped(index):
+    index.discard(["c"])
+    ids = ["a", "missing", "c", "b"]
+
+    assert index.matches(ids, FacetFilter.from_values(None, 0)).tolist() == [True, False, False, True]
+    assert index.category_counts(ids) == {"Data Science": 1, "DevOps": 1}
+    assert FacetIndex().category_counts(["a"]) == {}
+
+
+def test_unindexed_ids_fall_back_to_their_own_facets(index):
+    ids = ["a", "new", "b", "other"]
+    own = {1: ("devops", 9), 3: ("AI", 1)}
+
+    assert index.matches(ids, FacetFilter.from_values(["DevOps"], 5), own.get).tolist() == [False, True, True, False]
+    assert index.category_counts(ids, own.get) == {"Data Science": 1, "DevOps": 1, "devops": 1, "AI": 1}
+    assert FacetFilter.from_values(["devops"], 5).accepts("DevOps", 9)
+
+
+def test_rejects_inverted_experience_range():
+    with pytest.raises(HTTPException) as error:
+        FacetFilter.from_values(None, 6, 3)
+    assert error.value.status_code == 400
+
+
+def test_ranking_keeps_only_resumes_in_the_experience_range(make_resumes):
+    resume_ids = make_resumes(40, "facets", seed=3)
+    ats_matcher._RESULT_CACHE.clear()
+
+    page = ats_matcher.match_and_rank_page(
+        JOB,
+        resume_ids=resume_ids,
+        facet_filter=FacetFilter.from_values(None, 3, 6),
+    )
+
+    years = {record.resume_id: record.features.experience_years for record in ats_matcher.get_resumes(resume_ids)}
+    ranked = [result["resume_id"] for chunk in page.chunks() for result in chunk]
+    assert sorted(ranked) == sorted(resume_id for resume_id, value in years.items() if 3 <= value <= 6)
+    assert sum(page.ranking.facets.values()) == len(ranked)
+
+
+def test_resumes_missing_from_the_index_are_still_filtered_on_their_features(make_resumes):
+    resume_ids = make_resumes(10, "facets-missing", seed=16)
+    resumes = ats_matcher.get_resumes(resume_ids)
+    registry = ats_matcher.get_skill_registry()
+    facet_filter = FacetFilter.from_values(None, 0)
+    ats_matcher._FACETS.discard(resume_ids[:3])
+
+    kept = ats_matcher.filter_by_facets(resumes, facet_filter, registry)
+
+    assert [resume.resume_id for resume in kept] == resume_ids
+    assert sum(ats_matcher.category_facets(resumes, registry).values()) == 10
@@ -0,0 +1,39 @@
+import numpy as np
+from scipy.sparse import random as sparse_random
+from sklearn.preprocessing import normalize
+
+from app.service import ats_matcher
+from app.service.inverted_index import InvertedIndex
+
+JOB = "Machine learning engineer with Python, TensorFlow, Pandas and SQL experience deploying models."
+
+
+def test_candidates_always_contain_the_brute_force_top_k():
+    vectors = normalize(sparse_random(400, 300, density=0.03, format="csr", random_state=4))
+    ids = [f"r{row}" for row in range(400)]
+    index = InvertedIndex()
+    index.rebuild("v1", zip(ids, vectors))
+    rng = np.random.default_rng(4)
+
+    for trial in range(20):
+        job = normalize(sparse_random(1, 300, density=0.05, format="csr", random_state=trial))
+        base = np.round(rng.random(400) * 0.5, 2)
+        # Ranked like the matcher: by the 0-100 ATS score rounded to two decimals.
+        scores = np.round(100 * (0.5 * (vectors @ job.T).toarray().ravel() + base), 2)
+        for top_k in (1, 10, 60):
+            candidates = index.top_candidates(ids, job, base, top_k)
+            expected = np.argsort(-scores, kind="stable")[:top_k]
+            assert set(expected.tolist()) <= set(candidates.tolist())
+
+    assert index.top_candidates(ids + ["unindexed"], job, np.append(base, 0.0), 5) is None
+    assert index.top_candidates(ids + ids[:1], job, np.append(base, 0.0), 5) is None
+
+
+def test_pruned_top_k_equals_the_full_ranking(make_resumes):
+    resume_ids = make_resumes(150, "pruning", seed=9)
+    ats_matcher._RESULT_CACHE.clear()
+    full = ats_matcher.match_and_rank(JOB, resume_ids=resume_ids)
+
+    for top_k in (1, 5, 40):
+        ats_matcher._RESULT_CACHE.clear()
+        assert ats_matcher.match_and_rank(JOB, resume_ids=resume_ids, top_k=top_k) == full[:top_k]
@@ -0,0 +1,38 @@
+import dataclasses
+
+import pytest
+from fastapi import HTTPException
+from scipy.sparse import vstack
+
+from app.models.ats_scorer import ATSScorer
+from app.service import ats_matcher
+
+JOB = "Data scientist with Python, TensorFlow and Pandas experience building models."
+
+
+def test_lsa_mode_is_rejected_while_disabled(make_resumes):
+    resume_ids = make_resumes(5, "lsa-off", seed=21)
+
+    with pytest.raises(HTTPException) as error:
+        ats_matcher.match_and_rank(JOB, resume_ids=resume_ids, similarity="lsa")
+    assert error.value.status_code == 400
+
+
+def test_lsa_mode_ranks_on_the_dense_cosine(make_resumes, monkeypatch, tmp_path):
+    settings = dataclasses.replace(ats_matcher.settings, ats_lsa_components=16, ats_lsa_path=tmp_path / "lsa.pkl")
+    monkeypatch.setattr(ats_matcher, "settings", settings)
+    resume_ids = make_resumes(30, "lsa-on", seed=22)
+    ats_matcher._RESULT_CACHE.clear()
+
+    results = ats_matcher.match_and_rank(JOB, resume_ids=resume_ids, similarity="lsa")
+
+    vectorizer, _ = ats_matcher.get_models()
+    lsa, _ = ats_matcher.get_lsa()
+    records = {record.resume_id: record for record in ats_matcher.get_resumes(resume_ids)}
+    dense = ATSScorer.project(lsa, vstack([record.features.vector for record in records.values()]))
+    similarity = dict(zip(records, ATSScorer(vectorizer, lsa).dense_similarity_many(dense, JOB)))
+    assert len(results) == 30
+    for result in results:
+        assert result["score_breakdown"]["tfidf_similarity"] == round(similarity[result["resume_id"]] * 100, 2)
+    scores = [result["ats_score"] for result in results]
+    assert scores == sorted(scores, reverse=True)
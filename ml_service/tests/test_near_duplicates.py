@@ -0,0 +1,26 @@
+from app.service.near_duplicates import MinHashLSH
+
+BASE = (
+    "Senior data engineer who built streaming pipelines with Kafka and Spark, "
+    "maintained the warehouse in Snowflake and mentored a team of five analysts."
+)
+
+
+def test_finds_near_duplicates_but_not_unrelated_resumes():
+    index = MinHashLSH(threshold=0.7)
+    index.add("base", BASE)
+    index.add("other", "Pastry chef running a bakery kitchen, ordering flour and training apprentices.")
+
+    match = index.find(BASE + " Certified in AWS.")
+    assert match is not None and match[0] == "base" and match[1] >= 0.7
+    assert index.find("Nurse on a cardiology ward coordinating patient care plans.") is None
+    assert index.find("   ") is None
+
+
+def test_discarded_resumes_are_no_longer_found():
+    index = MinHashLSH(threshold=0.7)
+    index.add("base", BASE)
+    index.discard(["base", "missing"])
+
+    assert len(index) == 0
+    assert index.find(BASE) is None
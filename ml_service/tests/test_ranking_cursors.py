@@ -0,0 +1,77 @@
+import pytest
+from fastapi import HTTPException
+
+from app.service import ats_matcher, ranking_cursors
+from app.service.ranking_cursors import RankingCursors, decode_cursor, encode_cursor
+
+JOB = "Frontend developer with React, TypeScript and Node.js experience building dashboards."
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ranking_cursors.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    assert decode_cursor(encode_cursor("token", 40)) == ("token", 40)
+
+    for cursor in ("not a cursor", encode_cursor("token", -1)):
+        with pytest.raises(HTTPException) as error:
+            decode_cursor(cursor)
+        assert error.value.status_code == 400
+
+
+def test_reads_renew_the_ttl_until_it_lapses(clock):
+    cursors = RankingCursors(ttl_seconds=60, max_bytes=1000)
+    token = cursors.open("ranking", "request", 10)
+
+    clock[0] += 50
+    assert cursors.resolve(encode_cursor(token, 5), "request") == (token, "ranking", 5)
+    clock[0] += 50
+    assert cursors.resolve(encode_cursor(token, 10), "request")[1] == "ranking"
+
+    with pytest.raises(HTTPException) as error:
+        cursors.resolve(encode_cursor(token, 10), "another request")
+    assert error.value.status_code == 400
+
+    clock[0] += 61
+    with pytest.raises(HTTPException) as error:
+        cursors.resolve(encode_cursor(token, 10), "request")
+    assert error.value.status_code == 404
+    assert cursors.status()["expired"] == 1
+
+
+def test_least_recently_read_rankings_leave_first(clock):
+    cursors = RankingCursors(ttl_seconds=60, max_bytes=25)
+    first = cursors.open("first", "request", 10)
+    second = cursors.open("second", "request", 10)
+    cursors.resolve(encode_cursor(first, 0), "request")
+    cursors.open("third", "request", 10)
+
+    assert cursors.resolve(encode_cursor(first, 0), "request")[1] == "first"
+    with pytest.raises(HTTPException):
+        cursors.resolve(encode_cursor(second, 0), "request")
+    assert cursors.open("too large", "request", 26) is None
+
+
+def test_pages_read_the_first_pages_ranking(make_resumes):
+    resume_ids = make_resumes(25, "cursor", seed=11)
+    ats_matcher._RESULT_CACHE.clear()
+    expected = ats_matcher.match_and_rank(JOB, resume_ids=resume_ids)
+
+    pages, cursor = [], None
+    while True:
+        page = ats_matcher.match_and_rank_page(JOB, resume_ids=resume_ids, limit=10, cursor=cursor)
+        pages.extend(result for chunk in page.chunks() for result in chunk)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+        # Later pages come from the kept ranking, so a replaced resume does not reorder them.
+        ats_matcher.replace_resume(resume_ids[-1], "replaced.txt", JOB)
+
+    assert pages == expected
+    with pytest.raises(HTTPException) as error:
+        ats_matcher.match_and_rank_page(JOB, resume_ids=resume_ids, top_k=5, cursor=cursor)
+    assert error.value.status_code == 400
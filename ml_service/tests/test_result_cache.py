@@ -0,0 +1,56 @@
+import asyncio
+import threading
+import time
+
+from app.service.result_cache import ResultCache
+
+
+def test_hit_after_the_leader_finishes_and_lru_budget():
+    cache = ResultCache(max_bytes=10)
+    assert cache.begin("a") == (None, True)
+    cache.finish("a", "ranking-a", 6)
+    assert cache.begin("a") == ("ranking-a", False)
+
+    cache.begin("b")
+    cache.finish("b", "ranking-b", 6)
+    assert cache.begin("a") == (None, True)
+    assert cache.status()["evictions"] == 1
+
+
+def test_waiters_share_the_leaders_result():
+    cache = ResultCache(max_bytes=100)
+    assert cache.begin("job") == (None, True)
+    results = []
+    waiters = [threading.Thread(target=lambda: results.append(cache.begin("job", 5))) for _ in range(3)]
+    for waiter in waiters:
+        waiter.start()
+    time.sleep(0.05)
+    cache.finish("job", "ranking", 7)
+    for waiter in waiters:
+        waiter.join()
+
+    assert results == [("ranking", False)] * 3
+    assert cache.status()["shared"] == 3
+
+
+def test_waiter_gives_up_after_its_timeout():
+    cache = ResultCache(max_bytes=100)
+    cache.begin("job")
+
+    started = time.monotonic()
+    assert cache.begin("job", 0.05) == (None, False)
+    assert time.monotonic() - started < 1
+
+
+def test_never_waits_on_the_event_loop():
+    cache = ResultCache(max_bytes=100)
+    cache.begin("job")
+
+    async def request():
+        started = time.monotonic()
+        outcome = cache.begin("job", 30)
+        return outcome, time.monotonic() - started
+
+    outcome, waited = asyncio.run(request())
+    assert outcome == (None, False)
+    assert waited < 1
@@ -0,0 +1,51 @@
+import pytest
+from fastapi import HTTPException
+
+from app.service import ats_matcher
+from app.service.ats_matcher import RESULT_FIELDS, result_fields
+
+JOB = "Frontend developer with React, TypeScript and Node.js experience."
+
+
+def test_parses_repeated_and_comma_separated_fields():
+    assert result_fields(None) is None
+    assert result_fields(["resume_id, ats_score", "rank"]) == {"resume_id", "ats_score", "rank"}
+    with pytest.raises(HTTPException) as error:
+        result_fields(["resume_id", "salary"])
+    assert error.value.status_code == 400
+
+
+def test_projection_returns_the_same_values_as_the_full_result(make_resumes):
+    resume_ids = make_resumes(25, "fields", seed=11)
+    ats_matcher._RESULT_CACHE.clear()
+    full = ats_matcher.match_and_rank(JOB, resume_ids=resume_ids, top_k=10)
+    page = ats_matcher.match_and_rank_page(JOB, resume_ids=resume_ids, top_k=10)
+
+    projected = [result for chunk in page.chunks(fields=frozenset({"resume_id", "ats_score"})) for result in chunk]
+
+    assert set(full[0]) == RESULT_FIELDS
+    assert projected == [{"resume_id": item["resume_id"], "ats_score": item["ats_score"]} for item in full]
+
+
+def test_unrequested_fields_are_never_computed_even_when_cached(make_resumes, monkeypatch):
+    resume_ids = make_resumes(30, "fields-spy", seed=12)
+    ats_matcher._RESULT_CACHE.clear()
+    computed = []
+    missing_skills_many = ats_matcher.missing_skills_many
+
+    def spy(resume_skills, job_skills, skill_index):
+        computed.append(resume_skills.shape[0])
+        return missing_skills_many(resume_skills, job_skills, skill_index)
+
+    monkeypatch.setattr(ats_matcher, "missing_skills_many", spy)
+    projection = frozenset({"resume_id", "ats_score"})
+
+    for _ in range(2):
+        page = ats_matcher.match_and_rank_page(JOB, resume_ids=resume_ids)
+        assert all(set(result) == projection for chunk in page.chunks(fields=projection) for result in chunk)
+    assert computed == []
+    assert ats_matcher.get_result_cache_status()["hits"] >= 1
+
+    page = ats_matcher.match_and_rank_page(JOB, resume_ids=resume_ids, limit=5)
+    assert [len(result["missing_skills"]) >= 0 for chunk in page.chunks() for result in chunk] == [True] * 5
+    assert computed == [5]
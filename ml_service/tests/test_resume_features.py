@@ -0,0 +1,51 @@
+import pytest
+
+from app.service import ats_matcher
+from app.service.skill_registry import SkillRegistry
+
+
+@pytest.fixture
+def feature_runs(monkeypatch):
+    """Texts passed to ``_compute_features``, one list per call."""
+    runs = []
+    compute_features = ats_matcher._compute_features
+
+    def spy(texts, registry):
+        runs.append(list(texts))
+        return compute_features(texts, registry)
+
+    monkeypatch.setattr(ats_matcher, "_compute_features", spy)
+    return runs
+
+
+def test_taxonomy_reload_rescans_skills_and_keeps_vectors(make_resumes, feature_runs):
+    records = ats_matcher.get_resumes(make_resumes(6, "taxonomy", seed=15))
+    before = [record.features for record in records]
+    registry = SkillRegistry(["Python", "SQL", "Docker", "Kubernetes"], version="reloaded")
+    feature_runs.clear()
+
+    try:
+        features = ats_matcher._ensure_features(records, registry)
+
+        assert feature_runs == []
+        assert [item.skills_version for item in features] == ["reloaded"] * 6
+        assert [item.skill_columns for item in features] == [registry.scan(record.text).columns for record in records]
+        assert all(new.vector is old.vector and new.category == old.category for new, old in zip(features, before))
+        # Rankings holding the old features keep the old columns.
+        assert all(old.skills_version != "reloaded" for old in before)
+    finally:
+        for record, old in zip(records, before):
+            record.features = old
+
+
+def test_rankings_reuse_ingest_time_features(make_resumes, feature_runs):
+    resume_ids = make_resumes(12, "ingest", seed=19)
+    assert len(feature_runs) == 1 and len(feature_runs[0]) == 12
+    features = [record.features for record in ats_matcher.get_resumes(resume_ids)]
+
+    for job in ("Python and SQL data engineer.", "React and TypeScript frontend developer."):
+        ats_matcher._RESULT_CACHE.clear()
+        ats_matcher.match_and_rank(job, resume_ids=resume_ids)
+
+    assert len(feature_runs) == 1
+    assert all(record.features is item for record, item in zip(ats_matcher.get_resumes(resume_ids), features))
@@ -0,0 +1,116 @@
+import dataclasses
+import zlib
+
+import numpy as np
+from scipy.sparse import random as sparse_random
+
+from app.service import ats_matcher
+from app.service.facet_index import FacetIndex
+from app.service.inverted_index import InvertedIndex
+from app.service.near_duplicates import MinHashLSH
+from app.service.resume_snapshot import ResumeSnapshot, read_snapshot, write_snapshot
+from app.service.skill_bitmap import SkillBitmapIndex, pack_skill_columns
+from app.service.skill_registry import get_skill_registry
+
+TEXTS = [
+    "python developer building data pipelines with sql and airflow",
+    "python developer building data pipelines with sql and airflow on aws",
+    "react frontend engineer shipping typescript dashboards",
+    "",
+]
+
+
+def _snapshot(minhash: MinHashLSH) -> ResumeSnapshot:
+    ids = [f"r{i}" for i in range(len(TEXTS))]
+    for resume_id, text in zip(ids, TEXTS):
+        minhash.add(resume_id, text)
+    signatures, present = minhash.signatures(ids)
+    return ResumeSnapshot(
+        resume_ids=ids,
+        filenames=[f"{resume_id}.txt" for resume_id in ids],
+        compressed_texts=[zlib.compress(text.encode("utf-8")) for text in TEXTS],
+        categories=["Data Science", "Data Science", "Web Development", "AI"],
+        structure_quality=np.array([0.5, 0.75, 1.0, 0.0]),
+        vectors=sparse_random(len(TEXTS), 40, density=0.3, format="csr", random_state=2),
+        skill_bitmaps=pack_skill_columns([[0, 3], [3], [70], []], 80),
+        model_version="m1",
+        skills_version="s1",
+        generation=7,
+        experience_years=np.array([3, 4, 1, 0], dtype=np.int32),
+        minhash_signatures=signatures,
+        minhash_present=present,
+        minhash_params=minhash.params,
+    )
+
+
+def test_snapshot_round_trip_maps_the_saved_arrays(tmp_path):
+    snapshot = _snapshot(MinHashLSH())
+    write_snapshot(tmp_path, snapshot)
+
+    restored = read_snapshot(tmp_path)
+
+    assert restored.resume_ids == snapshot.resume_ids
+    assert [zlib.decompress(blob).decode() for blob in restored.compressed_texts] == TEXTS
+    # Read-only views of the mapped files, not copies.
+    assert not restored.vectors.data.flags.writeable
+    assert (restored.vectors != snapshot.vectors).nnz == 0
+    rows = restored.vector_rows()
+    assert all((row != snapshot.vectors[i]).nnz == 0 for i, row in enumerate(rows))
+    assert restored.skill_columns() == [[0, 3], [3], [70], []]
+    assert restored.experience_years.tolist() == [3, 4, 1, 0]
+    assert restored.minhash_present.tolist() == [True, True, True, False]
+    assert restored.minhash_params == MinHashLSH().params
+    assert restored.generation == 7
+
+
+def test_bulk_loaded_indexes_equal_incrementally_built_ones(tmp_path):
+    source = MinHashLSH(threshold=0.5)
+    write_snapshot(tmp_path, _snapshot(source))
+    snapshot = read_snapshot(tmp_path)
+    ids = snapshot.resume_ids
+
+    built, loaded = InvertedIndex(), InvertedIndex()
+    built.rebuild("m1", zip(ids, snapshot.vector_rows()))
+    loaded.load("m1", ids, snapshot.vectors)
+    assert loaded._postings == built._postings
+    assert loaded._max_weight == built._max_weight
+    job = snapshot.vectors[1]
+    base = np.array([0.1, 0.3, 0.2, 0.0])
+    assert loaded.top_candidates(ids, job, base, 2).tolist() == built.top_candidates(ids, job, base, 2).tolist()
+
+    built, loaded = FacetIndex(), FacetIndex()
+    built.rebuild("m1", zip(ids, snapshot.categories, snapshot.experience_years.tolist()))
+    loaded.load("m1", ids, snapshot.categories, snapshot.experience_years)
+    assert loaded.category_counts(ids) == built.category_counts(ids)
+
+    registry = get_skill_registry()
+    columns = [[0, 3], [3], [registry.skill_column("Python")], []]
+    built, loaded = SkillBitmapIndex(), SkillBitmapIndex()
+    built.rebuild(registry, zip(ids, columns))
+    loaded.load(registry, ids, pack_skill_columns(columns, len(registry.skills)))
+    assert np.array_equal(loaded._bits[:4], built._bits[:4])
+
+    duplicates = MinHashLSH(threshold=0.5)
+    duplicates.load(ids, snapshot.minhash_signatures, snapshot.minhash_present)
+    assert len(duplicates) == 3
+    assert duplicates.find(TEXTS[0] + " and gcp") == source.find(TEXTS[0] + " and gcp")
+
+
+def test_resume_stored_while_saving_is_left_for_the_next_snapshot(tmp_path, make_resumes, monkeypatch):
+    monkeypatch.setattr(ats_matcher, "settings", dataclasses.replace(ats_matcher.settings, ats_snapshot_dir=tmp_path))
+    monkeypatch.setattr(ats_matcher, "_SNAPSHOT_GENERATION", -1)
+    make_resumes(5, "snapshot-race", seed=13)
+    ensure_features = ats_matcher._ensure_features
+    late = []
+
+    def upload_meanwhile(records, registry):
+        if not late:
+            late.extend(make_resumes(1, "snapshot-late", seed=14))
+        return ensure_features(records, registry)
+
+    monkeypatch.setattr(ats_matcher, "_ensure_features", upload_meanwhile)
+
+    assert ats_matcher.save_snapshot() is not None
+    assert late[0] not in read_snapshot(tmp_path).resume_ids
+    assert ats_matcher.save_snapshot() is not None
+    assert late[0] in read_snapshot(tmp_path).resume_ids
@@ -0,0 +1,77 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from app.service import resume_store
+from app.service.resume_store import MemoryResumeStore, SharedResumeStore
+
+
+def _encode(record):
+    resume_id, text, weight = record
+    return resume_id, f"{resume_id}.txt", text, csr_matrix(np.array([[0.0, weight, 0.5]])), {"weight": weight}
+
+
+def _decode(resume_id, filename, load_text, vector, meta):
+    return {"resume_id": resume_id, "filename": filename, "load_text": load_text, "vector": vector, **meta}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ranked_resumes_are_not_expired_by_the_ttl(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(resume_store.time, "monotonic", clock)
+    store = MemoryResumeStore(ttl_seconds=10)
+    for resume_id in ("a", "b", "c"):
+        store.add(resume_id, resume_id)
+
+    clock.now += 6
+    store.touch(["a"])
+    assert store.get("b") == "b"
+    clock.now += 6
+    store.refresh()
+    assert store.take_evicted() == ["c"]
+
+    store.touch()
+    clock.now += 9
+    store.refresh()
+    assert [record for record in store.records()] == ["a", "b"]
+    clock.now += 2
+    store.refresh()
+    assert store.take_evicted() == ["a", "b"]
+
+
+def test_budget_evicts_the_least_recently_used_first():
+    store = MemoryResumeStore(max_bytes=30, sizeof=lambda record: 10)
+    for resume_id in ("a", "b", "c"):
+        store.add(resume_id, resume_id)
+    store.touch(["a"])
+
+    store.add("d", "d")
+
+    assert store.take_evicted() == ["b"]
+    assert store.records() == ["a", "c", "d"]
+
+
+def test_shared_store_syncs_workers_and_reads_texts_by_id(tmp_path):
+    writer = SharedResumeStore(tmp_path, _encode, _decode)
+    reader = SharedResumeStore(tmp_path, _encode, _decode)
+    writer.add("a", ("a", "first resume", 0.25))
+    writer.add("b", ("b", "second resume", 0.75))
+
+    assert (len(reader), reader.generation) == (0, 0)
+    loaded = reader.refresh()
+    assert [record["resume_id"] for record in loaded] == ["a", "b"]
+    assert (len(reader), reader.generation) == (2, 2)
+    assert loaded[1]["vector"].toarray().tolist() == [[0.0, 0.75, 0.5]]
+    assert loaded[0]["load_text"]() == "first resume"
+
+    writer.replace("a", ("a", "rewritten resume", 0.5))
+    assert reader.refresh()[0]["weight"] == 0.5
+    assert reader.get("a")["load_text"]() == "rewritten resume"
+    assert [record["resume_id"] for record in reader.records()] == ["a", "b"]
+    assert reader.refresh() == []
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from app.service import ats_matcher
+from app.service.sharded_scorer import ShardedScorer, top_rows
+
+JOB = "Backend engineer with Python, SQL, Docker and AWS experience building data pipelines and services."
+
+
+@pytest.fixture
+def sharded(monkeypatch):
+    scorer = ShardedScorer(workers=2, min_resumes=1)
+    monkeypatch.setattr(ats_matcher, "_SHARDED_SCORER", scorer)
+    yield scorer
+    scorer.close()
+
+
+def _rank(resume_ids, top_k=None, scorer=None):
+    # Bypass the result cache so every call really scores.
+    ats_matcher._RESULT_CACHE.clear()
+    if scorer is not None:
+        previous, ats_matcher._SHARDED_SCORER = ats_matcher._SHARDED_SCORER, scorer
+        try:
+            return ats_matcher.match_and_rank(JOB, resume_ids=resume_ids, top_k=top_k)
+        finally:
+            ats_matcher._SHARDED_SCORER = previous
+    return ats_matcher.match_and_rank(JOB, resume_ids=resume_ids, top_k=top_k)
+
+
+def test_top_rows_matches_a_stable_descending_sort():
+    scores = np.round(np.random.default_rng(1).random(500), 1)
+
+    for top_k in (None, 1, 7, 50, 499, 500, 900):
+        expected = np.argsort(-scores, kind="stable")[:top_k]
+        assert top_rows(scores, top_k).tolist() == expected.tolist()
+
+
+def test_sharded_ranking_matches_single_process(make_resumes, sharded):
+    resume_ids = make_resumes(120, "shard")
+    single = ShardedScorer(workers=0)
+
+    for top_k in (None, 1, 10, 50):
+        expected = _rank(resume_ids, top_k, scorer=single)
+        assert _rank(resume_ids, top_k) == expected
+    assert _rank(resume_ids[::3], 5) == _rank(resume_ids[::3], 5, scorer=single)
+    assert sharded.status()["queries"] == 5
+
+
+def test_new_and_replaced_resumes_are_appended_not_republished(make_resumes, sharded):
+    resume_ids = make_resumes(60, "append")
+    _rank(resume_ids, 5)
+
+    added = make_resumes(3, "append-new", seed=7)
+    replaced = ats_matcher.replace_resume(resume_ids[10], "replaced.txt", JOB + " " + JOB)
+    ranked = resume_ids + added
+
+    assert _rank(ranked, 5)[0]["resume_id"] == replaced
+    assert _rank(ranked) == _rank(ranked, scorer=ShardedScorer(workers=0))
+    status = sharded.status()
+    assert status["publishes"] == 1
+    assert status["appends"] == 1
+    assert status["segments"] == 2
@@ -0,0 +1,58 @@
+import pytest
+from fastapi import HTTPException
+
+from app.service import ats_matcher
+from app.service.skill_bitmap import SkillBitmapIndex, SkillFilter
+from app.service.skill_registry import get_skill_registry
+
+
+@pytest.fixture
+def registry():
+    return get_skill_registry()
+
+
+@pytest.fixture
+def index(registry):
+    bitmaps = SkillBitmapIndex()
+    for resume_id, skills in [("a", ["Python", "SQL"]), ("b", ["Java", "Docker"]), ("c", ["Python", "Docker"])]:
+        bitmaps.add(resume_id, [registry.skill_column(skill) for skill in skills], registry)
+    return bitmaps
+
+
+def test_require_any_and_exclude(index, registry):
+    ids = ["a", "b", "c"]
+
+    assert index.matches(ids, SkillFilter.from_values(["python"]), registry).tolist() == [True, False, True]
+    assert index.matches(ids, SkillFilter.from_values(None, ["sql,java"]), registry).tolist() == [True, True, False]
+    assert index.matches(ids, SkillFilter.from_values(["python"], None, ["docker"]), registry).tolist() == [
+        True, False, False,
+    ]
+
+
+def test_unindexed_ids_use_their_own_columns(index, registry):
+    ids = ["a", "missing", "b"]
+    skill_filter = SkillFilter.from_values(["docker"])
+    docker = [registry.skill_column("Docker")]
+
+    assert index.matches(ids, skill_filter, registry).tolist() == [False, False, True]
+    assert index.matches(ids, skill_filter, registry, columns_of=lambda row: docker).tolist() == [
+        False, True, True,
+    ]
+
+
+def test_unknown_skill_is_rejected(index, registry):
+    with pytest.raises(HTTPException) as error:
+        index.matches(["a"], SkillFilter.from_values(["not-a-real-skill"]), registry)
+    assert error.value.status_code == 400
+
+
+def test_filter_survives_resumes_dropped_from_the_index(make_resumes, registry):
+    resumes = ats_matcher.get_resumes(make_resumes(30, "bitmap", seed=5))
+    skill_filter = SkillFilter.from_values(["python"])
+    expected = ats_matcher.filter_by_skills(resumes, skill_filter, registry)
+
+    # As if an upload evicted them between reading the records and filtering.
+    ats_matcher._SKILL_BITMAPS.discard([resume.resume_id for resume in resumes[::2]])
+
+    assert ats_matcher.filter_by_skills(resumes, skill_filter, registry) == expected
+    assert expected
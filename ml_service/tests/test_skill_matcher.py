@@ -0,0 +1,54 @@
+import random
+import re
+
+from app.service.skill_extractor import extract_skills, load_all_skills
+
+CANDIDATES = [
+    "C++", "C", "c#", ".NET", "net", "Node.js", "node", "js", "Go", "GO", "R", "React", "React Native",
+    "machine learning", "learning", "Python", "python", " SQL ", "", "   ", "CI/CD", "ci",
+]
+SEPARATORS = ["", " ", "  ", ".", ",", "-", "_", "+", "/", "\n", "x", "1", "(", ")"]
+
+
+def _per_skill_regex(text: str, candidates: list[str]) -> list[str]:
+    # The matcher this replaced: one boundary regex per candidate, then case-insensitive de-duplication.
+    normalized = str(text or "").lower()
+    found = [
+        skill
+        for skill in candidates
+        if skill and re.search(rf"(?<!\w){re.escape(skill.strip().lower())}(?!\w)", normalized)
+    ]
+    return list({skill.lower(): skill for skill in reversed(found)}.values())[::-1]
+
+
+def _fuzz_texts(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    words = [candidate for candidate in CANDIDATES if candidate.strip()] + ["c+", "nodejs", ".net5", "golang"]
+    texts = []
+    for _ in range(count):
+        parts = [rng.choice(rng.choice([words, SEPARATORS])) for _ in range(rng.randint(0, 12))]
+        text = "".join(parts)
+        texts.append(text.upper() if rng.random() < 0.2 else text)
+    return texts
+
+
+def test_matches_the_per_skill_regex_on_fuzzed_text():
+    for text in _fuzz_texts(3000, seed=1):
+        assert extract_skills(text, CANDIDATES) == _per_skill_regex(text, CANDIDATES), text
+
+
+def test_boundary_cases_for_symbols_in_skill_names():
+    skills = ["C++", "C", ".NET", "net", "Node.js", "node", "js", "Go", "GO"]
+
+    assert extract_skills("C++ and .NET on Node.js", skills) == ["C++", "C", ".NET", "net", "Node.js", "node", "js"]
+    assert extract_skills("c+ dotnet nodejs", skills) == ["C"]
+    assert extract_skills("asp.net, c++11, node.jsx", skills) == ["C", "net", "node"]
+    assert extract_skills("golang go-to", skills) == ["Go"]
+
+
+def test_taxonomy_extraction_matches_the_per_skill_regex():
+    taxonomy = load_all_skills()
+    rng = random.Random(2)
+    for _ in range(200):
+        text = " ".join(rng.choice(taxonomy + SEPARATORS) for _ in range(rng.randint(1, 15)))
+        assert extract_skills(text) == _per_skill_regex(text, taxonomy), text
@@ -0,0 +1,60 @@
+import pytest
+
+from app.service import ats_matcher
+from app.service.standing_queries import merge_ranked
+
+JOB = "Cloud engineer with Docker, Kubernetes, Terraform and AWS experience running services."
+
+
+@pytest.fixture
+def standing_query():
+    query_ids = []
+
+    def register(top_k: int) -> dict:
+        snapshot = ats_matcher.register_query(JOB, top_k)
+        query_ids.append(snapshot["query_id"])
+        return snapshot
+
+    yield register
+    for query_id in query_ids:
+        ats_matcher.remove_query(query_id)
+
+
+def _full_ranking(top_k: int) -> list[dict]:
+    ats_matcher._RESULT_CACHE.clear()
+    return ats_matcher.match_and_rank(JOB, top_k=top_k, approximate=False)
+
+
+def test_merge_keeps_current_results_ahead_of_tied_newcomers():
+    current = [{"resume_id": "a", "ats_score": 0.9}, {"resume_id": "b", "ats_score": 0.5}]
+    incoming = [{"resume_id": "c", "ats_score": 0.5}, {"resume_id": "d", "ats_score": 0.7}]
+
+    merged = merge_ranked(current, incoming, 3)
+
+    assert [(result["resume_id"], result["rank"]) for result in merged] == [("a", 1), ("d", 2), ("b", 3)]
+
+
+def test_added_resumes_are_merged_into_the_full_ranking(make_resumes, standing_query):
+    make_resumes(30, "standing", seed=5)
+    query_id = standing_query(8)["query_id"]
+    merges = ats_matcher.get_standing_queries_status()["merges"]
+
+    make_resumes(20, "standing-new", seed=6)
+    snapshot = ats_matcher.get_query(query_id)
+
+    assert snapshot["results"] == _full_ranking(8)
+    assert ats_matcher.get_standing_queries_status()["merges"] == merges + 1
+
+
+def test_replacing_a_ranked_resume_reranks_in_full(make_resumes, standing_query):
+    make_resumes(30, "standing-replace", seed=8)
+    snapshot = standing_query(5)
+    ranked = snapshot["results"][0]["resume_id"]
+    rebuilds = ats_matcher.get_standing_queries_status()["rebuilds"]
+
+    ats_matcher.replace_resume(ranked, "replaced.txt", "Retail cashier handling customers and stock.")
+    snapshot = ats_matcher.get_query(snapshot["query_id"])
+
+    assert snapshot["results"] == _full_ranking(5)
+    assert ranked not in [result["resume_id"] for result in snapshot["results"]]
+    assert ats_matcher.get_standing_queries_status()["rebuilds"] == rebuilds + 1
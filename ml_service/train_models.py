@@ -24,6 +24,8 @@ from sklearn.metrics import accuracy_score, classification_report, f1_score
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 
+from app.service.skill_registry import WEAK_LABEL_TABLE, get_skill_registry
+
 
 ROLE_LABEL_COLUMNS = (
     "career_path",
@@ -54,18 +56,10 @@ ROLE_NORMALIZATION = {
     "software developer": "Software Engineer",
 }
 
+# Skill weights per role live in the shared skill registry (ROLE_SKILL_WEIGHTS);
+# projects and certifications are only used here.
 ROLE_KEYWORDS = {
     "Data Scientist": {
-        "skills": {
-            "python": 2.0,
-            "machine learning": 3.0,
-            "tensorflow": 3.0,
-            "numpy": 3.0,
-            "pandas": 3.0,
-            "data analysis": 2.5,
-            "tableau": 2.0,
-            "power bi": 2.0,
-        },
         "projects": {
             "ai chatbot": 1.8,
             "face recognition system": 2.0,
@@ -78,14 +72,6 @@ ROLE_KEYWORDS = {
         },
     },
     "Backend Developer": {
-        "skills": {
-            "django": 3.0,
-            "flask": 2.8,
-            "node.js": 3.0,
-            "java": 2.4,
-            "sql": 2.0,
-            "git": 1.0,
-        },
         "projects": {
             "banking system": 1.8,
             "student management system": 1.7,
@@ -96,12 +82,6 @@ ROLE_KEYWORDS = {
         },
     },
     "Frontend Developer": {
-        "skills": {
-            "react": 3.0,
-            "html": 2.5,
-            "css": 2.5,
-            "git": 1.0,
-        },
         "projects": {
             "portfolio website": 2.0,
             "chat application": 1.4,
@@ -109,13 +89,6 @@ ROLE_KEYWORDS = {
         "certifications": {},
     },
     "DevOps Engineer": {
-        "skills": {
-            "docker": 3.0,
-            "kubernetes": 3.0,
-            "aws": 2.3,
-            "azure": 2.3,
-            "git": 1.6,
-        },
         "projects": {
             "deployment": 1.0,
         },
@@ -126,12 +99,6 @@ ROLE_KEYWORDS = {
         },
     },
     "Cloud Architect": {
-        "skills": {
-            "aws": 3.2,
-            "azure": 3.2,
-            "docker": 1.7,
-            "kubernetes": 1.7,
-        },
         "projects": {},
         "certifications": {
             "aws certified cloud practitioner": 3.2,
@@ -139,12 +106,6 @@ ROLE_KEYWORDS = {
         },
     },
     "Software Engineer": {
-        "skills": {
-            "c++": 2.0,
-            "java": 1.7,
-            "sql": 1.5,
-            "git": 1.0,
-        },
         "projects": {},
         "certifications": {},
     },
@@ -178,10 +139,12 @@ def infer_role_weakly(skills_text: str, projects_text: str, certification_text:
     projects = _tokenize_csv_list(projects_text)
     cert = _safe_text(certification_text).lower()
 
+    registry = get_skill_registry()
     scores = {role: 0.0 for role in ROLE_KEYWORDS}
+    for token in skills:
+        for role, weight in registry.term_role_weights(token, WEAK_LABEL_TABLE).items():
+            scores[role] += weight
     for role, mapping in ROLE_KEYWORDS.items():
-        for token in skills:
-            scores[role] += mapping["skills"].get(token, 0.0)
         for token in projects:
             scores[role] += mapping["projects"].get(token, 0.0)
         scores[role] += mapping["certifications"].get(cert, 0.0)